@@ -1,23 +1,281 @@
-from flask import Flask, render_template, request, jsonify, session
+import functools
+import hmac
+from flask import Flask, Response, render_template, request, jsonify, session
 from flask_cors import CORS
-from flask_socketio import SocketIO, emit
+from flask_socketio import SocketIO, emit, join_room
 import cv2
-import mediapipe as mp
-import numpy as np
-import base64
 import json
+import numpy as np
+import os
+import threading
 import time
-from gesture_recognition import GestureRecognizer
+from capture_controller import CaptureController, CapturePolicy
+from frame_gate import FrameGate
+from frame_mailbox import FrameMailbox
+from frame_transport import FrameDecoder, TransportStats, payload_from_binary, payload_from_data_url
+from gesture_recognition import GestureRecognizer, GESTURE_MAPPINGS
+from gesture_stabilizer import GestureStabilizer
+from metrics import PipelineMetrics
+from prediction_cache import PredictionCache
+from local_capture import LocalCapture
+from landmark_classifier import LandmarkClassifier
+from inference_backends import InlineBackend, MicroBatchBackend, ProcessPoolBackend
+from recognizer_pool import RecognizerPool
+from result_format import ResultEncoder
+from session_recorder import SessionRecorder
+from warmup import WarmUp
+from stack_sampler import SamplerBusy, StackSampler, format_collapsed
 from word_predictor import WordPredictor
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'gesture_chat_secret_key'
+# One MediaPipe graph per connected client, plus pre-warmed spares
+app.config['RECOGNIZER_POOL_SIZE'] = 8
+app.config['RECOGNIZER_IDLE_TTL'] = 120.0
+app.config['RECOGNIZER_SPARES'] = 1
+# 'inline' runs MediaPipe in the Socket.IO handler, 'batch' groups frames
+# of concurrent clients into micro-batches, 'process' spreads them over
+# worker processes fed through shared memory
+app.config['INFERENCE_BACKEND'] = 'inline'
+app.config['BATCH_MAX_SIZE'] = 8
+app.config['BATCH_WINDOW'] = 0.005
+app.config['BATCH_THREADS'] = 4
+app.config['INFERENCE_WORKERS'] = 2
+app.config['INFERENCE_WORKER_THREADS'] = 1
+app.config['INFERENCE_SLOTS'] = 8
+app.config['INFERENCE_MAX_FRAME_SHAPE'] = (1080, 1920, 3)
+app.config['INFERENCE_TIMEOUT'] = 5.0
+# Side in pixels of the crop around the previous hand that MediaPipe sees
+# while a hand is tracked; None always processes the full frame
+app.config['HAND_ROI_SIZE'] = None
+# Hands MediaPipe looks for per frame. Above 1, results list every hand with
+# its handedness and two-hand gestures such as please_pray are recognized;
+# this cannot be combined with HAND_ROI_SIZE
+app.config['MAX_HANDS'] = 1
+# Model file written by `landmark_classifier.py train` to classify single
+# hands with instead of the hand-written rules; None uses the rules
+app.config['GESTURE_CLASSIFIER'] = None
+# Decode JPEGs at 1/2 or 1/4 scale while that still leaves frames at least
+# this many pixels wide; None always decodes at full resolution
+app.config['DECODE_MAX_WIDTH'] = None
+# Frames are answered with the session's previous result, without decoding,
+# when identical or when their thumbnail moved less than GATE_MOTION_THRESHOLD
+# grey levels (at most GATE_MAX_REUSE in a row); after GATE_IDLE_AFTER frames
+# without a hand only one frame in GATE_PROBE_EVERY is processed
+app.config['GATE_MOTION_THRESHOLD'] = 2.0
+app.config['GATE_MAX_REUSE'] = 10
+app.config['GATE_IDLE_AFTER'] = 10
+app.config['GATE_PROBE_EVERY'] = 5
+# Frames and results older than this many seconds are dropped, not emitted
+app.config['FRAME_DEADLINE'] = 1.0
+# A new gesture is emitted once it wins STABLE_MIN_VOTES of the last
+# STABLE_WINDOW frames; an unchanged one is re-sent every RESULT_KEEPALIVE seconds
+app.config['STABLE_WINDOW'] = 5
+app.config['STABLE_MIN_VOTES'] = 3
+app.config['RESULT_KEEPALIVE'] = 1.0
+# Bounds for the capture settings pushed to each browser, re-evaluated
+# every CAPTURE_PERIOD seconds from that client's latency and backlog
+app.config['CAPTURE_MIN_INTERVAL_MS'] = 100
+app.config['CAPTURE_MAX_INTERVAL_MS'] = 1000
+app.config['CAPTURE_WIDTHS'] = (640, 480, 320)
+app.config['CAPTURE_QUALITIES'] = (0.7, 0.6, 0.5)
+app.config['CAPTURE_PERIOD'] = 1.0
+# Directory to record every session's frames and results into, for
+# replay_session.py; None disables recording. Sessions are split into
+# RECORD_SEGMENT_BYTES files and stop recording after RECORD_MAX_BYTES
+app.config['RECORD_DIR'] = None
+app.config['RECORD_SEGMENT_BYTES'] = 64 * 1024 * 1024
+app.config['RECORD_MAX_BYTES'] = 1024 * 1024 * 1024
+# POST /debug/profile samples handler stacks for a few seconds and returns
+# them collapsed for flame graphs. The endpoint only exists when a token is
+# set, and every request must send it in the X-Profiler-Token header
+app.config['PROFILER_TOKEN'] = None
+app.config['PROFILER_MAX_SECONDS'] = 30.0
+app.config['PROFILER_INTERVAL'] = 0.005
+# Kiosk mode: recognize a camera attached to the server (a device index such
+# as 0) or a local video file instead of frames sent by browsers. Pages only
+# receive the results; files restart at the end with LOCAL_CAPTURE_LOOP and
+# play at their own frame rate unless LOCAL_CAPTURE_FPS is set
+app.config['LOCAL_CAPTURE_SOURCE'] = None
+app.config['LOCAL_CAPTURE_LOOP'] = True
+app.config['LOCAL_CAPTURE_FPS'] = None
+# Sentence suggestions are cached per word list: at most
+# PREDICTION_CACHE_SIZE lists (0 disables the cache), each for
+# PREDICTION_CACHE_TTL seconds or, with None, until templates change
+app.config['PREDICTION_CACHE_SIZE'] = 1024
+app.config['PREDICTION_CACHE_TTL'] = None
+# `python app.py` serves in debug mode, with the auto-reloader
+app.config['DEV_SERVER_DEBUG'] = True
 CORS(app)
 socketio = SocketIO(app, cors_allowed_origins="*")
 
+def create_inference_backend(config, transport_stats, metrics=None, classifier=None):
+    """Build the configured gesture inference backend"""
+    decoder = FrameDecoder(max_width=config['DECODE_MAX_WIDTH'], stats=transport_stats, metrics=metrics)
+    if config['INFERENCE_BACKEND'] == 'process':
+        # Workers are spawned lazily on the first frame; hands.process and
+        # recognize_gesture run there and are not in `metrics`
+        return ProcessPoolBackend(
+            workers=config['INFERENCE_WORKERS'],
+            slots=config['INFERENCE_SLOTS'],
+            max_frame_shape=config['INFERENCE_MAX_FRAME_SHAPE'],
+            threads_per_worker=config['INFERENCE_WORKER_THREADS'],
+            sessions_per_worker=config['RECOGNIZER_POOL_SIZE'],
+            timeout=config['INFERENCE_TIMEOUT'],
+            roi_size=config['HAND_ROI_SIZE'],
+            max_hands=config['MAX_HANDS'],
+            classifier=classifier,
+            transport_stats=transport_stats,
+            decoder=decoder
+        )
+
+    recognizer_pool = RecognizerPool(
+        functools.partial(GestureRecognizer, roi_size=config['HAND_ROI_SIZE'], metrics=metrics,
+                          max_hands=config['MAX_HANDS'], classifier=classifier),
+        max_size=config['RECOGNIZER_POOL_SIZE'],
+        idle_ttl=config['RECOGNIZER_IDLE_TTL'],
+        spares=config['RECOGNIZER_SPARES']
+    )
+    if config['INFERENCE_BACKEND'] == 'batch':
+        return MicroBatchBackend(
+            recognizer_pool,
+            max_batch=config['BATCH_MAX_SIZE'],
+            window=config['BATCH_WINDOW'],
+            threads=config['BATCH_THREADS'],
+            timeout=config['INFERENCE_TIMEOUT'],
+            transport_stats=transport_stats,
+            decoder=decoder
+        )
+    return InlineBackend(recognizer_pool, transport_stats, decoder)
+
 # Initialize gesture recognition and word prediction
-gesture_recognizer = GestureRecognizer()
+transport_stats = TransportStats()
+pipeline_metrics = PipelineMetrics()
+gesture_classifier = LandmarkClassifier.load(app.config['GESTURE_CLASSIFIER']) \
+    if app.config['GESTURE_CLASSIFIER'] else None
+inference_backend = create_inference_backend(app.config, transport_stats, pipeline_metrics, gesture_classifier)
+frame_mailbox = FrameMailbox(deadline=app.config['FRAME_DEADLINE'])
+frame_gate = FrameGate(
+    motion_threshold=app.config['GATE_MOTION_THRESHOLD'],
+    max_reuse=app.config['GATE_MAX_REUSE'],
+    idle_after=app.config['GATE_IDLE_AFTER'],
+    probe_every=app.config['GATE_PROBE_EVERY']
+)
+gesture_stabilizer = GestureStabilizer(
+    window=app.config['STABLE_WINDOW'],
+    min_votes=app.config['STABLE_MIN_VOTES'],
+    keepalive=app.config['RESULT_KEEPALIVE']
+)
+# Classification-only recognizer for clients that send landmarks; it never
+# loads a Hands graph. Built by the warm-up or the first landmark frame, as
+# compiling the rule table would otherwise slow down the import
+landmark_recognizer = None
+_landmark_recognizer_lock = threading.Lock()
+
+def get_landmark_recognizer():
+    global landmark_recognizer
+    with _landmark_recognizer_lock:
+        if landmark_recognizer is None:
+            landmark_recognizer = GestureRecognizer(load_hands=False, metrics=pipeline_metrics,
+                                                    classifier=gesture_classifier)
+    return landmark_recognizer
+
+result_encoder = ResultEncoder()
+capture_controller = CaptureController(
+    CapturePolicy(
+        min_interval_ms=app.config['CAPTURE_MIN_INTERVAL_MS'],
+        max_interval_ms=app.config['CAPTURE_MAX_INTERVAL_MS'],
+        widths=app.config['CAPTURE_WIDTHS'],
+        qualities=app.config['CAPTURE_QUALITIES']
+    ),
+    period=app.config['CAPTURE_PERIOD']
+)
+session_recorder = None
+if app.config['RECORD_DIR']:
+    session_recorder = SessionRecorder(
+        app.config['RECORD_DIR'],
+        segment_bytes=app.config['RECORD_SEGMENT_BYTES'],
+        max_bytes=app.config['RECORD_MAX_BYTES']
+    )
+process_frame = inference_backend.process if session_recorder is None else \
+    session_recorder.wrap(inference_backend.process)
 word_predictor = WordPredictor()
+prediction_cache = PredictionCache(word_predictor, max_size=app.config['PREDICTION_CACHE_SIZE'],
+                                   ttl=app.config['PREDICTION_CACHE_TTL'])
+stack_sampler = StackSampler(interval=app.config['PROFILER_INTERVAL'])
+
+def _gate_skipped():
+    stats = frame_gate.get_stats()
+    return stats['frames'] - stats['processed']
+
+pipeline_metrics.add_counter('frames_received', 'Frames received from clients',
+                             lambda: frame_mailbox.get_stats()['received'])
+pipeline_metrics.add_counter('frames_processed', 'Frames taken out of the mailbox and answered',
+                             lambda: frame_mailbox.get_stats()['processed'])
+pipeline_metrics.add_counter('frames_dropped', 'Frames superseded by a newer one or past the deadline',
+                             lambda: frame_mailbox.get_stats()['dropped'] + frame_mailbox.get_stats()['expired'])
+pipeline_metrics.add_counter('frames_gated', 'Frames answered by the frame gate without inference', _gate_skipped)
+pipeline_metrics.add_gauge('active_sessions', 'Connected clients that have sent frames',
+                           lambda: frame_mailbox.get_stats()['sessions'])
+
+def warm_up_recognition():
+    """Build recognizers and push a blank frame through MediaPipe"""
+    blank = np.zeros((480, 640, 3), dtype=np.uint8)
+    inference_backend.warm_up(payload_from_binary(cv2.imencode('.jpg', blank)[1].tobytes()))
+
+def emit_local_result(result):
+    """Broadcast a local capture result to every page when its stable gesture changes"""
+    result = gesture_stabilizer.update(LOCAL_CAPTURE_SID, result)
+    if result is None:
+        return
+
+    start = time.perf_counter()
+    result_encoder.send(LOCAL_CAPTURE_SID, result,
+                        lambda payload: socketio.emit('gesture_result', payload, to=LOCAL_CAPTURE_SID))
+    pipeline_metrics.observe('emit', time.perf_counter() - start)
+
+# Stabilizer, encoder and Socket.IO room key for the local capture stream
+LOCAL_CAPTURE_SID = 'local-capture'
+local_capture = None
+if app.config['LOCAL_CAPTURE_SOURCE'] is not None:
+    # The recognizer is built by the warm-up, which imports MediaPipe
+    local_capture = LocalCapture(
+        app.config['LOCAL_CAPTURE_SOURCE'],
+        None,
+        on_result=emit_local_result,
+        loop=app.config['LOCAL_CAPTURE_LOOP'],
+        fps=app.config['LOCAL_CAPTURE_FPS']
+    )
+
+def start_local_capture():
+    """Open the local capture source and start recognizing it"""
+    if local_capture is not None:
+        local_capture.process = GestureRecognizer(roi_size=app.config['HAND_ROI_SIZE'], metrics=pipeline_metrics,
+                                                  max_hands=app.config['MAX_HANDS'],
+                                                  classifier=gesture_classifier).process_frame
+        local_capture.start()
+
+def warm_up_prediction():
+    """Run a sample word list through the sentence predictor"""
+    word_predictor.predict_sentences(['hello', 'i', 'need', 'help'])
+
+def is_reloader_watcher():
+    """True in the debug reloader's parent process, which only watches files and restarts the server"""
+    return (__name__ == '__main__' and app.config['DEV_SERVER_DEBUG']
+            and os.environ.get('WERKZEUG_RUN_MAIN') != 'true')
+
+# Imports, graph start-up and first inference happen here instead of on
+# the first client's first frame; /healthz reports when they are done.
+# The reloader's watcher serves nothing, so it neither warms up nor opens
+# the local capture source; its serving child does.
+warm_up = WarmUp([
+    ('landmarks', get_landmark_recognizer),
+    ('recognition', warm_up_recognition),
+    ('prediction', warm_up_prediction),
+    ('local_capture', start_local_capture)
+])
+if not is_reloader_watcher():
+    warm_up.start()
 
 @app.route('/')
 def index():
@@ -30,52 +288,164 @@ def tutorial():
 @app.route('/api/gestures')
 def get_gestures():
     """Get all available gestures and their corresponding words"""
-    return jsonify(gesture_recognizer.get_gesture_mappings())
+    return jsonify(GESTURE_MAPPINGS)
+
+@app.route('/healthz')
+def healthz():
+    """Readiness: 200 once warm-up has finished, 503 while it runs or after it failed"""
+    stats = warm_up.get_stats()
+    return jsonify(stats), 200 if warm_up.ready else 503
+
+@app.route('/api/stats')
+def get_stats():
+    """Get server-side pipeline statistics"""
+    return jsonify({
+        'inference': inference_backend.get_stats(),
+        'frames': frame_mailbox.get_stats(),
+        'gate': frame_gate.get_stats(),
+        'transport': transport_stats.get_stats(),
+        'results': gesture_stabilizer.get_stats(),
+        'result_format': result_encoder.get_stats(),
+        'capture': capture_controller.get_stats(),
+        'stages': pipeline_metrics.get_stats(),
+        'recording': session_recorder.get_stats() if session_recorder else None,
+        'local_capture': local_capture.get_stats() if local_capture else None,
+        'predictions': prediction_cache.get_stats()
+    })
+
+@app.route('/metrics')
+def get_metrics():
+    """Pipeline metrics in Prometheus text format"""
+    return Response(pipeline_metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/debug/profile', methods=['POST'])
+def profile():
+    """Sample the frame and sentence handlers for ?seconds=N and return collapsed stacks"""
+    token = app.config['PROFILER_TOKEN']
+    if not token:
+        return Response('Not Found', status=404)
+    # Compared as bytes: compare_digest rejects non-ASCII str
+    if not hmac.compare_digest(request.headers.get('X-Profiler-Token', '').encode(), token.encode()):
+        return Response('Forbidden', status=403)
 
-@socketio.on('process_frame')
-def handle_frame(data):
-    """Process video frame for gesture recognition"""
     try:
-        # Decode base64 image
-        if 'frame' not in data:
-            emit('error', {'message': 'No frame data received'})
-            return
+        seconds = float(request.args.get('seconds', 5.0))
+        interval = float(request.args.get('interval_ms', app.config['PROFILER_INTERVAL'] * 1000.0)) / 1000.0
+    except ValueError:
+        return Response('seconds and interval_ms must be numbers', status=400)
+    if not 0 < seconds <= app.config['PROFILER_MAX_SECONDS'] or not 0.001 <= interval <= 1.0:
+        return Response(f"seconds must be in (0, {app.config['PROFILER_MAX_SECONDS']}] "
+                        f"and interval_ms in [1, 1000]", status=400)
 
-        frame_data = data['frame']
-        if ',' not in frame_data:
-            emit('error', {'message': 'Invalid frame format'})
-            return
+    try:
+        stacks = stack_sampler.profile(seconds, interval, all_threads=request.args.get('all') == '1')
+    except SamplerBusy as e:
+        return Response(str(e), status=409)
+    return Response(format_collapsed(stacks), mimetype='text/plain')
 
-        image_data = base64.b64decode(frame_data.split(',')[1])
-        nparr = np.frombuffer(image_data, np.uint8)
-        frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+@socketio.on('connect')
+def handle_connect():
+    """In kiosk mode, tell the page not to open its own camera and send it the local results"""
+    if local_capture is not None:
+        join_room(LOCAL_CAPTURE_SID)
+        emit('local_capture', {'source': str(local_capture.source)})
 
-        if frame is None:
-            emit('error', {'message': 'Failed to decode frame'})
-            return
+@socketio.on('disconnect')
+def handle_disconnect():
+    """Return the client's recognizer to the pool"""
+    inference_backend.release(request.sid)
+    frame_mailbox.release(request.sid)
+    frame_gate.release(request.sid)
+    gesture_stabilizer.release(request.sid)
+    result_encoder.release(request.sid)
+    capture_controller.release(request.sid)
+    if session_recorder:
+        session_recorder.release(request.sid)
 
-        # print(f"Processing frame of size: {frame.shape}")
+def process_payload(payload):
+    """Queue a frame payload and, if nobody is busy with this client, drain its mailbox"""
+    sid = request.sid
+    if session_recorder:
+        session_recorder.record_frame(sid, payload)
+    if not frame_mailbox.offer(sid, payload):
+        # The handler already working on this client picks the frame up
+        return
 
-        # Process gesture
-        result = gesture_recognizer.process_frame(frame)
+    for payload in frame_mailbox.drain(sid):
+        # Process gesture on this client's own recognizer, unless the gate can answer
+        result = frame_gate.process(sid, payload, process_frame)
+        frame_mailbox.mark_processed()
+        pipeline_metrics.frames.mark()
+        update_capture_settings(time.monotonic() - payload.received_at, frame_mailbox.depth(sid))
 
         # print(f"Gesture result: {result['gesture']}, Word: {result['word']}, Confidence: {result['confidence']}")
 
-        emit('gesture_result', {
-            'gesture': result['gesture'],
-            'confidence': result['confidence'],
-            'word': result['word'],
-            'landmarks': result['landmarks']
-        })
+        if frame_mailbox.is_expired(payload):
+            continue
+
+        emit_gesture_result(result)
+
+def update_capture_settings(latency, queue_depth=0):
+    """Report one frame's latency and push new capture settings if they changed"""
+    settings = capture_controller.record(request.sid, latency, queue_depth)
+    if settings is not None:
+        emit('capture_settings', settings._asdict())
+
+def emit_gesture_result(result):
+    """Send a recognition result to the client when its stable gesture changes"""
+    result = gesture_stabilizer.update(request.sid, result)
+    if result is None:
+        return
+
+    if session_recorder:
+        session_recorder.record_emit(request.sid, result)
+    start = time.perf_counter()
+    result_encoder.send(request.sid, result, lambda payload: emit('gesture_result', payload))
+    pipeline_metrics.observe('emit', time.perf_counter() - start)
+
+@socketio.on('set_result_format')
+def handle_result_format(data):
+    """Choose how landmarks are sent in this client's gesture results"""
+    try:
+        emit('result_format', result_encoder.negotiate(request.sid, data))
+    except Exception as e:
+        emit('error', {'message': str(e)})
+
+@socketio.on('process_frame')
+def handle_frame(data):
+    """Process video frame sent as a base64 data URL"""
+    try:
+        process_payload(payload_from_data_url(data))
     except Exception as e:
         # print(f"Error processing frame: {str(e)}")
         emit('error', {'message': str(e)})
 
+@socketio.on('process_frame_binary')
+def handle_binary_frame(data):
+    """Process video frame sent as raw JPEG/WebP bytes"""
+    try:
+        process_payload(payload_from_binary(data))
+    except Exception as e:
+        emit('error', {'message': str(e)})
+
+@socketio.on('process_landmarks')
+def handle_landmarks(data):
+    """Classify 21 hand landmarks computed by the client, without sending video"""
+    try:
+        start = time.monotonic()
+        result = get_landmark_recognizer().process_landmarks(data)
+        update_capture_settings(time.monotonic() - start)
+        emit_gesture_result(result)
+    except Exception as e:
+        emit('error', {'message': str(e)})
+
 @socketio.on('predict_sentence')
 def handle_sentence_prediction(data):
     """Predict sentences based on collected words"""
     words = data['words']
-    sentences = word_predictor.predict_sentences(words)
+    start = time.perf_counter()
+    sentences = prediction_cache.predict_sentences(words)
+    pipeline_metrics.observe('predict_sentences', time.perf_counter() - start)
     emit('sentence_suggestions', {'sentences': sentences})
 
 @socketio.on('send_message')
@@ -131,4 +501,4 @@ def handle_camera_request():
     emit('camera_access_granted', {'status': 'granted'})
 
 if __name__ == '__main__':
-    socketio.run(app, debug=True, host='0.0.0.0', port=5000)
+    socketio.run(app, debug=app.config['DEV_SERVER_DEBUG'], host='0.0.0.0', port=5000)
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Headless gesture recognition over an image folder or a video file
+
+Frames are decoded on a producer thread and recognized on a pool of worker
+threads, each with its own GestureRecognizer. Per-frame gesture, confidence
+and landmarks go to a CSV, NPZ or Parquet file, followed by a throughput
+summary. Videos are tracked from frame to frame by default, which needs
+every frame in order on one recognizer, so they use a single worker
+unless --static is given.
+
+    python batch_recognize.py recordings/session1.mp4 -o session1.csv
+    python batch_recognize.py recordings/session1.mp4 -o session1.csv --static --workers 4
+    python batch_recognize.py frames/ -o frames.npz --skip 2 --workers 4
+"""
+
+import argparse
+import csv
+import os
+import queue
+import sys
+import threading
+import time
+from collections import Counter, namedtuple
+
+import cv2
+import numpy as np
+
+from frame_transport import BINARY, FrameDecoder, FramePayload
+from gesture_recognition import GestureRecognizer
+from hand_landmarks import NUM_LANDMARKS
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.webp')
+OUTPUT_FORMATS = ('.csv', '.npz', '.parquet')
+STAGES = ('decode', 'detect', 'classify')
+
+# One recognized frame; landmarks is a (21, 3) float32 array, NaN without a hand
+FrameRecord = namedtuple('FrameRecord', [
+    'index', 'source', 'timestamp_ms', 'gesture', 'word', 'confidence', 'landmarks'
+])
+
+# A decoded frame on its way from the producer to a worker
+_Frame = namedtuple('_Frame', ['index', 'source', 'timestamp_ms', 'image', 'rgb'])
+
+
+def iter_image_folder(directory, skip=1, max_width=None):
+    """Yield (frame, decode seconds) for every `skip`-th image in a folder, by name
+
+    Returns the number of images, skipped ones included.
+    """
+    names = sorted(name for name in os.listdir(directory) if name.lower().endswith(IMAGE_EXTENSIONS))
+    decoder = FrameDecoder(max_width=max_width)
+    for index, name in enumerate(names):
+        if index % skip:
+            continue
+        start = time.perf_counter()
+        with open(os.path.join(directory, name), 'rb') as f:
+            payload = FramePayload(f.read(), BINARY)
+        try:
+            image = decoder.decode(directory, payload)
+        except ValueError:
+            # Unreadable files are reported as frames without a hand
+            image = None
+        yield _Frame(index, name, None, image, True), time.perf_counter() - start
+    return len(names)
+
+
+def iter_video(path, skip=1):
+    """Yield (frame, decode seconds) for every `skip`-th frame of a video file
+
+    Returns the number of frames, skipped ones included.
+    """
+    capture = cv2.VideoCapture(path)
+    if not capture.isOpened():
+        raise ValueError(f'Could not open video: {path}')
+    try:
+        index = 0
+        while True:
+            start = time.perf_counter()
+            if index % skip:
+                # Skipped frames are demuxed but never converted
+                if not capture.grab():
+                    return index
+                index += 1
+                continue
+            ok, image = capture.read()
+            if not ok:
+                return index
+            timestamp = capture.get(cv2.CAP_PROP_POS_MSEC)
+            yield _Frame(index, os.path.basename(path), timestamp, image, False), time.perf_counter() - start
+            index += 1
+    finally:
+        capture.release()
+
+
+def recognize_source(source, workers=2, skip=1, max_width=None, static_image_mode=None, factory=None):
+    """Recognize every `skip`-th frame of an image folder or video file
+
+    Returns the FrameRecords in frame order and a summary dict with the
+    frame counts, throughput and per-stage timings. Tracking
+    (static_image_mode False) always runs on one worker: spread over
+    several, each tracker would see an arbitrary subset of the frames and
+    results would change from run to run.
+    """
+    is_folder = os.path.isdir(source)
+    frames = iter_image_folder(source, skip, max_width) if is_folder else iter_video(source, skip)
+    if static_image_mode is None:
+        # Images in a folder are unrelated; video frames can use tracking
+        static_image_mode = is_folder
+    if not static_image_mode:
+        workers = 1
+    if factory is None:
+        def factory():
+            return GestureRecognizer(static_image_mode=static_image_mode)
+
+    pending = queue.Queue(maxsize=2 * workers)
+    records = []
+    timings = {stage: [] for stage in STAGES}
+    errors = []
+    totals = []
+    lock = threading.Lock()
+
+    def produce():
+        try:
+            while True:
+                try:
+                    frame, decode_seconds = next(frames)
+                except StopIteration as stop:
+                    totals.append(stop.value)
+                    break
+                timings['decode'].append(decode_seconds)
+                pending.put(frame)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            for _ in range(workers):
+                pending.put(None)
+
+    def work():
+        gesture_recognizer = factory()
+        try:
+            while True:
+                frame = pending.get()
+                if frame is None:
+                    return
+                start = time.perf_counter()
+                points = None
+                if frame.image is not None:
+                    points = gesture_recognizer.detect_landmarks(frame.image, rgb=frame.rgb)
+                detected = time.perf_counter()
+                gesture, confidence = gesture_recognizer.recognize_gesture(points)
+                result = gesture_recognizer.build_result(points, gesture, confidence)
+                finished = time.perf_counter()
+
+                landmarks = points if points is not None else np.full((NUM_LANDMARKS, 3), np.nan, dtype=np.float32)
+                record = FrameRecord(frame.index, frame.source, frame.timestamp_ms,
+                                     gesture, result['word'], confidence, landmarks)
+                with lock:
+                    records.append(record)
+                    timings['detect'].append(detected - start)
+                    timings['classify'].append(finished - detected)
+        except Exception as e:
+            errors.append(e)
+            # Keep draining so the producer never blocks on a full queue
+            while pending.get() is not None:
+                pass
+        finally:
+            gesture_recognizer.close()
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=produce, name='batch-decode', daemon=True)]
+    threads += [threading.Thread(target=work, name=f'batch-recognize-{i}', daemon=True) for i in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    if errors:
+        raise errors[0]
+
+    records.sort(key=lambda record: record.index)
+    summary = {
+        'source': source,
+        'frames': len(records),
+        'skipped': totals[0] - len(records),
+        'hands': sum(1 for record in records if not np.isnan(record.landmarks[0, 0])),
+        'workers': workers,
+        'wall_s': wall,
+        'fps': len(records) / wall if wall else 0.0,
+        'gestures': dict(Counter(record.gesture for record in records if record.gesture).most_common())
+    }
+    for stage, seconds in timings.items():
+        milliseconds = np.array(seconds) * 1000.0 if seconds else np.zeros(1)
+        summary[f'{stage}_p50_ms'] = float(np.percentile(milliseconds, 50))
+        summary[f'{stage}_p95_ms'] = float(np.percentile(milliseconds, 95))
+    return records, summary
+
+
+def _landmark_columns():
+    return [f'{axis}{i}' for i in range(NUM_LANDMARKS) for axis in 'xyz']
+
+
+def write_results(records, output):
+    """Write FrameRecords to a .csv, .npz or .parquet file, by extension"""
+    extension = os.path.splitext(output)[1].lower()
+    if extension not in OUTPUT_FORMATS:
+        raise ValueError(f'Unsupported output format {extension!r}, expected one of {OUTPUT_FORMATS}')
+
+    landmarks = np.stack([record.landmarks for record in records]) if records else \
+        np.zeros((0, NUM_LANDMARKS, 3), dtype=np.float32)
+
+    if extension == '.npz':
+        np.savez_compressed(
+            output,
+            frame=np.array([record.index for record in records], dtype=np.int64),
+            source=np.array([record.source for record in records]),
+            timestamp_ms=np.array([np.nan if record.timestamp_ms is None else record.timestamp_ms
+                                   for record in records], dtype=np.float64),
+            gesture=np.array([record.gesture or '' for record in records]),
+            word=np.array([record.word or '' for record in records]),
+            confidence=np.array([record.confidence for record in records], dtype=np.float32),
+            landmarks=landmarks
+        )
+        return
+
+    header = ['frame', 'source', 'timestamp_ms', 'gesture', 'word', 'confidence'] + _landmark_columns()
+    rows = []
+    for record, points in zip(records, landmarks.reshape(len(records), -1)):
+        coordinates = [] if np.isnan(points[0]) else [f'{value:.5f}' for value in points.tolist()]
+        timestamp = '' if record.timestamp_ms is None else f'{record.timestamp_ms:.1f}'
+        rows.append([record.index, record.source, timestamp, record.gesture or '', record.word or '',
+                     f'{record.confidence:.3f}'] + (coordinates or [''] * len(points)))
+
+    if extension == '.csv':
+        with open(output, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows)
+        return
+
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError('Parquet output needs pyarrow: pip install pyarrow')
+    columns = {
+        'frame': [record.index for record in records],
+        'source': [record.source for record in records],
+        'timestamp_ms': [record.timestamp_ms for record in records],
+        'gesture': [record.gesture for record in records],
+        'word': [record.word for record in records],
+        'confidence': [record.confidence for record in records]
+    }
+    flat = landmarks.reshape(len(records), -1)
+    for i, name in enumerate(_landmark_columns()):
+        columns[name] = flat[:, i]
+    pq.write_table(pa.table(columns), output)
+
+
+def format_summary(summary):
+    """Human-readable throughput summary"""
+    lines = [
+        f"{summary['source']}: {summary['frames']} frames recognized, {summary['skipped']} skipped, "
+        f"{summary['hands']} with a hand",
+        f"{summary['wall_s']:.2f} s on {summary['workers']} workers, {summary['fps']:.1f} frames/s"
+    ]
+    for stage in STAGES:
+        lines.append(f"  {stage:<9} p50 {summary[f'{stage}_p50_ms']:8.2f} ms   "
+                     f"p95 {summary[f'{stage}_p95_ms']:8.2f} ms")
+    for gesture, count in summary['gestures'].items():
+        lines.append(f"  {gesture}: {count}")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Recognize gestures in an image folder or video file')
+    parser.add_argument('source', help='folder of images or a video file')
+    parser.add_argument('-o', '--output', help='per-frame results (.csv, .npz or .parquet)')
+    parser.add_argument('--workers', type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help='recognizer threads (default: half the CPUs)')
+    parser.add_argument('--skip', type=int, default=1, help='recognize every Nth frame (default: 1)')
+    parser.add_argument('--max-width', type=int, default=None,
+                        help='decode images at 1/2 or 1/4 scale while at least this wide')
+    parser.add_argument('--static', dest='static_image_mode', action='store_true', default=None,
+                        help='run palm detection on every frame (default for image folders)')
+    parser.add_argument('--track', dest='static_image_mode', action='store_false',
+                        help='track hands between frames (default for videos; always one worker)')
+    args = parser.parse_args(argv)
+    if args.workers < 1 or args.skip < 1:
+        parser.error('--workers and --skip must be at least 1')
+    if args.output and os.path.splitext(args.output)[1].lower() not in OUTPUT_FORMATS:
+        parser.error(f'--output must end in one of {", ".join(OUTPUT_FORMATS)}')
+
+    try:
+        records, summary = recognize_source(args.source, args.workers, args.skip, args.max_width,
+                                            args.static_image_mode)
+        if args.output:
+            write_results(records, args.output)
+    except (ValueError, RuntimeError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    for line in format_summary(summary):
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Classifier microbenchmark on seeded synthetic landmarks
+
+Times recognize_gesture, detect_specific_gestures and
+analyze_hand_orientation per call, whole-frame classification with one and
+two hands, and HandFeatures + rule-table classification per batch, without
+a camera or MediaPipe. Learned LandmarkClassifier models, trained on
+separately seeded hands labelled by the rules, are timed on the same
+batches and checked for agreement with the rules. Each run is
+appended to a local JSON-lines file (git-ignored, as timings only compare
+on the same machine) together with the git commit, and compared with the
+previous run of the same configuration.
+
+    python benchmark_classifier.py
+    python benchmark_classifier.py --max-regression 0.25   # exit 1 on a >25% slowdown
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from gesture_recognition import GESTURE_MAPPINGS, GestureRecognizer
+from hand_landmarks import HandFeatures
+from landmark_classifier import METHODS, LandmarkClassifier
+from synthetic_hands import gesture_hands, noise_hands
+
+DEFAULT_RESULTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_results.jsonl')
+BATCH_SIZES = (1, 16, 256, 4096)
+
+
+def _best_of(repeat, function):
+    """Best wall time of `repeat` runs of function(), in seconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _git_commit():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+        dirty = subprocess.run(['git', 'diff', '--quiet', 'HEAD'],
+                               cwd=os.path.dirname(os.path.abspath(__file__))).returncode != 0
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ('-dirty' if dirty else '')
+
+
+def run_benchmark(seed=0, per_gesture=16, noise=256, repeat=5):
+    """Time the classification path and return one result record"""
+    gesture_recognizer = GestureRecognizer(load_hands=False)
+    examples = gesture_hands(seed, per_gesture, GESTURE_MAPPINGS)
+    labelled = [(gesture, points) for gesture, hands in examples.items() for points in hands]
+    hands = [points for _, points in labelled] + list(noise_hands(np.random.default_rng(seed), noise))
+    features = [HandFeatures(points) for points in hands]
+    extended = [(f.extended[0].tolist(), int(f.num_extended[0])) for f in features]
+
+    # Every generated hand must still classify as the gesture it was generated for
+    mismatches = sum(gesture_recognizer.recognize_gesture(points)[0] != gesture for gesture, points in labelled)
+
+    def per_call(function):
+        return _best_of(repeat, function) * 1e6 / len(hands)
+
+    timings = {
+        'recognize_gesture_us': per_call(
+            lambda: [gesture_recognizer.recognize_gesture(points) for points in hands]),
+        'detect_specific_gestures_us': per_call(
+            lambda: [gesture_recognizer.detect_specific_gestures(points, fingers, count)
+                     for points, (fingers, count) in zip(hands, extended)]),
+        'analyze_hand_orientation_us': per_call(
+            lambda: [gesture_recognizer.analyze_hand_orientation(points) for points in hands])
+    }
+
+    # Whole-frame classification: the single-hand path against the
+    # multi-hand path with one and with two hands in the frame
+    multi_recognizer = GestureRecognizer(load_hands=False, max_hands=2)
+    handedness = [('Left', 1.0), ('Right', 1.0)]
+    pairs = [np.stack([first, second]) for first, second in zip(hands, hands[1:] + hands[:1])]
+
+    def single_hand_frame(points):
+        gesture_recognizer.build_result(points, *gesture_recognizer.recognize_gesture(points))
+
+    def multi_hand_frame(points):
+        multi_recognizer.build_hands_result(points, handedness, *multi_recognizer.classify_hands(points))
+
+    timings['frame_single_hand_us'] = per_call(lambda: [single_hand_frame(points) for points in hands])
+    timings['frame_multi_1_hand_us'] = per_call(lambda: [multi_hand_frame(points[:1]) for points in pairs])
+    timings['frame_multi_2_hands_us'] = per_call(lambda: [multi_hand_frame(points) for points in pairs])
+
+    # Learned classifiers, trained on other hands than the ones timed
+    training = gesture_hands(seed + 1, 4 * per_gesture, GESTURE_MAPPINGS)
+    classifiers = {
+        method: LandmarkClassifier.train(np.concatenate(list(training.values())),
+                                         [gesture for gesture, examples in training.items() for _ in examples],
+                                         method)
+        for method in METHODS
+    }
+    labelled_points = np.stack([points for _, points in labelled])
+    agreement = {
+        method: sum(predicted == gesture for (predicted, _), (gesture, _)
+                    in zip(classifier.classify(labelled_points), labelled)) / len(labelled)
+        for method, classifier in classifiers.items()
+    }
+    for method, classifier in classifiers.items():
+        recognizer = GestureRecognizer(load_hands=False, classifier=classifier)
+        timings[f'{method}_recognize_gesture_us'] = per_call(
+            lambda: [recognizer.recognize_gesture(points) for points in hands])
+
+    rng = np.random.default_rng(seed)
+    pool = np.stack(hands)
+    for size in BATCH_SIZES:
+        batch = pool[rng.integers(0, len(pool), size)]
+        seconds = _best_of(repeat, lambda: gesture_recognizer.classify_features(HandFeatures(batch)))
+        timings[f'batch_{size}_us'] = seconds * 1e6
+        timings[f'batch_{size}_per_hand_us'] = seconds * 1e6 / size
+        for method, classifier in classifiers.items():
+            seconds = _best_of(repeat, lambda: classifier.classify(batch))
+            timings[f'{method}_batch_{size}_us'] = seconds * 1e6
+            timings[f'{method}_batch_{size}_per_hand_us'] = seconds * 1e6 / size
+
+    unproducible = sorted(set(GESTURE_MAPPINGS) - set(examples))
+    return {
+        'commit': _git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'config': {'seed': seed, 'per_gesture': per_gesture, 'noise': noise, 'repeat': repeat},
+        'hands': len(hands),
+        'gestures_covered': len(examples),
+        'gestures_unproducible': unproducible,
+        'mismatches': mismatches,
+        'classifier_agreement': agreement,
+        'timings': timings
+    }
+
+
+def load_results(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def compare(result, previous):
+    """Return {metric: new / old} against an earlier result"""
+    return {
+        name: value / previous['timings'][name]
+        for name, value in result['timings'].items()
+        if previous['timings'].get(name)
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark gesture classification on synthetic landmarks')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--per-gesture', type=int, default=16, help='hands generated per producible gesture')
+    parser.add_argument('--noise', type=int, default=256, help='uniformly random hands added')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per measurement, best one kept')
+    parser.add_argument('--results', default=DEFAULT_RESULTS, help='JSON-lines file of past runs')
+    parser.add_argument('--no-save', action='store_true', help='do not append this run to the results file')
+    parser.add_argument('--max-regression', type=float, default=None,
+                        help='exit 1 if any timing is this fraction slower than the previous run')
+    args = parser.parse_args(argv)
+
+    result = run_benchmark(args.seed, args.per_gesture, args.noise, args.repeat)
+    history = [entry for entry in load_results(args.results) if entry.get('config') == result['config']]
+    ratios = compare(result, history[-1]) if history else {}
+
+    print(f"{result['hands']} hands, {result['gestures_covered']} gestures covered, "
+          f"{result['mismatches']} mismatches")
+    if result['gestures_unproducible']:
+        print(f"never produced by the one-hand rules: {', '.join(result['gestures_unproducible'])}")
+    for method, fraction in result['classifier_agreement'].items():
+        print(f"{method} classifier agrees with the rules on {fraction:.1%} of the generated hands")
+    for name, value in result['timings'].items():
+        change = f"  {(ratios[name] - 1.0) * 100.0:+6.1f}% vs {history[-1]['commit']}" if name in ratios else ''
+        print(f"  {name:<32}{value:>12.2f}{change}")
+
+    if not args.no_save:
+        with open(args.results, 'a') as f:
+            f.write(json.dumps(result, sort_keys=True) + '\n')
+
+    if result['mismatches']:
+        return 1
+    if args.max_regression is not None and any(ratio > 1.0 + args.max_regression for ratio in ratios.values()):
+        print(f"Regression above {args.max_regression:.0%}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
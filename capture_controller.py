@@ -0,0 +1,170 @@
+import threading
+import time
+from collections import namedtuple
+
+# What the browser is told to capture: frame interval, frame width in
+# pixels (height follows the camera's aspect ratio) and JPEG/WebP quality
+CaptureSettings = namedtuple('CaptureSettings', ['interval_ms', 'width', 'quality'])
+
+# What the server saw for one session over the last evaluation period:
+# smoothed frame latency from receipt to result, the deepest the session's
+# mailbox got, and how many frames were processed
+SessionLoad = namedtuple('SessionLoad', ['latency_ms', 'queue_depth', 'frames', 'sessions'])
+
+# Frame interval the browser starts with (captureInterval in static/js/app.js)
+CLIENT_INTERVAL_MS = 200
+
+
+class CapturePolicy:
+    """Default capture policy: back off multiplicatively, recover additively
+
+    Under load the frame interval grows first; once it is at its maximum
+    the width and then the quality step down. When the server is idle the
+    steps are undone in reverse order. Subclass and override `initial` and
+    `adjust` for other policies.
+    """
+
+    def __init__(self, min_interval_ms=100, max_interval_ms=1000, widths=(640, 480, 320),
+                 qualities=(0.7, 0.6, 0.5), busy_ratio=0.8, idle_ratio=0.3,
+                 backoff=1.5, recovery_ms=25):
+        self.min_interval_ms = min_interval_ms
+        self.max_interval_ms = max_interval_ms
+        # Best first
+        self.widths = tuple(widths)
+        self.qualities = tuple(qualities)
+        # Latency as a fraction of the interval above which a session is busy,
+        # and below which it is idle
+        self.busy_ratio = busy_ratio
+        self.idle_ratio = idle_ratio
+        self.backoff = backoff
+        self.recovery_ms = recovery_ms
+
+    def initial(self):
+        """Settings for a new session: the client's built-in defaults, within the interval bounds"""
+        interval = min(max(CLIENT_INTERVAL_MS, self.min_interval_ms), self.max_interval_ms)
+        return CaptureSettings(interval, self.widths[0], self.qualities[0])
+
+    def adjust(self, settings, load):
+        """Return the settings for the next period given the last period's load"""
+        busy = load.queue_depth > 0 or load.latency_ms > self.busy_ratio * settings.interval_ms
+        idle = load.queue_depth == 0 and load.latency_ms < self.idle_ratio * settings.interval_ms
+
+        if busy:
+            if settings.interval_ms < self.max_interval_ms:
+                interval = min(self.max_interval_ms, int(settings.interval_ms * self.backoff))
+                return settings._replace(interval_ms=interval)
+            width = _step(self.widths, settings.width, 1)
+            if width != settings.width:
+                return settings._replace(width=width)
+            return settings._replace(quality=_step(self.qualities, settings.quality, 1))
+
+        if idle:
+            quality = _step(self.qualities, settings.quality, -1)
+            if quality != settings.quality:
+                return settings._replace(quality=quality)
+            width = _step(self.widths, settings.width, -1)
+            if width != settings.width:
+                return settings._replace(width=width)
+            interval = max(self.min_interval_ms, settings.interval_ms - self.recovery_ms)
+            return settings._replace(interval_ms=interval)
+
+        return settings
+
+
+def _step(ladder, value, direction):
+    """Move one rung along a best-first ladder, staying on it"""
+    index = ladder.index(value) if value in ladder else 0
+    return ladder[min(max(index + direction, 0), len(ladder) - 1)]
+
+
+class _SessionState:
+    __slots__ = ('settings', 'latency_ms', 'queue_depth', 'frames', 'period_start', 'announced')
+
+    def __init__(self, settings, now):
+        self.settings = settings
+        self.latency_ms = None
+        self.queue_depth = 0
+        self.frames = 0
+        self.period_start = now
+        self.announced = False
+
+
+class CaptureController:
+    """Per-session capture settings driven by the server's measured load
+
+    Every processed frame reports its latency and the session's queue
+    depth. Once per `period` seconds the policy turns the smoothed figures
+    into new settings; `record` returns them when they changed (and on a
+    session's first frame) so the caller can push them to the client.
+    """
+
+    def __init__(self, policy=None, period=1.0, smoothing=0.3):
+        self.policy = policy or CapturePolicy()
+        self.period = period
+        # Weight of the newest frame in the latency moving average
+        self.smoothing = smoothing
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self.stats = {
+            'updates': 0,
+            'backoffs': 0,
+            'recoveries': 0
+        }
+
+    def record(self, sid, latency, queue_depth=0, now=None):
+        """Account one processed frame; return CaptureSettings to push, or None"""
+        if now is None:
+            now = time.monotonic()
+        latency_ms = latency * 1000.0
+
+        with self._lock:
+            state = self._sessions.get(sid)
+            if state is None:
+                state = self._sessions[sid] = _SessionState(self.policy.initial(), now)
+            if state.latency_ms is None:
+                state.latency_ms = latency_ms
+            else:
+                state.latency_ms += self.smoothing * (latency_ms - state.latency_ms)
+            state.queue_depth = max(state.queue_depth, queue_depth)
+            state.frames += 1
+
+            if not state.announced:
+                state.announced = True
+                return state.settings
+            if now - state.period_start < self.period:
+                return None
+
+            load = SessionLoad(state.latency_ms, state.queue_depth, state.frames, len(self._sessions))
+            settings = self.policy.adjust(state.settings, load)
+            state.queue_depth = 0
+            state.frames = 0
+            state.period_start = now
+            if settings == state.settings:
+                return None
+
+            self.stats['updates'] += 1
+            if settings.interval_ms > state.settings.interval_ms or settings.width < state.settings.width \
+                    or settings.quality < state.settings.quality:
+                self.stats['backoffs'] += 1
+            else:
+                self.stats['recoveries'] += 1
+            state.settings = settings
+            return settings
+
+    def settings(self, sid):
+        """Current settings for a session, or the policy's initial ones"""
+        with self._lock:
+            state = self._sessions.get(sid)
+            return state.settings if state else self.policy.initial()
+
+    def release(self, sid):
+        with self._lock:
+            self._sessions.pop(sid, None)
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats['sessions'] = len(self._sessions)
+            intervals = [state.settings.interval_ms for state in self._sessions.values()]
+        stats['mean_interval_ms'] = sum(intervals) / len(intervals) if intervals else 0.0
+        return stats
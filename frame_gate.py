@@ -0,0 +1,142 @@
+import hashlib
+import threading
+import time
+
+import cv2
+
+from frame_transport import encoded_buffer
+
+# Skip reasons, also the stats keys
+DUPLICATE = 'duplicate'
+STATIC = 'static'
+NO_HAND = 'no_hand'
+
+
+class _GateState:
+    __slots__ = ('result', 'digest', 'thumbnail', 'reused', 'no_hand', 'idle_frames')
+
+    def __init__(self):
+        self.result = None
+        self.digest = None
+        self.thumbnail = None
+        self.reused = 0
+        self.no_hand = 0
+        self.idle_frames = 0
+
+
+class FrameGate:
+    """Per-session pre-stage that skips frames MediaPipe would learn nothing from
+
+    Three checks run before a frame is decoded: a payload identical to the
+    last processed one (by hash), a frame whose 1/8-scale grayscale
+    thumbnail barely differs from the last processed one, and, after
+    `idle_after` frames in a row without a hand, every frame but one in
+    `probe_every`. Skipped frames reuse the session's last result. At most
+    `max_reuse` frames in a row are answered from a duplicate or static
+    check, so a slow drift is still picked up.
+    """
+
+    def __init__(self, motion_threshold=2.0, max_reuse=10, idle_after=10, probe_every=5):
+        # Mean absolute grey-level difference below which a frame is static
+        self.motion_threshold = motion_threshold
+        self.max_reuse = max_reuse
+        self.idle_after = idle_after
+        self.probe_every = probe_every
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self.stats = {
+            'frames': 0,
+            'processed': 0,
+            DUPLICATE: 0,
+            STATIC: 0,
+            NO_HAND: 0
+        }
+        self._gate_seconds = 0.0
+        self._process_seconds = 0.0
+
+    def process(self, sid, payload, process):
+        """Return the session's last result for a skippable frame, else `process(sid, payload)`"""
+        start = time.perf_counter()
+        with self._lock:
+            state = self._sessions.get(sid)
+            if state is None:
+                state = self._sessions[sid] = _GateState()
+            self.stats['frames'] += 1
+
+        reason, digest, thumbnail = self._check(state, payload)
+        checked = time.perf_counter()
+        if reason is not None:
+            with self._lock:
+                self.stats[reason] += 1
+                self._gate_seconds += checked - start
+            return state.result
+
+        result = process(sid, payload)
+        finished = time.perf_counter()
+
+        state.result = result
+        state.digest = digest
+        state.thumbnail = thumbnail
+        state.reused = 0
+        if result['landmarks']:
+            state.no_hand = 0
+            state.idle_frames = 0
+        else:
+            state.no_hand += 1
+        with self._lock:
+            self.stats['processed'] += 1
+            self._gate_seconds += checked - start
+            self._process_seconds += finished - checked
+        return result
+
+    def _check(self, state, payload):
+        """Return (skip reason or None, payload digest, thumbnail)"""
+        data = payload.data.encode() if isinstance(payload.data, str) else payload.data
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        if state.result is None:
+            return None, digest, self._thumbnail(payload)
+
+        if digest == state.digest and state.reused < self.max_reuse:
+            state.reused += 1
+            return DUPLICATE, digest, None
+
+        if self.idle_after and state.no_hand >= self.idle_after:
+            state.idle_frames += 1
+            if state.idle_frames % self.probe_every:
+                return NO_HAND, digest, None
+
+        thumbnail = self._thumbnail(payload)
+        if (self.motion_threshold and thumbnail is not None and state.thumbnail is not None
+                and thumbnail.shape == state.thumbnail.shape and state.reused < self.max_reuse):
+            if cv2.norm(thumbnail, state.thumbnail, cv2.NORM_L1) / thumbnail.size < self.motion_threshold:
+                state.reused += 1
+                return STATIC, digest, None
+        return None, digest, thumbnail
+
+    def _thumbnail(self, payload):
+        # JPEG decoders scale by 1/8 during the DCT, so this is far cheaper than a full decode
+        try:
+            return cv2.imdecode(encoded_buffer(payload), cv2.IMREAD_REDUCED_GRAYSCALE_8)
+        except (cv2.error, ValueError):
+            return None
+
+    def release(self, sid):
+        with self._lock:
+            self._sessions.pop(sid, None)
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats['sessions'] = len(self._sessions)
+            gate_seconds = self._gate_seconds
+            process_seconds = self._process_seconds
+
+        skipped = stats[DUPLICATE] + stats[STATIC] + stats[NO_HAND]
+        mean_process = process_seconds / stats['processed'] if stats['processed'] else 0.0
+        stats['skip_ratio'] = skipped / stats['frames'] if stats['frames'] else 0.0
+        stats['gate_ms'] = gate_seconds * 1000.0 / stats['frames'] if stats['frames'] else 0.0
+        stats['process_ms'] = mean_process * 1000.0
+        # Processing the skipped frames would have cost the mean processing
+        # time each; the checks themselves run on every frame
+        stats['cpu_saved_s'] = max(0.0, skipped * mean_process - gate_seconds)
+        return stats
@@ -0,0 +1,104 @@
+import threading
+import time
+
+
+class _Slot:
+    __slots__ = ('pending', 'busy')
+
+    def __init__(self):
+        self.pending = None
+        self.busy = False
+
+
+class FrameMailbox:
+    """Per-session single-slot mailbox where the newest frame always wins
+
+    A frame that arrives while its session is still being processed replaces
+    any frame that has not started yet, so a slow server skips stale frames
+    instead of queueing them. Frames and results that are older than
+    `deadline` seconds are dropped instead of being processed or emitted.
+    """
+
+    def __init__(self, deadline=1.0):
+        self.deadline = deadline
+        self._lock = threading.Lock()
+        self._slots = {}
+        self.stats = {
+            'received': 0,
+            'dropped': 0,
+            'expired': 0,
+            'processed': 0
+        }
+
+    def offer(self, sid, payload):
+        """Deposit a frame; return True when the caller should drain the session"""
+        with self._lock:
+            self.stats['received'] += 1
+            slot = self._slots.get(sid)
+            if slot is None:
+                slot = self._slots[sid] = _Slot()
+            if slot.pending is not None:
+                self.stats['dropped'] += 1
+            slot.pending = payload
+            if slot.busy:
+                return False
+            slot.busy = True
+            return True
+
+    def drain(self, sid):
+        """Yield the session's latest pending frame until the mailbox is empty"""
+        finished = False
+        try:
+            while True:
+                with self._lock:
+                    slot = self._slots.get(sid)
+                    if slot is None:
+                        finished = True
+                        return
+                    payload = slot.pending
+                    slot.pending = None
+                    if payload is None:
+                        slot.busy = False
+                        finished = True
+                        return
+                if self.is_expired(payload):
+                    continue
+                yield payload
+        finally:
+            if not finished:
+                # The consumer failed mid-frame; a frame left pending is
+                # picked up by the next offer for this session
+                with self._lock:
+                    slot = self._slots.get(sid)
+                    if slot is not None:
+                        slot.busy = False
+
+    def is_expired(self, payload, now=None):
+        """Check a frame against the deadline, counting it as expired if late"""
+        now = time.monotonic() if now is None else now
+        if now - payload.received_at <= self.deadline:
+            return False
+        with self._lock:
+            self.stats['expired'] += 1
+        return True
+
+    def mark_processed(self):
+        with self._lock:
+            self.stats['processed'] += 1
+
+    def depth(self, sid):
+        """Number of frames waiting for `sid` (0 or 1)"""
+        with self._lock:
+            slot = self._slots.get(sid)
+            return int(slot is not None and slot.pending is not None)
+
+    def release(self, sid):
+        with self._lock:
+            self._slots.pop(sid, None)
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats['sessions'] = len(self._slots)
+        stats['deadline'] = self.deadline
+        return stats
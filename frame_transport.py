@@ -0,0 +1,226 @@
+import base64
+import threading
+import time
+
+import cv2
+import numpy as np
+
+# Transport names used in stats and on the wire
+DATA_URL = 'data_url'
+BINARY = 'binary'
+
+# imdecode flags for each JPEG downscale factor; JPEG scales during the
+# inverse DCT, so reduced decodes are cheaper than full ones
+_BGR_FLAGS = {1: cv2.IMREAD_COLOR, 2: cv2.IMREAD_REDUCED_COLOR_2, 4: cv2.IMREAD_REDUCED_COLOR_4}
+
+
+class FramePayload:
+    """Encoded frame as it arrived from the client, decoded only when processed"""
+
+    __slots__ = ('data', 'transport', 'received_at')
+
+    def __init__(self, data, transport, received_at=None):
+        self.data = data
+        self.transport = transport
+        self.received_at = time.monotonic() if received_at is None else received_at
+
+    @property
+    def size(self):
+        """Number of bytes the frame took on the wire"""
+        return len(self.data)
+
+
+def payload_from_data_url(data):
+    """Build a payload from the legacy `{'frame': 'data:image/jpeg;base64,...'}` event"""
+    if not isinstance(data, dict) or 'frame' not in data:
+        raise ValueError('No frame data received')
+
+    frame_data = data['frame']
+    if not isinstance(frame_data, str) or ',' not in frame_data:
+        raise ValueError('Invalid frame format')
+
+    return FramePayload(frame_data, DATA_URL)
+
+
+def payload_from_binary(data):
+    """Build a payload from raw JPEG/WebP bytes sent by `canvas.toBlob`"""
+    if isinstance(data, dict):
+        data = data.get('frame')
+    if not isinstance(data, (bytes, bytearray, memoryview)) or len(data) == 0:
+        raise ValueError('No frame data received')
+
+    return FramePayload(data, BINARY)
+
+
+def encoded_buffer(payload):
+    """Return the compressed image bytes of a payload as a uint8 array
+
+    Binary payloads are wrapped without copying; data URLs still need
+    their base64 body decoded first.
+    """
+    if payload.transport == DATA_URL:
+        data = base64.b64decode(payload.data.split(',', 1)[1])
+    else:
+        data = memoryview(payload.data)
+    return np.frombuffer(data, np.uint8)
+
+
+def _rgb_flags():
+    """imdecode flags that decode straight to RGB, or None if OpenCV cannot
+
+    IMREAD_COLOR_RGB arrived in OpenCV 4.10; the probe also checks that it
+    combines with the reduced-size flags.
+    """
+    rgb = getattr(cv2, 'IMREAD_COLOR_RGB', None)
+    if rgb is None:
+        return None
+    flags = {scale: flag & ~cv2.IMREAD_COLOR | rgb for scale, flag in _BGR_FLAGS.items()}
+    probe = cv2.imencode('.jpg', np.zeros((16, 16, 3), dtype=np.uint8))[1]
+    try:
+        if all(cv2.imdecode(probe, flag) is not None for flag in flags.values()):
+            return flags
+    except cv2.error:
+        pass
+    return None
+
+
+_RGB_FLAGS = _rgb_flags()
+
+
+class FrameDecoder:
+    """Decode payloads to RGB frames for MediaPipe with one allocation per frame
+
+    Where OpenCV supports it the decoder writes RGB directly; otherwise
+    the BGR result is converted in place. With `max_width` set, JPEGs are
+    decoded at 1/2 or 1/4 scale whenever the session's frames are at
+    least that many times wider than needed. With `metrics` set, the
+    base64, imdecode and cvtColor stages are timed separately.
+    """
+
+    def __init__(self, max_width=None, stats=None, metrics=None):
+        self.max_width = max_width
+        self.stats = stats
+        self.metrics = metrics
+        self._lock = threading.Lock()
+        # Full-resolution width of each session's last frame
+        self._widths = {}
+
+    def decode(self, sid, payload):
+        """Decode a payload into an RGB frame, recording size and decode time"""
+        scale = self._scale(sid)
+        start = time.perf_counter()
+        buffer = encoded_buffer(payload)
+        buffered = time.perf_counter()
+        if _RGB_FLAGS is not None:
+            frame = cv2.imdecode(buffer, _RGB_FLAGS[scale])
+            decoded = converted = time.perf_counter()
+        else:
+            frame = cv2.imdecode(buffer, _BGR_FLAGS[scale])
+            decoded = time.perf_counter()
+            if frame is not None:
+                cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frame)
+            converted = time.perf_counter()
+        if self.stats is not None:
+            self.stats.record(payload.transport, payload.size, converted - start)
+        if self.metrics is not None:
+            if payload.transport == DATA_URL:
+                self.metrics.observe('base64', buffered - start)
+            self.metrics.observe('imdecode', decoded - buffered)
+            if _RGB_FLAGS is None:
+                self.metrics.observe('cvtColor', converted - decoded)
+
+        if frame is None:
+            raise ValueError('Failed to decode frame')
+        if self.max_width:
+            with self._lock:
+                self._widths[sid] = frame.shape[1] * scale
+        return frame
+
+    def _scale(self, sid):
+        if not self.max_width:
+            return 1
+        with self._lock:
+            width = self._widths.get(sid)
+        if width is None:
+            return 1
+        for scale in (4, 2):
+            if width >= self.max_width * scale:
+                return scale
+        return 1
+
+    def release(self, sid):
+        with self._lock:
+            self._widths.pop(sid, None)
+
+
+class TransportStats:
+    """Bytes-per-frame and decode time for each frame transport"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals = {}
+
+    def record(self, transport, size, decode_seconds):
+        with self._lock:
+            totals = self._totals.setdefault(transport, [0, 0, 0.0])
+            totals[0] += 1
+            totals[1] += size
+            totals[2] += decode_seconds
+
+    def get_stats(self):
+        """Return per-transport averages"""
+        with self._lock:
+            totals = {name: list(values) for name, values in self._totals.items()}
+
+        stats = {}
+        for transport, (frames, size, seconds) in totals.items():
+            stats[transport] = {
+                'frames': frames,
+                'bytes_per_frame': size / frames,
+                'decode_ms': seconds * 1000.0 / frames
+            }
+        return stats
+
+
+if __name__ == "__main__":
+    import tracemalloc
+
+    # Allocations and time per frame: imdecode + cvtColor as before, and
+    # FrameDecoder at full and reduced resolution
+    sizes = {'480p': (480, 640), '720p': (720, 1280), '1080p': (1080, 1920)}
+    repeats = 50
+    rng = np.random.default_rng(0)
+
+    def previous_path(payload):
+        frame = cv2.imdecode(encoded_buffer(payload), cv2.IMREAD_COLOR)
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+    def measure(decode, payload):
+        decode(payload)
+        times = []
+        tracemalloc.start()
+        for _ in range(repeats):
+            start = time.perf_counter()
+            decode(payload)
+            times.append((time.perf_counter() - start) * 1000.0)
+        tracemalloc.reset_peak()
+        decode(payload)
+        allocated = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return float(np.median(times)), allocated / 1e6
+
+    print(f"rgb decode: {'yes' if _RGB_FLAGS else 'no, in-place cvtColor'}")
+    print(f"{'frame':<8}{'path':<22}{'ms':>8}{'MB alloc':>10}")
+    for name, (height, width) in sizes.items():
+        image = cv2.GaussianBlur(rng.integers(0, 255, (height, width, 3), dtype=np.uint8), (9, 9), 3)
+        payload = FramePayload(cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, 70])[1].tobytes(), BINARY)
+        reduced = FrameDecoder(max_width=320)
+        reduced.decode('bench', payload)
+        paths = [
+            ('imdecode + cvtColor', previous_path),
+            ('FrameDecoder', lambda p: FrameDecoder().decode('bench', p)),
+            ('FrameDecoder, 320 px', lambda p: reduced.decode('bench', p))
+        ]
+        for label, decode in paths:
+            ms, megabytes = measure(decode, payload)
+            print(f"{name:<8}{label:<22}{ms:>8.2f}{megabytes:>10.2f}")
@@ -1,333 +1,328 @@
 import cv2
-import mediapipe as mp
 import numpy as np
 import math
+import time
+from gesture_rules import classify_pairs, compiled_rule_table, hand_pairs
+from hand_landmarks import HandFeatures, as_landmark_array, hand_state, landmarks_to_dicts, validate_landmarks
+from hand_roi import HandRoi
+
+# Gesture mappings matching the tutorial exactly
+GESTURE_MAPPINGS = {
+    # NUMBERS (7 gestures) - As shown in tutorial
+    'zero': 'zero',
+    'one': 'one',
+    'two': 'two',
+    'three': 'three',
+    'four': 'four',
+    'five': 'five',
+    'peace': 'peace',
+    'ok': 'okay',
+
+    # EMOTIONS (8 gestures) - As shown in tutorial
+    'thumbs_up': 'good',
+    'thumbs_down': 'bad',
+    'love_sign': 'love',
+    'happy_palm': 'happy',
+    'sad_fist': 'sad',
+    'worried_forehead': 'worried',
+    'tired_rub': 'tired',
+    'grateful_bow': 'grateful',
+
+    # BASIC NEEDS (8 gestures) - As shown in tutorial
+    'help_wave': 'help',
+    'stop_palm': 'stop',
+    'eat_mouth': 'eat',
+    'drink_cup': 'drink',
+    'sleep_head': 'sleep',
+    'bathroom_urgent': 'bathroom',
+    'hot_fan': 'hot',
+    'cold_shiver': 'cold',
+
+    # SOCIAL (9 gestures) - Common interactions
+    'hello_wave': 'hello',
+    'bye_wave': 'bye',
+    'yes_nod': 'yes',
+    'no_shake': 'no',
+    'please_pray': 'please',
+    'thanks_bow': 'thanks',
+    'you_point': 'you',
+    'me_point': 'me',
+    'call_phone': 'call'
+}
+
+def _point_xy(point):
+    """Return (x, y) of a MediaPipe landmark or a landmark array row"""
+    if hasattr(point, 'x'):
+        return point.x, point.y
+    return float(point[0]), float(point[1])
+
+def _mediapipe():
+    """Import MediaPipe on first use; the import alone takes over half a second"""
+    import mediapipe as mp
+    return mp
 
 class GestureRecognizer:
-    def __init__(self):
-        self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=1,
+    def __init__(self, load_hands=True, roi_size=None, static_image_mode=False, metrics=None, max_hands=1,
+                 classifier=None):
+        if roi_size and max_hands > 1:
+            raise ValueError('Hand ROI tracking only supports max_hands=1')
+
+        # Unrelated still images need palm detection on every frame; video tracks
+        self.static_image_mode = static_image_mode
+
+        # With more than one hand, process_frame reports every hand and
+        # checks the two-hand rules
+        self.max_hands = max_hands
+
+        # The Hands graph is only needed for frames; landmark-only use never builds it
+        self._hands = self._create_hands() if load_hands else None
+
+        # Optional region-of-interest tracking: crop frames around the last hand
+        self.roi = HandRoi(roi_size) if roi_size else None
+        
+        # Gesture mappings matching the tutorial exactly
+        self.gesture_mappings = dict(GESTURE_MAPPINGS)
+
+        # Gesture rules compiled into a lookup table, shared by all recognizers
+        self.rule_table = compiled_rule_table(self.gesture_mappings)
+
+        # Optional LandmarkClassifier used instead of the rule table for single hands;
+        # the two-hand rules still apply
+        self.classifier = classifier
+
+        # Optional PipelineMetrics timing hands.process and recognize_gesture
+        self.metrics = metrics
+    
+    def _create_hands(self):
+        return self.mp_hands.Hands(
+            static_image_mode=self.static_image_mode,
+            max_num_hands=self.max_hands,
             min_detection_confidence=0.3,
             min_tracking_confidence=0.2
         )
-        self.mp_drawing = mp.solutions.drawing_utils
-        
-        # Gesture mappings matching the tutorial exactly
-        self.gesture_mappings = {
-            # NUMBERS (7 gestures) - As shown in tutorial
-            'zero': 'zero',
-            'one': 'one',
-            'two': 'two',
-            'three': 'three',
-            'four': 'four',
-            'five': 'five',
-            'peace': 'peace',
-            'ok': 'okay',
-
-            # EMOTIONS (8 gestures) - As shown in tutorial
-            'thumbs_up': 'good',
-            'thumbs_down': 'bad',
-            'love_sign': 'love',
-            'happy_palm': 'happy',
-            'sad_fist': 'sad',
-            'worried_forehead': 'worried',
-            'tired_rub': 'tired',
-            'grateful_bow': 'grateful',
-
-            # BASIC NEEDS (8 gestures) - As shown in tutorial
-            'help_wave': 'help',
-            'stop_palm': 'stop',
-            'eat_mouth': 'eat',
-            'drink_cup': 'drink',
-            'sleep_head': 'sleep',
-            'bathroom_urgent': 'bathroom',
-            'hot_fan': 'hot',
-            'cold_shiver': 'cold',
-
-            # SOCIAL (9 gestures) - Common interactions
-            'hello_wave': 'hello',
-            'bye_wave': 'bye',
-            'yes_nod': 'yes',
-            'no_shake': 'no',
-            'please_pray': 'please',
-            'thanks_bow': 'thanks',
-            'you_point': 'you',
-            'me_point': 'me',
-            'call_phone': 'call'
-        }
+
+    @property
+    def mp_hands(self):
+        return _mediapipe().solutions.hands
+
+    @property
+    def mp_drawing(self):
+        return _mediapipe().solutions.drawing_utils
+
+    @property
+    def hands(self):
+        """MediaPipe Hands graph, built on first use"""
+        if self._hands is None:
+            self._hands = self._create_hands()
+        return self._hands
     
     def get_gesture_mappings(self):
         """Return all gesture mappings for tutorial"""
         return self.gesture_mappings
+
+    def reset(self):
+        """Clear MediaPipe tracking state so the instance can serve a new session"""
+        if self._hands is not None:
+            self._hands.reset()
+        if self.roi is not None:
+            self.roi.reset()
+
+    def close(self):
+        """Release the MediaPipe Hands graph"""
+        if self._hands is not None:
+            self._hands.close()
+            self._hands = None
     
     def calculate_distance(self, point1, point2):
         """Calculate Euclidean distance between two points"""
-        return math.sqrt((point1.x - point2.x)**2 + (point1.y - point2.y)**2)
+        x1, y1 = _point_xy(point1)
+        x2, y2 = _point_xy(point2)
+        return math.sqrt((x1 - x2)**2 + (y1 - y2)**2)
     
     def is_finger_extended(self, landmarks, finger_tip, finger_pip, finger_mcp):
         """Check if a finger is extended"""
-        return landmarks[finger_tip].y < landmarks[finger_pip].y and landmarks[finger_pip].y < landmarks[finger_mcp].y
+        points = as_landmark_array(landmarks)
+        return bool(points[finger_tip, 1] < points[finger_pip, 1] and points[finger_pip, 1] < points[finger_mcp, 1])
 
     def is_thumb_extended(self, landmarks):
         """Check if thumb is extended - special logic for thumb"""
         # Thumb tip (4) should be further from wrist (0) than thumb IP (3)
-        thumb_tip = landmarks[4]
-        thumb_ip = landmarks[3]
-        wrist = landmarks[0]
+        return bool(self._hand_state(landmarks).finger_mask & 1)
 
-        # Calculate distances from wrist
-        tip_distance = math.sqrt((thumb_tip.x - wrist.x)**2 + (thumb_tip.y - wrist.y)**2)
-        ip_distance = math.sqrt((thumb_ip.x - wrist.x)**2 + (thumb_ip.y - wrist.y)**2)
-
-        return tip_distance > ip_distance
+    def extract_features(self, landmarks):
+        """Compute finger states, tip distances and orientation for one hand or a batch"""
+        return HandFeatures(landmarks)
     
     def recognize_gesture(self, landmarks):
         """Recognize gesture based on hand landmarks"""
-        if not landmarks:
+        if landmarks is None or len(landmarks) == 0:
             return None, 0.0
-        
-        # Get landmark positions
-        thumb_tip = landmarks[4]
-        thumb_ip = landmarks[3]
-        index_tip = landmarks[8]
-        index_pip = landmarks[6]
-        index_mcp = landmarks[5]
-        middle_tip = landmarks[12]
-        middle_pip = landmarks[10]
-        middle_mcp = landmarks[9]
-        ring_tip = landmarks[16]
-        ring_pip = landmarks[14]
-        ring_mcp = landmarks[13]
-        pinky_tip = landmarks[20]
-        pinky_pip = landmarks[18]
-        pinky_mcp = landmarks[17]
-        
-        # Check which fingers are extended
-        thumb_extended = self.is_thumb_extended(landmarks)
-        index_extended = self.is_finger_extended(landmarks, 8, 6, 5)
-        middle_extended = self.is_finger_extended(landmarks, 12, 10, 9)
-        ring_extended = self.is_finger_extended(landmarks, 16, 14, 13)
-        pinky_extended = self.is_finger_extended(landmarks, 20, 18, 17)
-        
-        extended_fingers = [thumb_extended, index_extended, middle_extended, ring_extended, pinky_extended]
-        num_extended = sum(extended_fingers)
-        
-        # Enhanced gesture recognition matching tutorial gestures
-        base_confidence = 0.85
-
-        # First try specific gesture detection
-        specific_gesture, specific_confidence = self.detect_specific_gestures(landmarks, extended_fingers, num_extended)
-        if specific_gesture:
-            return specific_gesture, specific_confidence
-
-        # Get hand position context for better recognition
-        wrist = landmarks[0]
-        middle_finger_mcp = landmarks[9]
-        hand_height = wrist.y
-        hand_center_x = wrist.x
-
-        # NUMBERS - Basic counting gestures
-        if num_extended == 0:
-            return 'zero', base_confidence
-        elif num_extended == 1 and index_extended and not thumb_extended:
-            return 'one', base_confidence
-        elif num_extended == 2 and index_extended and middle_extended and not thumb_extended:
-            return 'peace', base_confidence  # Peace sign (also two)
-        elif num_extended == 2 and index_extended and middle_extended:
-            return 'two', base_confidence
-        elif num_extended == 3 and index_extended and middle_extended and ring_extended and not thumb_extended:
-            return 'three', base_confidence
-        elif num_extended == 4 and not thumb_extended:
-            return 'four', base_confidence
-        elif num_extended == 5:
-            return 'five', base_confidence
-
-        # OK GESTURE - Special case (thumb and index forming circle)
-        elif num_extended == 2 and thumb_extended and index_extended:
-            distance = self.calculate_distance(thumb_tip, index_tip)
-            if distance < 0.08:  # Close together = OK sign
-                return 'ok', base_confidence
-
-        # EMOTIONS - Specific patterns
-        elif num_extended == 1 and thumb_extended and not index_extended:
-            # Check thumb direction for thumbs up vs down
-            if thumb_tip.y < landmarks[3].y:  # Thumb pointing up
-                return 'thumbs_up', base_confidence  # "good"
-            else:
-                return 'thumbs_down', base_confidence  # "bad"
-
-        elif num_extended == 2 and index_extended and pinky_extended and not thumb_extended:
-            return 'love_sign', base_confidence  # "love"
-
-        elif num_extended == 5 and thumb_extended:
-            # Analyze hand position for different 5-finger gestures
-            if hand_height < 0.3:  # High position
-                return 'happy_palm', base_confidence  # "happy"
-            elif hand_center_x < 0.3:  # Left side
-                return 'help_wave', base_confidence  # "help"
-            elif hand_center_x > 0.7:  # Right side
-                return 'bye_wave', base_confidence  # "bye"
-            else:
-                return 'hello_wave', base_confidence  # "hello"
-
-        elif num_extended == 0:
-            # Closed fist - could be sad or other emotions based on context
-            if hand_height > 0.7:  # Lower position
-                return 'sad_fist', base_confidence  # "sad"
-            else:
-                return 'cold_shiver', base_confidence  # "cold"
-
-        # BASIC NEEDS - Specific hand positions
-        elif num_extended == 5 and not thumb_extended:
-            # Open palm without thumb
-            if hand_center_x > 0.6:  # Right side
-                return 'stop_palm', base_confidence  # "stop"
-            else:
-                return 'help_wave', base_confidence  # "help"
-
-        elif num_extended == 3 and thumb_extended and index_extended and middle_extended:
-            # Three fingers including thumb - could be drink or other
-            if hand_height < 0.4:  # Higher position
-                return 'drink_cup', base_confidence  # "drink"
-            else:
-                return 'grateful_bow', base_confidence  # "grateful"
-
-        elif num_extended == 1 and index_extended:
-            # Single index finger - context dependent
-            if hand_height < 0.3:  # High position
-                return 'worried_forehead', base_confidence  # "worried"
-            elif hand_center_x > 0.6:  # Pointing right
-                return 'you_point', base_confidence  # "you"
-            else:
-                return 'bathroom_urgent', base_confidence  # "bathroom"
-
-        # PHONE GESTURE - Thumb and pinky
-        elif num_extended == 2 and thumb_extended and pinky_extended:
-            return 'call_phone', base_confidence  # "call"
-
-        # SPECIAL GESTURES - Context-based recognition
-        elif num_extended == 4 and thumb_extended:
-            # Four fingers plus thumb in specific positions
-            if hand_height > 0.6:  # Lower position
-                return 'hot_fan', base_confidence  # "hot"
-            else:
-                return 'sleep_head', base_confidence  # "sleep"
 
-        return None, 0.0
+        if self.metrics is None:
+            return self._classify_hand(landmarks)
+        start = time.perf_counter()
+        gesture = self._classify_hand(landmarks)
+        self.metrics.observe('recognize_gesture', time.perf_counter() - start)
+        return gesture
+
+    def _classify_hand(self, landmarks):
+        if self.classifier is not None:
+            # The classifier needs no finger states
+            return self.classifier.classify(as_landmark_array(landmarks))[0]
+        # One hand: the scalar key lookup beats building HandFeatures arrays
+        return self.rule_table.classify_hand(self._hand_state(landmarks))
+
+    @staticmethod
+    def _hand_state(landmarks):
+        """HandState of a single hand, or of the first hand of a batch"""
+        points = as_landmark_array(landmarks)
+        return hand_state(points[0] if points.ndim == 3 else points)
+
+    def classify_features(self, features):
+        """Look up (gesture, confidence) for every hand in a HandFeatures batch"""
+        if self.classifier is not None:
+            return self.classifier.classify(features.points)
+        return self.rule_table.classify(features)
 
     def analyze_hand_orientation(self, landmarks):
         """Analyze hand orientation and movement for better gesture recognition"""
-        if not landmarks or len(landmarks) < 21:
+        if landmarks is None or len(landmarks) < 21:
             return {}
 
-        wrist = landmarks[0]
-        middle_finger_tip = landmarks[12]
-        thumb_tip = landmarks[4]
-        index_tip = landmarks[8]
+        points = as_landmark_array(landmarks)
+        wrist = points[0].astype(np.float64)
+        middle_finger_tip = points[12].astype(np.float64)
 
-        # Calculate hand orientation
-        hand_vector_x = middle_finger_tip.x - wrist.x
-        hand_vector_y = middle_finger_tip.y - wrist.y
-
-        # Determine if hand is tilted
-        is_tilted = abs(hand_vector_x) > 0.1
+        # Tip positions keep the caller's point type (MediaPipe landmarks, dicts); arrays give rows
+        tips = points if isinstance(landmarks, np.ndarray) else landmarks
 
-        # Determine if fingers are pointing up or down
-        fingers_up = middle_finger_tip.y < wrist.y
-
-        # Calculate hand center position
-        hand_center_x = wrist.x
-        hand_center_y = wrist.y
+        # Calculate hand orientation
+        hand_vector_x = middle_finger_tip[0] - wrist[0]
 
         return {
-            'tilted': is_tilted,
-            'fingers_up': fingers_up,
-            'center_x': hand_center_x,
-            'center_y': hand_center_y,
-            'thumb_position': thumb_tip,
-            'index_position': index_tip
+            # Determine if hand is tilted
+            'tilted': bool(abs(hand_vector_x) > 0.1),
+            # Determine if fingers are pointing up or down
+            'fingers_up': bool(middle_finger_tip[1] < wrist[1]),
+            # Calculate hand center position
+            'center_x': float(wrist[0]),
+            'center_y': float(wrist[1]),
+            'thumb_position': tips[4],
+            'index_position': tips[8]
         }
 
     def detect_specific_gestures(self, landmarks, extended_fingers, num_extended):
         """Detect specific gestures that require special analysis"""
-        if not landmarks:
+        if landmarks is None or len(landmarks) == 0:
             return None, 0.0
 
-        thumb_extended, index_extended, middle_extended, ring_extended, pinky_extended = extended_fingers
-        orientation = self.analyze_hand_orientation(landmarks)
-
-        # PRAYER/BOW GESTURE - Hands together (simplified to specific finger pattern)
-        if num_extended == 5 and orientation['center_x'] > 0.4 and orientation['center_x'] < 0.6:
-            if not orientation['tilted']:
-                return 'please_pray', 0.8  # "please"
-
-        # TIRED GESTURE - Rubbing eyes (hand near face area)
-        if num_extended == 3 and thumb_extended and index_extended and middle_extended:
-            if orientation['center_y'] < 0.4:  # Higher on screen (near face)
-                return 'tired_rub', 0.8  # "tired"
-
-        # EAT GESTURE - Hand to mouth
-        if num_extended == 3 and not thumb_extended:
-            if orientation['center_y'] < 0.4 and orientation['center_x'] > 0.4:
-                return 'eat_mouth', 0.8  # "eat"
-
-        # POINTING GESTURES - More precise pointing detection
-        if num_extended == 1 and index_extended:
-            if orientation['center_x'] < 0.3:  # Pointing left (to self)
-                return 'me_point', 0.8  # "me"
-            elif orientation['center_x'] > 0.7:  # Pointing right (to others)
-                return 'you_point', 0.8  # "you"
-
-        # YES/NO GESTURES - Based on thumb direction and movement
-        if num_extended == 1 and thumb_extended:
-            thumb_tip = landmarks[4]
-            thumb_base = landmarks[2]
-            if thumb_tip.y < thumb_base.y:  # Thumb up
-                return 'yes_nod', 0.8  # "yes"
-
-        if num_extended == 1 and index_extended:
-            if orientation['tilted']:  # Wagging motion
-                return 'no_shake', 0.8  # "no"
-
-        return None, 0.0
+        finger_mask = sum(int(bool(extended)) << bit for bit, extended in enumerate(extended_fingers))
+        rule_index = self.rule_table.lookup_hand(self._hand_state(landmarks), finger_mask)
+        if not self.rule_table.is_specific[rule_index]:
+            return None, 0.0
+        return self.rule_table.gestures[rule_index], self.rule_table.confidences[rule_index]
     
-    def process_frame(self, frame):
-        """Process a single frame and return gesture recognition results"""
+    def detect_landmarks(self, frame, rgb=False):
+        """Run MediaPipe on a BGR (or, with `rgb`, RGB) frame and return the first hand as a (21, 3) array, or None"""
         # Ensure frame is valid
         if frame is None or frame.size == 0:
-            return {'gesture': None, 'confidence': 0.0, 'word': None, 'landmarks': []}
-
+            return None
+
+        if self.roi is None:
+            return self._detect_hand(frame, rgb)
+
+        cropped = False
+        if self.roi.tracking and self.roi.frame_shape != frame.shape[:2]:
+            # The client changed its capture size; the box is in old pixels
+            self.roi.reset()
+            self.hands.reset()
+        if self.roi.tracking:
+            points = self._detect_hand(self.roi.crop(frame), rgb)
+            if points is not None:
+                points = self.roi.to_frame(points, frame.shape)
+                cropped = True
+            else:
+                # Tracking lost: search the whole frame again
+                self.hands.reset()
+                points = self._detect_hand(frame, rgb)
+        else:
+            points = self._detect_hand(frame, rgb)
+
+        # MediaPipe tracks in the coordinates of its input image, so its state
+        # is dropped whenever that switches between the frame and a crop
+        self.roi.update(points, frame.shape)
+        if self.roi.tracking != cropped:
+            self.hands.reset()
+        return points
+
+    def _run_hands(self, frame, rgb=False):
         # Convert BGR to RGB for MediaPipe
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        rgb_frame = frame if rgb else cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
 
         # Process with MediaPipe
+        start = time.perf_counter()
         results = self.hands.process(rgb_frame)
+        if self.metrics is not None:
+            self.metrics.observe('hands_process', time.perf_counter() - start)
+        return results
 
-        gesture = None
-        confidence = 0.0
-        word = None
-        landmarks_data = []
+    def _detect_hand(self, frame, rgb=False):
+        results = self._run_hands(frame, rgb)
 
         # Check if hands were detected
-        if results.multi_hand_landmarks:
-            for hand_landmarks in results.multi_hand_landmarks:
-                # Convert landmarks to list for JSON serialization
-                landmarks_list = []
-                for landmark in hand_landmarks.landmark:
-                    landmarks_list.append({
-                        'x': landmark.x,
-                        'y': landmark.y,
-                        'z': landmark.z
-                    })
-                landmarks_data.append(landmarks_list)
-
-                # Recognize gesture
-                gesture, confidence = self.recognize_gesture(hand_landmarks.landmark)
-                if gesture and gesture in self.gesture_mappings:
-                    word = self.gesture_mappings[gesture]
-                break  # Process only the first hand for now
+        if not results.multi_hand_landmarks:
+            return None
+
+        # Process only the first hand for now, converted once to a compact array
+        return as_landmark_array(results.multi_hand_landmarks[0].landmark)
+
+    def detect_hands(self, frame, rgb=False):
+        """Run MediaPipe and return every hand as an (N, 21, 3) array plus [(handedness, score)]
+
+        Hands are ordered by wrist position from left to right in the
+        image; without a hand the result is (None, []). MediaPipe labels
+        handedness as seen in a mirrored, selfie-view image.
+        """
+        if frame is None or frame.size == 0:
+            return None, []
+
+        results = self._run_hands(frame, rgb)
+        if not results.multi_hand_landmarks:
+            return None, []
+
+        points = np.stack([as_landmark_array(hand.landmark) for hand in results.multi_hand_landmarks])
+        handedness = [(hand.classification[0].label, hand.classification[0].score)
+                      for hand in results.multi_handedness]
+        order = np.argsort(points[:, 0, 0], kind='stable')
+        return points[order], [handedness[i] for i in order.tolist()]
+
+    def classify_hands(self, points):
+        """Classify all hands of one frame in one vectorized pass
+
+        Returns the (gesture, confidence) of every hand and of the two-hand
+        rules applied to the first two hands, (None, 0.0) when none matches.
+        """
+        start = time.perf_counter()
+        two_hand = (None, 0.0)
+        if len(points) == 1:
+            per_hand = [self._classify_hand(points[0])]
+        else:
+            features = HandFeatures(points)
+            per_hand = self.classify_features(features)
+            two_hand = classify_pairs(hand_pairs(features, [0], [1]))[0]
+        if self.metrics is not None:
+            self.metrics.observe('recognize_gesture', time.perf_counter() - start)
+        return per_hand, two_hand
+
+    def build_result(self, points, gesture, confidence):
+        """Assemble the gesture result dict sent back to the client"""
+        word = None
+        landmarks_data = []
+        if points is not None:
+            # Convert landmarks to a list for JSON serialization
+            landmarks_data.append(landmarks_to_dicts(points))
+            if gesture and gesture in self.gesture_mappings:
+                word = self.gesture_mappings[gesture]
 
         return {
             'gesture': gesture,
@@ -335,3 +330,55 @@ class GestureRecognizer:
             'word': word,
             'landmarks': landmarks_data
         }
+
+    def build_hands_result(self, points, handedness, per_hand, two_hand):
+        """Assemble a multi-hand result: the frame's gesture plus one entry per hand
+
+        A two-hand gesture wins over the first hand's own gesture.
+        """
+        if points is None:
+            result = self.build_result(None, None, 0.0)
+            result['hands'] = []
+            result['two_hand'] = False
+            return result
+
+        gesture, confidence = two_hand if two_hand[0] else per_hand[0]
+        return {
+            'gesture': gesture,
+            'confidence': confidence,
+            'word': self.gesture_mappings.get(gesture) if gesture else None,
+            'landmarks': [landmarks_to_dicts(hand) for hand in points],
+            'hands': [
+                {
+                    'handedness': label,
+                    'score': score,
+                    'gesture': hand_gesture,
+                    'confidence': hand_confidence,
+                    'word': self.gesture_mappings.get(hand_gesture) if hand_gesture else None
+                }
+                for (label, score), (hand_gesture, hand_confidence) in zip(handedness, per_hand)
+            ],
+            'two_hand': bool(two_hand[0])
+        }
+
+    def process_landmarks(self, landmarks):
+        """Classify landmarks computed by the client, skipping decode and MediaPipe"""
+        points = validate_landmarks(landmarks)
+        gesture, confidence = self.recognize_gesture(points)
+        return self.build_result(points, gesture, confidence)
+
+    def process_frame(self, frame, rgb=False):
+        """Process a single frame and return gesture recognition results"""
+        if self.max_hands > 1:
+            points, handedness = self.detect_hands(frame, rgb)
+            if points is None:
+                return self.build_hands_result(None, [], [], (None, 0.0))
+            return self.build_hands_result(points, handedness, *self.classify_hands(points))
+
+        points = self.detect_landmarks(frame, rgb)
+        if points is None:
+            return self.build_result(None, None, 0.0)
+
+        # Recognize gesture
+        gesture, confidence = self.recognize_gesture(points)
+        return self.build_result(points, gesture, confidence)
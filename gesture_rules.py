@@ -0,0 +1,308 @@
+from bisect import bisect_left
+from collections import namedtuple
+
+import numpy as np
+
+# Every position threshold used by a rule below. The compiler splits the
+# wrist position into bins at exactly these values, so a rule comparing
+# against any other constant must add it here.
+HEIGHT_THRESHOLDS = (0.3, 0.4, 0.6, 0.7)
+CENTER_X_THRESHOLDS = (0.3, 0.4, 0.6, 0.7)
+# Thumb-index tip distance below which thumb and index form a circle
+OK_DISTANCE = 0.08
+
+SPECIFIC = 'specific'
+BASE = 'base'
+TWO_HAND = 'two_hand'
+
+BASE_CONFIDENCE = 0.85
+SPECIFIC_CONFIDENCE = 0.8
+TWO_HAND_CONFIDENCE = 0.9
+# Largest wrist-to-wrist distance at which two hands count as held together
+TOGETHER_DISTANCE = 0.2
+
+# Hand state a rule sees: finger flags plus representative wrist position
+HandCell = namedtuple('HandCell', [
+    'thumb', 'index', 'middle', 'ring', 'pinky', 'num_extended',
+    'hand_height', 'center_x', 'tilted', 'thumb_up', 'thumb_above_base', 'ok_close'
+])
+
+# A rule with gesture None ends classification without a result, like an
+# elif branch whose inner checks all fail
+GestureRule = namedtuple('GestureRule', ['label', 'gesture', 'confidence', 'stage', 'condition'])
+
+
+def _specific(gesture, label, condition):
+    return GestureRule(label, gesture, SPECIFIC_CONFIDENCE, SPECIFIC, condition)
+
+
+def _base(gesture, label, condition):
+    confidence = BASE_CONFIDENCE if gesture else 0.0
+    return GestureRule(label, gesture, confidence, BASE, condition)
+
+
+# Ordered rules, first match wins. The specific stage only ever matches
+# with a gesture; the base stage is one if/elif chain.
+GESTURE_RULES = (
+    # PRAYER/BOW GESTURE - Hands together (simplified to specific finger pattern)
+    _specific('please_pray', 'open hand centred and upright',
+              lambda h: h.num_extended == 5 and 0.4 < h.center_x < 0.6 and not h.tilted),
+    # TIRED GESTURE - Rubbing eyes (hand near face area)
+    _specific('tired_rub', 'thumb, index and middle near the face',
+              lambda h: h.num_extended == 3 and h.thumb and h.index and h.middle and h.hand_height < 0.4),
+    # EAT GESTURE - Hand to mouth
+    _specific('eat_mouth', 'three fingers without thumb near the mouth',
+              lambda h: h.num_extended == 3 and not h.thumb and h.hand_height < 0.4 and h.center_x > 0.4),
+    # POINTING GESTURES - More precise pointing detection
+    _specific('me_point', 'index pointing, hand on the left',
+              lambda h: h.num_extended == 1 and h.index and h.center_x < 0.3),
+    _specific('you_point', 'index pointing, hand on the right',
+              lambda h: h.num_extended == 1 and h.index and h.center_x > 0.7),
+    # YES/NO GESTURES - Based on thumb direction and movement
+    _specific('yes_nod', 'thumb alone, above its base',
+              lambda h: h.num_extended == 1 and h.thumb and h.thumb_above_base),
+    _specific('no_shake', 'index pointing, hand tilted',
+              lambda h: h.num_extended == 1 and h.index and h.tilted),
+
+    # NUMBERS - Basic counting gestures
+    _base('zero', 'closed fist', lambda h: h.num_extended == 0),
+    _base('one', 'index only', lambda h: h.num_extended == 1 and h.index and not h.thumb),
+    _base('peace', 'index and middle without thumb',
+          lambda h: h.num_extended == 2 and h.index and h.middle and not h.thumb),
+    _base('two', 'index and middle', lambda h: h.num_extended == 2 and h.index and h.middle),
+    _base('three', 'index, middle and ring without thumb',
+          lambda h: h.num_extended == 3 and h.index and h.middle and h.ring and not h.thumb),
+    _base('four', 'four fingers without thumb', lambda h: h.num_extended == 4 and not h.thumb),
+    _base('five', 'open hand', lambda h: h.num_extended == 5),
+
+    # OK GESTURE - Special case (thumb and index forming circle)
+    _base('ok', 'thumb and index touching',
+          lambda h: h.num_extended == 2 and h.thumb and h.index and h.ok_close),
+    _base(None, 'thumb and index apart', lambda h: h.num_extended == 2 and h.thumb and h.index),
+
+    # EMOTIONS - Specific patterns
+    _base('thumbs_up', 'thumb alone pointing up',
+          lambda h: h.num_extended == 1 and h.thumb and not h.index and h.thumb_up),
+    _base('thumbs_down', 'thumb alone pointing down',
+          lambda h: h.num_extended == 1 and h.thumb and not h.index),
+    _base('love_sign', 'index and pinky without thumb',
+          lambda h: h.num_extended == 2 and h.index and h.pinky and not h.thumb),
+    _base('happy_palm', 'open hand raised high',
+          lambda h: h.num_extended == 5 and h.thumb and h.hand_height < 0.3),
+    _base('help_wave', 'open hand on the left',
+          lambda h: h.num_extended == 5 and h.thumb and h.center_x < 0.3),
+    _base('bye_wave', 'open hand on the right',
+          lambda h: h.num_extended == 5 and h.thumb and h.center_x > 0.7),
+    _base('hello_wave', 'open hand', lambda h: h.num_extended == 5 and h.thumb),
+    _base('sad_fist', 'closed fist held low', lambda h: h.num_extended == 0 and h.hand_height > 0.7),
+    _base('cold_shiver', 'closed fist', lambda h: h.num_extended == 0),
+
+    # BASIC NEEDS - Specific hand positions
+    _base('stop_palm', 'open hand without thumb on the right',
+          lambda h: h.num_extended == 5 and not h.thumb and h.center_x > 0.6),
+    _base('help_wave', 'open hand without thumb', lambda h: h.num_extended == 5 and not h.thumb),
+    _base('drink_cup', 'thumb, index and middle raised',
+          lambda h: h.num_extended == 3 and h.thumb and h.index and h.middle and h.hand_height < 0.4),
+    _base('grateful_bow', 'thumb, index and middle',
+          lambda h: h.num_extended == 3 and h.thumb and h.index and h.middle),
+    _base('worried_forehead', 'index pointing, hand raised',
+          lambda h: h.num_extended == 1 and h.index and h.hand_height < 0.3),
+    _base('you_point', 'index pointing right',
+          lambda h: h.num_extended == 1 and h.index and h.center_x > 0.6),
+    _base('bathroom_urgent', 'index pointing', lambda h: h.num_extended == 1 and h.index),
+
+    # PHONE GESTURE - Thumb and pinky
+    _base('call_phone', 'thumb and pinky', lambda h: h.num_extended == 2 and h.thumb and h.pinky),
+
+    # SPECIAL GESTURES - Context-based recognition
+    _base('hot_fan', 'four fingers and thumb held low',
+          lambda h: h.num_extended == 4 and h.thumb and h.hand_height > 0.6),
+    _base('sleep_head', 'four fingers and thumb', lambda h: h.num_extended == 4 and h.thumb)
+)
+
+
+# State of the first two hands of a frame, one row per frame; every field
+# has shape (frames, 2) except `distance`, the wrist-to-wrist distance
+HandPair = namedtuple('HandPair', ['num_extended', 'fingers_up', 'tilted', 'center', 'distance'])
+
+# Two-hand rules run before the per-hand rules and see both hands at once.
+# Conditions are vectorized over a HandPair and return one flag per frame.
+TWO_HAND_RULES = (
+    # PRAYER GESTURE - Open hands pressed together, fingers up
+    GestureRule('open hands together, fingers up', 'please_pray', TWO_HAND_CONFIDENCE, TWO_HAND,
+                lambda p: ((p.num_extended >= 4) & p.fingers_up).all(axis=1) & (p.distance < TOGETHER_DISTANCE)),
+    # COLD GESTURE - Both fists held together in front of the body
+    GestureRule('two fists together', 'cold_shiver', TWO_HAND_CONFIDENCE, TWO_HAND,
+                lambda p: (p.num_extended == 0).all(axis=1) & (p.distance < TOGETHER_DISTANCE))
+)
+
+
+def hand_pairs(features, first, second):
+    """HandPair for the hands at indices `first` and `second` of a HandFeatures batch"""
+    index = np.stack([first, second], axis=1)
+    center = features.center[index]
+    return HandPair(
+        num_extended=features.num_extended[index],
+        fingers_up=features.fingers_up[index],
+        tilted=features.tilted[index],
+        center=center,
+        distance=np.sqrt(((center[:, 0] - center[:, 1]) ** 2).sum(axis=-1))
+    )
+
+
+def classify_pairs(pairs, rules=TWO_HAND_RULES):
+    """Return (gesture, confidence) per frame for a HandPair, (None, 0.0) without a match"""
+    winner = np.full(len(pairs.distance), len(rules))
+    for index in range(len(rules) - 1, -1, -1):
+        winner[rules[index].condition(pairs)] = index
+    gestures = [rule.gesture for rule in rules] + [None]
+    confidences = [rule.confidence for rule in rules] + [0.0]
+    return [(gestures[index], confidences[index]) for index in winner.tolist()]
+
+
+def _bin_representatives(thresholds):
+    """One value per bin: below, at and between each threshold, and above the last"""
+    values = [thresholds[0] - 0.5]
+    for i, threshold in enumerate(thresholds):
+        values.append(threshold)
+        upper = thresholds[i + 1] if i + 1 < len(thresholds) else threshold + 1.0
+        values.append((threshold + upper) / 2.0)
+    return values
+
+
+def _position_bins(values, thresholds):
+    """Map positions to bins, with separate bins for values exactly on a threshold"""
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+    below = np.searchsorted(thresholds, values, side='left')
+    on_threshold = thresholds[np.minimum(below, len(thresholds) - 1)] == values
+    return 2 * below + on_threshold
+
+
+def _position_bin(value, thresholds):
+    """Scalar _position_bins for one position"""
+    if value != value:
+        # NaN sorts after every threshold, as in np.searchsorted
+        return 2 * len(thresholds)
+    below = bisect_left(thresholds, value)
+    return 2 * below + (below < len(thresholds) and thresholds[below] == value)
+
+
+class GestureRuleTable:
+    """Gesture rules compiled into a lookup table over every distinct hand state
+
+    The key is the 5-bit finger mask, the wrist height and x bins, and the
+    tilt, thumb direction and OK-circle flags. The table holds the winning
+    rule for each key, so classification costs one index per hand.
+    """
+
+    def __init__(self, rules=GESTURE_RULES, gesture_mappings=None):
+        self.rules = tuple(rules)
+        if gesture_mappings is not None:
+            unknown = sorted({rule.gesture for rule in self.rules if rule.gesture} - set(gesture_mappings))
+            if unknown:
+                raise ValueError(f'Rules reference unmapped gestures: {unknown}')
+
+        height_values = _bin_representatives(HEIGHT_THRESHOLDS)
+        center_values = _bin_representatives(CENTER_X_THRESHOLDS)
+        self._height_bins = len(height_values)
+        self._center_bins = len(center_values)
+
+        table = []
+        for mask in range(32):
+            fingers = [bool(mask >> bit & 1) for bit in range(5)]
+            for hand_height in height_values:
+                for center_x in center_values:
+                    for flags in range(16):
+                        cell = HandCell(*fingers, sum(fingers), hand_height, center_x,
+                                        bool(flags & 8), bool(flags & 4), bool(flags & 2), bool(flags & 1))
+                        table.append(self._first_match(cell))
+
+        self.table = np.array(table, dtype=np.int16)
+        # The same table as a list, indexed without NumPy scalar overhead for single hands
+        self._winners = table
+        self.gestures = [rule.gesture for rule in self.rules] + [None]
+        self.confidences = [rule.confidence for rule in self.rules] + [0.0]
+        self.is_specific = np.array([rule.stage == SPECIFIC for rule in self.rules] + [False])
+
+        reachable = set(np.unique(self.table).tolist())
+        self.unreachable_rules = [rule for index, rule in enumerate(self.rules) if index not in reachable]
+        produced = {self.gestures[index] for index in reachable}
+        self.unproducible_gestures = sorted(set(gesture_mappings or ()) - produced)
+
+    def _first_match(self, cell):
+        for index, rule in enumerate(self.rules):
+            if rule.condition(cell):
+                return index
+        return len(self.rules)
+
+    def keys(self, features, finger_mask=None):
+        """Table keys for every hand in a HandFeatures batch"""
+        if finger_mask is None:
+            finger_mask = features.finger_mask()
+        height_bin = _position_bins(features.center[:, 1], HEIGHT_THRESHOLDS)
+        center_bin = _position_bins(features.center[:, 0], CENTER_X_THRESHOLDS)
+        flags = (features.tilted.astype(np.int64) << 3
+                 | features.thumb_up.astype(np.int64) << 2
+                 | features.thumb_above_base.astype(np.int64) << 1
+                 | (features.tip_distance(0, 1) < OK_DISTANCE).astype(np.int64))
+        return ((finger_mask * self._height_bins + height_bin) * self._center_bins + center_bin) * 16 + flags
+
+    def lookup(self, features, finger_mask=None):
+        """Winning rule index for every hand; len(rules) means no gesture"""
+        return self.table[self.keys(features, finger_mask)]
+
+    def classify(self, features, finger_mask=None):
+        """Return a (gesture, confidence) pair for every hand in the batch"""
+        return [(self.gestures[index], self.confidences[index])
+                for index in self.lookup(features, finger_mask).tolist()]
+
+    def hand_key(self, state, finger_mask=None):
+        """Table key of one hand's HandState, the scalar counterpart of keys()"""
+        if finger_mask is None:
+            finger_mask = state.finger_mask
+        height_bin = _position_bin(state.center_y, HEIGHT_THRESHOLDS)
+        center_bin = _position_bin(state.center_x, CENTER_X_THRESHOLDS)
+        flags = (state.tilted << 3 | state.thumb_up << 2 | state.thumb_above_base << 1
+                 | (state.thumb_index_distance < OK_DISTANCE))
+        return ((finger_mask * self._height_bins + height_bin) * self._center_bins + center_bin) * 16 + flags
+
+    def lookup_hand(self, state, finger_mask=None):
+        """Winning rule index for one hand's HandState"""
+        return self._winners[self.hand_key(state, finger_mask)]
+
+    def classify_hand(self, state):
+        """Return (gesture, confidence) for one hand's HandState"""
+        index = self._winners[self.hand_key(state)]
+        return self.gestures[index], self.confidences[index]
+
+    def report(self):
+        """Human-readable list of rules that can never fire"""
+        lines = []
+        for rule in self.unreachable_rules:
+            lines.append(f"unreachable {rule.stage} rule: {rule.gesture or 'no gesture'} ({rule.label})")
+        for gesture in self.unproducible_gestures:
+            lines.append(f"gesture never produced: {gesture}")
+        return lines
+
+
+_compiled_tables = {}
+
+
+def compiled_rule_table(gesture_mappings=None):
+    """Compile GESTURE_RULES once per process and share the table"""
+    key = tuple(sorted(gesture_mappings.items())) if gesture_mappings else None
+    table = _compiled_tables.get(key)
+    if table is None:
+        table = _compiled_tables[key] = GestureRuleTable(GESTURE_RULES, gesture_mappings)
+    return table
+
+
+if __name__ == "__main__":
+    from gesture_recognition import GESTURE_MAPPINGS
+
+    rule_table = compiled_rule_table(GESTURE_MAPPINGS)
+    print(f"{len(rule_table.rules)} rules compiled into {len(rule_table.table)} table entries")
+    for line in rule_table.report():
+        print(line)
+    for rule in TWO_HAND_RULES:
+        print(f"two-hand rule: {rule.gesture} ({rule.label})")
@@ -0,0 +1,95 @@
+import threading
+import time
+from collections import deque
+
+
+class _History:
+    __slots__ = ('votes', 'stable', 'stable_result', 'last_emit')
+
+    def __init__(self, window):
+        # Ring buffer of the last `window` (gesture, confidence) predictions
+        self.votes = deque(maxlen=window)
+        self.stable = None
+        self.stable_result = None
+        self.last_emit = float('-inf')
+
+
+class GestureStabilizer:
+    """Per-session vote over recent predictions that only reports changes
+
+    The stable gesture switches once a new gesture holds at least
+    `min_votes` of the last `window` predictions, so single-frame
+    misclassifications never reach the client. While the stable gesture
+    holds, the last result is repeated every `keepalive` seconds so the
+    landmark overlay and a reconnecting client stay current.
+    """
+
+    def __init__(self, window=5, min_votes=3, keepalive=1.0):
+        if not 1 <= min_votes <= window:
+            raise ValueError('min_votes must be between 1 and window')
+        self.window = window
+        self.min_votes = min_votes
+        self.keepalive = keepalive
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self.stats = {
+            'results': 0,
+            'changes': 0,
+            'keepalives': 0,
+            'suppressed': 0
+        }
+
+    def update(self, sid, result, now=None):
+        """Record one recognition result; return the result to emit, or None"""
+        if now is None:
+            now = time.monotonic()
+        gesture = result['gesture']
+
+        with self._lock:
+            self.stats['results'] += 1
+            history = self._sessions.get(sid)
+            if history is None:
+                history = self._sessions[sid] = _History(self.window)
+            history.votes.append((gesture, result['confidence']))
+
+            if gesture == history.stable:
+                history.stable_result = result
+                kind = None
+            else:
+                votes = sum(1 for voted, _ in history.votes if voted == gesture)
+                kind = 'changes' if votes >= self.min_votes else None
+                if kind:
+                    history.stable = gesture
+                    history.stable_result = result
+
+            if kind is None and now - history.last_emit >= self.keepalive:
+                kind = 'keepalives'
+            if kind is None or history.stable_result is None:
+                self.stats['suppressed'] += 1
+                return None
+
+            self.stats[kind] += 1
+            history.last_emit = now
+            return dict(history.stable_result, confidence=self._confidence(history))
+
+    def _confidence(self, history):
+        """Mean confidence of the stable gesture's votes in the window"""
+        confidences = [confidence for voted, confidence in history.votes if voted == history.stable]
+        if not confidences:
+            return history.stable_result['confidence']
+        # Rounded so a run of identical confidences reports that value exactly
+        return round(sum(confidences) / len(confidences), 6)
+
+    def release(self, sid):
+        with self._lock:
+            self._sessions.pop(sid, None)
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats['sessions'] = len(self._sessions)
+        emitted = stats['changes'] + stats['keepalives']
+        stats['emit_ratio'] = emitted / stats['results'] if stats['results'] else 0.0
+        stats['window'] = self.window
+        stats['min_votes'] = self.min_votes
+        return stats
@@ -0,0 +1,209 @@
+import itertools
+import math
+from collections import namedtuple
+
+import numpy as np
+
+NUM_LANDMARKS = 21
+
+# MediaPipe hand landmark indices
+WRIST = 0
+THUMB_MCP = 2
+THUMB_IP = 3
+THUMB_TIP = 4
+INDEX_TIP = 8
+MIDDLE_MCP = 9
+MIDDLE_TIP = 12
+
+# Fingertips in thumb, index, middle, ring, pinky order
+FINGER_TIPS = np.array([4, 8, 12, 16, 20])
+# PIP and MCP joints of the four non-thumb fingers
+FINGER_PIPS = np.array([6, 10, 14, 18])
+FINGER_MCPS = np.array([5, 9, 13, 17])
+
+FINGER_NAMES = ('thumb', 'index', 'middle', 'ring', 'pinky')
+
+
+def as_landmark_array(landmarks):
+    """Convert hand landmarks to a float32 (21, 3) array, or (N, 21, 3) for several hands
+
+    Accepts MediaPipe landmark lists, sequences of objects with x/y/z
+    attributes, lists of {'x', 'y', 'z'} dicts and array-likes.
+    """
+    if isinstance(landmarks, np.ndarray):
+        points = landmarks.astype(np.float32, copy=False)
+    elif hasattr(landmarks, 'landmark'):
+        points = _from_objects(landmarks.landmark)
+    else:
+        landmarks = list(landmarks)
+        first = landmarks[0] if landmarks else None
+        if hasattr(first, 'landmark') or (isinstance(first, (list, tuple)) and first and not np.isscalar(first[0])):
+            points = np.stack([as_landmark_array(hand) for hand in landmarks])
+        elif hasattr(first, 'x'):
+            points = _from_objects(landmarks)
+        elif isinstance(first, dict):
+            points = np.array([[point['x'], point['y'], point.get('z', 0.0)] for point in landmarks], dtype=np.float32)
+        else:
+            points = np.asarray(landmarks, dtype=np.float32)
+
+    if points.ndim == 1 and points.size == NUM_LANDMARKS * 3:
+        points = points.reshape(NUM_LANDMARKS, 3)
+    if points.ndim not in (2, 3) or points.shape[-2:] != (NUM_LANDMARKS, 3):
+        raise ValueError(f'Expected landmarks of shape (21, 3) or (N, 21, 3), got {points.shape}')
+    return points
+
+
+# Largest coordinate accepted from clients: MediaPipe reports points a little
+# outside the frame, nothing near this many frame widths away
+MAX_CLIENT_COORDINATE = 4.0
+
+
+def validate_landmarks(landmarks):
+    """Check client-supplied landmarks and return them as a float32 (21, 3) array
+
+    Accepts 63 numbers (flat or as 21 [x, y, z] triples), or the raw bytes
+    of a little-endian float32 array of that size. Coordinates must be
+    finite and within +-MAX_CLIENT_COORDINATE.
+    """
+    if isinstance(landmarks, dict):
+        landmarks = landmarks.get('landmarks')
+    if landmarks is None:
+        raise ValueError('No landmark data received')
+
+    if isinstance(landmarks, (bytes, bytearray, memoryview)):
+        if len(landmarks) != NUM_LANDMARKS * 3 * 4:
+            raise ValueError(f'Expected {NUM_LANDMARKS * 3 * 4} bytes of float32 landmarks, got {len(landmarks)}')
+        points = np.frombuffer(landmarks, dtype='<f4').reshape(NUM_LANDMARKS, 3)
+    else:
+        try:
+            points = np.asarray(landmarks, dtype=np.float32)
+        except (TypeError, ValueError):
+            raise ValueError('Landmarks must be numbers')
+        if points.shape not in ((NUM_LANDMARKS * 3,), (NUM_LANDMARKS, 3)):
+            raise ValueError(f'Expected {NUM_LANDMARKS} landmarks with x, y, z, got shape {points.shape}')
+        points = points.reshape(NUM_LANDMARKS, 3)
+
+    if not np.isfinite(points).all():
+        raise ValueError('Landmarks must be finite')
+    if np.abs(points).max() > MAX_CLIENT_COORDINATE:
+        raise ValueError(f'Landmark coordinates must be within +-{MAX_CLIENT_COORDINATE}')
+    return points
+
+
+def landmarks_to_dicts(points):
+    """Convert a (21, 3) landmark array to the JSON list of {'x', 'y', 'z'} dicts"""
+    return [{'x': x, 'y': y, 'z': z} for x, y, z in points.tolist()]
+
+
+def _from_objects(landmarks):
+    coords = itertools.chain.from_iterable((point.x, point.y, point.z) for point in landmarks)
+    return np.fromiter(coords, dtype=np.float32).reshape(-1, 3)
+
+
+# One hand's state as the gesture rule table keys it; the scalar
+# counterpart of a single HandFeatures row
+HandState = namedtuple('HandState', [
+    'finger_mask', 'center_x', 'center_y', 'tilted', 'thumb_up', 'thumb_above_base', 'thumb_index_distance'
+])
+
+# Finger mask bit, tip, PIP and MCP of the four non-thumb fingers
+_FINGER_JOINTS = tuple(zip(range(1, 5), FINGER_TIPS[1:].tolist(), FINGER_PIPS.tolist(), FINGER_MCPS.tolist()))
+
+
+def hand_state(points):
+    """HandState of a single (21, 3) hand
+
+    Plain float math on the rows instead of HandFeatures' array
+    temporaries, which cost far more than the checks for one hand. The
+    values match HandFeatures exactly, as both compare float64 coordinates.
+    """
+    rows = as_landmark_array(points).tolist()
+    wrist_x, wrist_y = rows[WRIST][:2]
+    thumb_tip, thumb_ip = rows[THUMB_TIP], rows[THUMB_IP]
+
+    # Thumb: tip further from the wrist than the IP joint
+    finger_mask = int(math.sqrt((thumb_tip[0] - wrist_x) ** 2 + (thumb_tip[1] - wrist_y) ** 2)
+                      > math.sqrt((thumb_ip[0] - wrist_x) ** 2 + (thumb_ip[1] - wrist_y) ** 2))
+    # Other fingers: tip above PIP above MCP
+    for bit, tip, pip, mcp in _FINGER_JOINTS:
+        if rows[tip][1] < rows[pip][1] < rows[mcp][1]:
+            finger_mask |= 1 << bit
+
+    index_tip = rows[INDEX_TIP]
+    return HandState(
+        finger_mask=finger_mask,
+        center_x=wrist_x,
+        center_y=wrist_y,
+        tilted=abs(rows[MIDDLE_TIP][0] - wrist_x) > 0.1,
+        thumb_up=thumb_tip[1] < thumb_ip[1],
+        thumb_above_base=thumb_tip[1] < rows[THUMB_MCP][1],
+        thumb_index_distance=math.sqrt((thumb_tip[0] - index_tip[0]) ** 2 + (thumb_tip[1] - index_tip[1]) ** 2)
+    )
+
+
+class HandFeatures:
+    """Finger states and hand position for one hand or a batch of hands
+
+    Every attribute has a leading hand axis, also for a single (21, 3)
+    input. Coordinates are widened to float64 before comparing against
+    thresholds, so results match the scalar checks on MediaPipe's
+    landmark objects exactly. Built for batches; hand_state is much
+    cheaper for a single hand.
+    """
+
+    def __init__(self, landmarks):
+        points = as_landmark_array(landmarks)
+        if points.ndim == 2:
+            points = points[None]
+
+        xy = points[..., :2].astype(np.float64)
+        y = xy[..., 1]
+        wrist = xy[:, WRIST]
+
+        # Thumb: tip further from the wrist than the IP joint
+        thumb_tip_distance = np.sqrt(((xy[:, THUMB_TIP] - wrist) ** 2).sum(axis=-1))
+        thumb_ip_distance = np.sqrt(((xy[:, THUMB_IP] - wrist) ** 2).sum(axis=-1))
+        thumb_extended = thumb_tip_distance > thumb_ip_distance
+
+        # Other fingers: tip above PIP above MCP
+        pip_y = y[:, FINGER_PIPS]
+        fingers_extended = (y[:, FINGER_TIPS[1:]] < pip_y) & (pip_y < y[:, FINGER_MCPS])
+
+        self.extended = np.concatenate([thumb_extended[:, None], fingers_extended], axis=1)
+        self.num_extended = self.extended.sum(axis=1)
+
+        # Orientation from the wrist to the middle fingertip
+        hand_vector = xy[:, MIDDLE_TIP] - wrist
+        self.tilted = np.abs(hand_vector[:, 0]) > 0.1
+        self.fingers_up = xy[:, MIDDLE_TIP, 1] < wrist[:, 1]
+        self.center = wrist
+
+        # Thumb direction relative to its IP joint and its base
+        self.thumb_up = y[:, THUMB_TIP] < y[:, THUMB_IP]
+        self.thumb_above_base = y[:, THUMB_TIP] < y[:, THUMB_MCP]
+
+        self.points = points
+        self._xy = xy
+        self._tip_distances = None
+
+    @property
+    def tip_distances(self):
+        """Pairwise 2D distances between the five fingertips, computed on first use"""
+        if self._tip_distances is None:
+            tips = self._xy[:, FINGER_TIPS]
+            self._tip_distances = np.sqrt(((tips[:, :, None] - tips[:, None]) ** 2).sum(axis=-1))
+        return self._tip_distances
+
+    def tip_distance(self, first, second):
+        """2D distance between two fingertips (0 = thumb ... 4 = pinky) for every hand"""
+        if self._tip_distances is not None:
+            return self._tip_distances[:, first, second]
+        delta = self._xy[:, FINGER_TIPS[first]] - self._xy[:, FINGER_TIPS[second]]
+        return np.sqrt((delta ** 2).sum(axis=-1))
+
+    def __len__(self):
+        return len(self.points)
+
+    def finger_mask(self):
+        """5-bit finger mask per hand, bit 0 = thumb ... bit 4 = pinky"""
+        return self.extended.astype(np.int64) @ (1 << np.arange(5))
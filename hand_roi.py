@@ -0,0 +1,110 @@
+import cv2
+import numpy as np
+
+
+class HandRoi:
+    """Square region around the last detected hand, in frame pixels
+
+    MediaPipe only ever needs a few hundred pixels of hand, but a full
+    1080p frame still has to be colour converted, copied into the graph
+    and scaled down for every call. While a hand is tracked, only a padded
+    square around its previous landmarks is cropped and scaled to `size`
+    pixels; landmarks found there are mapped back to full-frame
+    coordinates, so the position thresholds of the gesture rules still see
+    the whole frame.
+    """
+
+    def __init__(self, size=256, padding=0.5, min_side=64):
+        self.size = size
+        # Margin on every side, as a fraction of the hand's larger extent
+        self.padding = padding
+        self.min_side = min_side
+        # (x0, y0, side) in pixels, or None while no hand is tracked
+        self.box = None
+        # (height, width) of the frame the box was placed in
+        self.frame_shape = None
+        # Scaled crops are written here instead of a new array per frame
+        self._buffer = np.empty((size, size, 3), dtype=np.uint8)
+
+    @property
+    def tracking(self):
+        return self.box is not None
+
+    def crop(self, frame):
+        """Return the ROI of a BGR frame scaled to at most `size` pixels square"""
+        x0, y0, side = self.box
+        region = frame[y0:y0 + side, x0:x0 + side]
+        if side > self.size:
+            region = cv2.resize(region, (self.size, self.size), dst=self._buffer, interpolation=cv2.INTER_LINEAR)
+        return region
+
+    def to_frame(self, points, frame_shape):
+        """Map (21, 3) landmarks normalized to the ROI back to the full frame"""
+        height, width = frame_shape[:2]
+        x0, y0, side = self.box
+        mapped = points.astype(np.float64)
+        mapped[:, 0] = (mapped[:, 0] * side + x0) / width
+        mapped[:, 1] = (mapped[:, 1] * side + y0) / height
+        # MediaPipe scales depth like x
+        mapped[:, 2] *= side / width
+        return mapped.astype(np.float32)
+
+    def update(self, points, frame_shape):
+        """Centre the next ROI on full-frame landmarks, or stop tracking on None"""
+        if points is None:
+            self.box = None
+            return
+
+        height, width = self.frame_shape = frame_shape[:2]
+        xs = points[:, 0].astype(np.float64) * width
+        ys = points[:, 1].astype(np.float64) * height
+        extent = max(xs.max() - xs.min(), ys.max() - ys.min())
+        side = int(round(max(extent * (1.0 + 2.0 * self.padding), self.min_side)))
+
+        # A region covering most of the frame saves nothing over the frame itself
+        if side >= 0.8 * min(width, height):
+            self.box = None
+            return
+
+        x0 = int(round((xs.min() + xs.max() - side) / 2.0))
+        y0 = int(round((ys.min() + ys.max() - side) / 2.0))
+        self.box = (min(max(x0, 0), width - side), min(max(y0, 0), height - side), side)
+
+    def reset(self):
+        self.box = None
+
+
+if __name__ == "__main__":
+    import time
+
+    from gesture_recognition import GestureRecognizer
+
+    # Frames without a hand, so both paths run the same palm detector and
+    # the difference is the per-pixel work of conversion and scaling
+    sizes = {'480p': (480, 640), '720p': (720, 1280), '1080p': (1080, 1920)}
+    repeats = 50
+    rng = np.random.default_rng(0)
+    full = GestureRecognizer()
+    roi = HandRoi()
+
+    print(f"{'frame':<8}{'prep full':>11}{'prep roi':>10}{'total full':>12}{'total roi':>11}")
+    for name, (height, width) in sizes.items():
+        frame = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+        roi.box = (width // 2 - 200, height // 2 - 200, 400)
+
+        timings = []
+        for crop in (False, True):
+            full.reset()
+            prep, total = [], []
+            for _ in range(repeats + 5):
+                start = time.perf_counter()
+                image = cv2.cvtColor(roi.crop(frame) if crop else frame, cv2.COLOR_BGR2RGB)
+                prepared = time.perf_counter()
+                full.hands.process(image)
+                prep.append((prepared - start) * 1000.0)
+                total.append((time.perf_counter() - start) * 1000.0)
+            # Medians after warm-up calls
+            timings.append((float(np.median(prep[5:])), float(np.median(total[5:]))))
+        (prep_full, total_full), (prep_roi, total_roi) = timings
+        print(f"{name:<8}{prep_full:>11.2f}{prep_roi:>10.2f}{total_full:>12.2f}{total_roi:>11.2f}")
+    full.close()
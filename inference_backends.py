@@ -0,0 +1,578 @@
+import atexit
+import functools
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from frame_transport import FrameDecoder
+from gesture_recognition import GestureRecognizer
+from gesture_rules import classify_pairs, hand_pairs
+from hand_landmarks import HandFeatures
+from recognizer_pool import RecognizerPool
+
+# Environment knobs read by OpenCV, OpenMP and TFLite when they load. They
+# have to be set before a worker imports those libraries, so they are
+# exported around Process.start() instead of inside the worker.
+THREAD_ENV_VARS = (
+    'OMP_NUM_THREADS',
+    'OPENBLAS_NUM_THREADS',
+    'MKL_NUM_THREADS',
+    'OPENCV_FOR_THREADS_NUM',
+    'TF_NUM_INTRAOP_THREADS',
+    'TF_NUM_INTEROP_THREADS'
+)
+
+# Session id used for frames pushed through a backend during warm-up
+WARM_UP_SID = '__warm_up__'
+
+
+def _warm_pool(pool, decoder, payload):
+    """Warm every spare the pool builds from now on with `payload`, and build them"""
+    frame = decoder.decode(WARM_UP_SID, payload)
+    decoder.release(WARM_UP_SID)
+    pool.warm = lambda gesture_recognizer: gesture_recognizer.process_frame(frame, rgb=True)
+    pool.prewarm()
+
+
+class InlineBackend:
+    """Run recognition inside the Socket.IO handler on pooled recognizers"""
+
+    name = 'inline'
+
+    def __init__(self, pool, transport_stats=None, decoder=None):
+        self.pool = pool
+        self.transport_stats = transport_stats
+        self.decoder = decoder or FrameDecoder(stats=transport_stats)
+
+    def process(self, sid, payload):
+        """Decode and recognize one frame for session `sid`"""
+        frame = self.decoder.decode(sid, payload)
+        with self.pool.session(sid) as gesture_recognizer:
+            return gesture_recognizer.process_frame(frame, rgb=True)
+
+    def warm_up(self, payload):
+        """Build spare recognizers and run one frame through each"""
+        _warm_pool(self.pool, self.decoder, payload)
+
+    def release(self, sid):
+        self.pool.release(sid)
+        self.decoder.release(sid)
+
+    def get_stats(self):
+        return {
+            'backend': self.name,
+            'recognizer_pool': self.pool.get_stats()
+        }
+
+    def close(self):
+        self.pool.close()
+
+
+class MicroBatchBackend:
+    """Gather frames from concurrent sessions into short batches
+
+    A batch closes after `window` seconds or once `max_batch` frames are
+    queued. Decoding, colour conversion and MediaPipe then run for the
+    whole batch on a small thread pool, each frame on its session's own
+    recognizer, and every detected hand is classified in one vectorized
+    rule-table lookup, with the two-hand rules applied to all multi-hand
+    frames at once. Results go back to the waiting handler, which emits
+    to its own client.
+    """
+
+    name = 'batch'
+
+    def __init__(self, pool, max_batch=8, window=0.005, threads=4, timeout=5.0,
+                 transport_stats=None, decoder=None):
+        self.pool = pool
+        self.max_batch = max_batch
+        self.window = window
+        self.threads = threads
+        self.timeout = timeout
+        self.transport_stats = transport_stats
+        self.decoder = decoder or FrameDecoder(stats=transport_stats)
+
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._executor = None
+        self._collector = None
+        # batch size -> [batches, frames, summed per-frame latency in seconds]
+        self._by_size = {}
+
+    def start(self):
+        with self._lock:
+            if self._collector is not None:
+                return
+            self._executor = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix='gesture-batch')
+            self._collector = threading.Thread(target=self._collect_batches, daemon=True)
+            self._collector.start()
+
+    def process(self, sid, payload):
+        """Queue one frame for the next batch and wait for its result"""
+        return self.submit(sid, payload).result(timeout=self.timeout)
+
+    def submit(self, sid, payload):
+        if self._collector is None:
+            self.start()
+        future = Future()
+        self._queue.put((sid, payload, future, time.perf_counter()))
+        return future
+
+    def warm_up(self, payload):
+        """Start the batch threads, build spare recognizers and run one frame through each"""
+        if self._collector is None:
+            self.start()
+        _warm_pool(self.pool, self.decoder, payload)
+
+    def release(self, sid):
+        self.pool.release(sid)
+        self.decoder.release(sid)
+
+    def get_stats(self):
+        with self._lock:
+            by_size = {size: list(values) for size, values in self._by_size.items()}
+
+        batches = sum(values[0] for values in by_size.values())
+        frames = sum(values[1] for values in by_size.values())
+        return {
+            'backend': self.name,
+            'max_batch': self.max_batch,
+            'window_ms': self.window * 1000.0,
+            'batches': batches,
+            'mean_batch_size': frames / batches if batches else 0.0,
+            'latency_by_batch_size': {
+                size: {
+                    'batches': count,
+                    'mean_latency_ms': latency * 1000.0 / total if total else 0.0
+                }
+                for size, (count, total, latency) in sorted(by_size.items())
+            },
+            'recognizer_pool': self.pool.get_stats()
+        }
+
+    def close(self):
+        """Finish the frames already queued, then stop the batch threads"""
+        if self._collector is not None:
+            self._queue.put(None)
+            self._collector.join(timeout=self.timeout)
+            self._executor.shutdown(wait=False)
+            # Frames the collector did not reach in time fail instead of hanging
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    item[2].set_exception(RuntimeError('Inference backend is closed'))
+        self.pool.close()
+
+    def _collect_batches(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            closing = False
+            deadline = time.perf_counter() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    closing = True
+                    break
+                batch.append(item)
+
+            self._run_batch(batch)
+            if closing:
+                return
+
+    def _detect(self, sid, payload):
+        """Decode and detect one frame; hands come back as (N, 21, 3) or None"""
+        frame = self.decoder.decode(sid, payload)
+        with self.pool.session(sid) as gesture_recognizer:
+            if gesture_recognizer.max_hands > 1:
+                points, handedness = gesture_recognizer.detect_hands(frame, rgb=True)
+                return gesture_recognizer, points, handedness
+            points = gesture_recognizer.detect_landmarks(frame, rgb=True)
+            return gesture_recognizer, None if points is None else points[None], None
+
+    def _run_batch(self, batch):
+        detections = [self._executor.submit(self._detect, sid, payload) for sid, payload, _, _ in batch]
+
+        detected = []
+        for (_, _, future, queued_at), detection in zip(batch, detections):
+            try:
+                gesture_recognizer, points, handedness = detection.result()
+            except Exception as e:
+                future.set_exception(e)
+                continue
+            detected.append((future, queued_at, gesture_recognizer, points, handedness))
+
+        try:
+            latency = self._finish_batch(detected)
+        except Exception as e:
+            # Fail the frames still waiting, but keep the collector running
+            latency = 0.0
+            for future, queued_at, _, _, _ in detected:
+                if not future.done():
+                    future.set_exception(e)
+                    latency += time.perf_counter() - queued_at
+
+        with self._lock:
+            totals = self._by_size.setdefault(len(batch), [0, 0, 0.0])
+            totals[0] += 1
+            totals[1] += len(detected)
+            totals[2] += latency
+
+    def _finish_batch(self, detected):
+        """Classify every detected hand and resolve the futures; returns the summed latency"""
+        # One vectorized classification pass over every hand in the batch,
+        # and one over the first two hands of every multi-hand frame
+        hands = [entry for entry in detected if entry[3] is not None]
+        per_hand = []
+        two_hand = []
+        if hands:
+            start = time.perf_counter()
+            counts = [len(entry[3]) for entry in hands]
+            offsets = np.cumsum([0] + counts[:-1])
+            features = HandFeatures(np.concatenate([entry[3] for entry in hands]))
+            classifications = hands[0][2].classify_features(features)
+            per_hand = [classifications[offset:offset + count] for offset, count in zip(offsets, counts)]
+
+            paired = [offset for offset, count in zip(offsets, counts) if count >= 2]
+            pairs = iter(classify_pairs(hand_pairs(features, paired, np.add(paired, 1))) if paired else ())
+            two_hand = [next(pairs) if count >= 2 else (None, 0.0) for count in counts]
+
+            metrics = hands[0][2].metrics
+            if metrics is not None:
+                # One observation per batch: this is the whole batch's classification
+                metrics.observe('recognize_gesture', time.perf_counter() - start)
+        classified = iter(zip(per_hand, two_hand))
+
+        latency = 0.0
+        for future, queued_at, gesture_recognizer, points, handedness in detected:
+            frame_hands, frame_pair = next(classified) if points is not None else ([], (None, 0.0))
+            if gesture_recognizer.max_hands > 1:
+                result = gesture_recognizer.build_hands_result(points, handedness, frame_hands, frame_pair)
+            elif points is None:
+                result = gesture_recognizer.build_result(None, None, 0.0)
+            else:
+                result = gesture_recognizer.build_result(points[0], *frame_hands[0])
+            future.set_result(result)
+            latency += time.perf_counter() - queued_at
+        return latency
+
+
+class ProcessPoolBackend:
+    """Spread recognition over worker processes that each own their Hands graphs
+
+    Frames are decoded in the server process and copied into a ring of
+    shared memory slots; workers read them in place, so no frame is ever
+    pickled. Sessions are pinned to one worker so MediaPipe tracking state
+    stays with the process that built it. A worker that dies is noticed
+    within `watch_interval` seconds: its pending frames fail, their slots
+    are reclaimed and a new worker takes over its sessions.
+    """
+
+    name = 'process'
+
+    def __init__(self, workers=2, slots=8, max_frame_shape=(1080, 1920, 3),
+                 threads_per_worker=1, sessions_per_worker=8, timeout=5.0,
+                 roi_size=None, max_hands=1, classifier=None, transport_stats=None, decoder=None,
+                 watch_interval=0.5, worker_main=None):
+        self.workers = workers
+        self.slots = slots
+        self.max_frame_shape = tuple(max_frame_shape)
+        self.threads_per_worker = threads_per_worker
+        self.sessions_per_worker = sessions_per_worker
+        self.timeout = timeout
+        self.roi_size = roi_size
+        self.max_hands = max_hands
+        self.classifier = classifier
+        self.transport_stats = transport_stats
+        self.decoder = decoder or FrameDecoder(stats=transport_stats)
+        self.watch_interval = watch_interval
+        # The worker loop, replaceable by another module-level function
+        # with the same arguments (spawned workers import it by name)
+        self.worker_main = worker_main or _worker_main
+
+        self._lock = threading.Lock()
+        self._started = False
+        self._closed = False
+        self._ids = itertools.count()
+        self._pending = {}  # request id -> (future, worker id, slot)
+        self._free_slots = queue.Queue()
+        self._shm = []
+        self._context = None
+        self._slot_names = []
+        self._processes = []
+        self._requests = []
+        self._results = None
+        self._collector = None
+
+        self.stats = {
+            'frames': 0,
+            'errors': 0,
+            'timeouts': 0,
+            'slot_waits': 0,
+            'worker_restarts': 0
+        }
+
+    def start(self):
+        """Allocate the shared memory ring and spawn the workers"""
+        with self._lock:
+            if self._started:
+                return
+            if self._closed:
+                raise RuntimeError('Inference backend is closed')
+
+            # Spawn rather than fork: forked copies of a threaded server and
+            # of already initialised MediaPipe graphs are not safe to use
+            self._context = multiprocessing.get_context('spawn')
+            slot_bytes = int(np.prod(self.max_frame_shape))
+            for slot in range(self.slots):
+                self._shm.append(shared_memory.SharedMemory(create=True, size=slot_bytes))
+                self._free_slots.put(slot)
+
+            self._results = self._context.Queue()
+            self._slot_names = [shm.name for shm in self._shm]
+            for worker_id in range(self.workers):
+                requests, process = self._spawn(worker_id)
+                self._requests.append(requests)
+                self._processes.append(process)
+
+            self._collector = threading.Thread(target=self._collect_results, daemon=True)
+            self._collector.start()
+            self._started = True
+            atexit.register(self.close)
+
+    def _spawn(self, worker_id):
+        """Start worker `worker_id` and return its request queue and process"""
+        requests = self._context.Queue()
+        process = self._context.Process(
+            target=self.worker_main,
+            args=(worker_id, self._slot_names, requests, self._results,
+                  self.threads_per_worker, self.sessions_per_worker, self.roi_size, self.max_hands,
+                  self.classifier),
+            name=f'gesture-inference-{worker_id}',
+            daemon=True
+        )
+        saved_env = {name: os.environ.get(name) for name in THREAD_ENV_VARS}
+        try:
+            for name in THREAD_ENV_VARS:
+                os.environ[name] = str(self.threads_per_worker)
+            process.start()
+        finally:
+            for name, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+        return requests, process
+
+    def warm_up(self, payload):
+        """Spawn the workers and run one frame on each
+
+        Worker pools keep no spares, so this pays for process start-up,
+        the MediaPipe import and the model load, not for a session's graph.
+        """
+        self.start()
+        pending = set(range(self.workers))
+        for attempt in itertools.count():
+            if not pending:
+                return
+            sid = f'{WARM_UP_SID}{attempt}'
+            worker = self._worker_for(sid)
+            if worker in pending:
+                pending.discard(worker)
+                # No timeout: a cold worker takes seconds to import MediaPipe
+                self.submit(sid, payload).result()
+                self.release(sid)
+
+    def process(self, sid, payload):
+        """Decode one frame, run it on the session's worker and wait for the result"""
+        return self.submit(sid, payload).result(timeout=self.timeout)
+
+    def submit(self, sid, payload):
+        """Queue one frame for the session's worker and return a Future"""
+        if not self._started:
+            self.start()
+
+        # Decoded to RGB, so workers hand slots to MediaPipe without converting
+        frame = self.decoder.decode(sid, payload)
+        if frame.nbytes > self._shm[0].size:
+            raise ValueError(f'Frame {frame.shape} exceeds inference slot {self.max_frame_shape}')
+
+        try:
+            slot = self._free_slots.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                self.stats['slot_waits'] += 1
+            try:
+                slot = self._free_slots.get(timeout=self.timeout)
+            except queue.Empty:
+                with self._lock:
+                    self.stats['timeouts'] += 1
+                raise TimeoutError('No free inference slot')
+
+        view = np.ndarray(frame.shape, dtype=np.uint8, buffer=self._shm[slot].buf)
+        view[...] = frame
+
+        future = Future()
+        request_id = next(self._ids)
+        worker_id = self._worker_for(sid)
+        # Under the lock, so a worker being replaced cannot strand the request in its old queue
+        with self._lock:
+            self._pending[request_id] = (future, worker_id, slot)
+            self._requests[worker_id].put(('frame', request_id, sid, slot, frame.shape))
+        return future
+
+    def release(self, sid):
+        self.decoder.release(sid)
+        if self._started:
+            with self._lock:
+                self._requests[self._worker_for(sid)].put(('release', sid))
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats['pending'] = len(self._pending)
+        stats['backend'] = self.name
+        stats['workers'] = self.workers
+        stats['alive_workers'] = sum(process.is_alive() for process in self._processes)
+        stats['free_slots'] = self._free_slots.qsize()
+        return stats
+
+    def close(self):
+        """Stop the workers and release the shared memory ring"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            started = self._started
+
+        if started:
+            for requests in self._requests:
+                requests.put(None)
+            for process in self._processes:
+                process.join(timeout=2.0)
+                if process.is_alive():
+                    process.terminate()
+            self._results.put(None)
+
+        for shm in self._shm:
+            shm.close()
+            shm.unlink()
+        self._shm = []
+
+    def _worker_for(self, sid):
+        return zlib.crc32(str(sid).encode()) % self.workers
+
+    def _collect_results(self):
+        next_check = time.monotonic() + self.watch_interval
+        while True:
+            try:
+                message = self._results.get(timeout=self.watch_interval)
+            except queue.Empty:
+                message = ()
+            if message is None:
+                return
+            if time.monotonic() >= next_check:
+                self._replace_dead_workers()
+                next_check = time.monotonic() + self.watch_interval
+            if not message:
+                continue
+
+            request_id, slot, result, error = message
+            with self._lock:
+                pending = self._pending.pop(request_id, None)
+                if pending is None:
+                    # Already failed because its worker died; the slot was reclaimed then
+                    continue
+                if error is None:
+                    self.stats['frames'] += 1
+                else:
+                    self.stats['errors'] += 1
+            self._free_slots.put(slot)
+            future = pending[0]
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(RuntimeError(error))
+
+    def _replace_dead_workers(self):
+        """Fail the frames of workers that died, reclaim their slots and respawn them"""
+        failed = []
+        with self._lock:
+            if self._closed:
+                return
+            for worker_id, process in enumerate(self._processes):
+                if process.is_alive():
+                    continue
+                lost = [request_id for request_id, (_, owner, _) in self._pending.items() if owner == worker_id]
+                failed += [(self._pending.pop(request_id), process.exitcode) for request_id in lost]
+                self.stats['worker_restarts'] += 1
+                # Nobody reads the old queue any more; do not wait for it to flush at exit
+                self._requests[worker_id].cancel_join_thread()
+                self._requests[worker_id].close()
+                # Same worker id, so the sessions pinned to it move to the new process
+                self._requests[worker_id], self._processes[worker_id] = self._spawn(worker_id)
+
+        for (future, worker_id, slot), exitcode in failed:
+            self._free_slots.put(slot)
+            future.set_exception(RuntimeError(f'Inference worker {worker_id} died (exit code {exitcode})'))
+
+
+def _worker_main(worker_id, slot_names, requests, results, threads, sessions, roi_size=None, max_hands=1,
+                 classifier=None, load_hands=True):
+    """Inference worker loop: one recognizer pool, frames read from shared memory
+
+    With load_hands=False recognizers build their MediaPipe graph on the
+    first frame instead of when the session starts.
+    """
+    import cv2
+    cv2.setNumThreads(threads)
+
+    slots = [shared_memory.SharedMemory(name=name) for name in slot_names]
+    pool = RecognizerPool(functools.partial(GestureRecognizer, load_hands=load_hands, roi_size=roi_size,
+                                            max_hands=max_hands, classifier=classifier),
+                          max_size=sessions, spares=0)
+
+    try:
+        while True:
+            message = requests.get()
+            if message is None:
+                break
+
+            if message[0] == 'release':
+                pool.release(message[1])
+                continue
+
+            _, request_id, sid, slot, shape = message
+            frame = np.ndarray(shape, dtype=np.uint8, buffer=slots[slot].buf)
+            try:
+                with pool.session(sid) as gesture_recognizer:
+                    result = gesture_recognizer.process_frame(frame, rgb=True)
+                results.put((request_id, slot, result, None))
+            except Exception as e:
+                results.put((request_id, slot, None, str(e)))
+            finally:
+                del frame
+    finally:
+        pool.close()
+        for shm in slots:
+            shm.close()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Gesture classifier learned from labelled landmarks
+
+Hands are turned into wrist-relative, scale-normalized feature vectors and
+scored against every gesture with one float32 matrix multiply. The weights
+come from nearest-centroid or softmax-regression training on labelled
+landmark files:
+
+    <gesture>.npy      (N, 21, 3) hands of one gesture; none.npy for no gesture
+    *.npz              'points' (N, 21, 3) and 'labels' (N,), '' for no gesture
+    <directory>/       a SessionRecorder recording, labelled by its results
+
+    python landmark_classifier.py train data/*.npy -o gestures.npz
+    python landmark_classifier.py train recordings/* --method linear -o gestures.npz
+    python landmark_classifier.py evaluate gestures.npz data/*.npy
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+from hand_landmarks import MIDDLE_MCP, NUM_LANDMARKS, WRIST, as_landmark_array
+
+METHODS = ('centroid', 'linear')
+
+# Label used in files for hands that show no gesture
+NO_GESTURE = 'none'
+
+# Wrist-relative coordinates of landmarks 1-20 plus the wrist's own x and y,
+# which the gestures that depend on where the hand is held need
+NUM_FEATURES = (NUM_LANDMARKS - 1) * 3 + 2
+
+
+def landmark_features(landmarks):
+    """Float32 (N, NUM_FEATURES) feature vectors for (21, 3) or (N, 21, 3) landmarks
+
+    Points are taken relative to the wrist and divided by the wrist to
+    middle-knuckle distance, so hand size and distance from the camera
+    drop out.
+    """
+    points = as_landmark_array(landmarks)
+    if points.ndim == 2:
+        points = points[None]
+
+    relative = points[:, 1:] - points[:, WRIST, None]
+    scale = np.sqrt((relative[:, MIDDLE_MCP - 1, :2] ** 2).sum(axis=-1))
+    scale = np.where(scale > 1e-6, scale, 1.0).astype(np.float32)
+
+    features = np.empty((len(points), NUM_FEATURES), dtype=np.float32)
+    features[:, :-2] = (relative / scale[:, None, None]).reshape(len(points), -1)
+    features[:, -2:] = points[:, WRIST, :2]
+    return features
+
+
+class LandmarkClassifier:
+    """Linear scores for every gesture: features @ weights.T + bias
+
+    Nearest-centroid models are stored the same way: with centroid c, the
+    score x.c - |c|^2 / 2 ranks gestures exactly like -|x - c|^2 / 2
+    (on features divided by their within-gesture spread).
+    Confidences are the softmax of the scores. A label of None stands for
+    "no gesture", and hands whose best confidence is below
+    `min_confidence` also get None.
+    """
+
+    def __init__(self, labels, weights, bias, method='centroid', min_confidence=0.0):
+        self.labels = [label or None for label in labels]
+        self.weights = np.ascontiguousarray(weights, dtype=np.float32)
+        self.bias = np.asarray(bias, dtype=np.float32)
+        self.method = method
+        self.min_confidence = min_confidence
+        if self.weights.shape != (len(self.labels), NUM_FEATURES) or self.bias.shape != (len(self.labels),):
+            raise ValueError(f'Expected weights of shape ({len(self.labels)}, {NUM_FEATURES}) and bias '
+                             f'({len(self.labels)},), got {self.weights.shape} and {self.bias.shape}')
+        # Transposed once so scoring is a single contiguous matmul
+        self._weights_t = np.ascontiguousarray(self.weights.T)
+
+    @classmethod
+    def train(cls, landmarks, labels, method='centroid', iterations=1000, learning_rate=1.0,
+              regularization=1e-4, min_confidence=0.0):
+        """Fit a model to (N, 21, 3) landmarks and their N gesture labels"""
+        if method not in METHODS:
+            raise ValueError(f'Unknown method {method!r}; expected one of {METHODS}')
+        features = landmark_features(landmarks).astype(np.float64)
+        names = sorted({label or '' for label in labels})
+        targets = np.array([names.index(label or '') for label in labels])
+        if len(features) != len(targets):
+            raise ValueError(f'{len(features)} hands but {len(targets)} labels')
+
+        if method == 'centroid':
+            # Distances are measured in units of the pooled within-gesture
+            # spread, so jittery coordinates count less than telling ones
+            centroids = np.stack([features[targets == index].mean(axis=0) for index in range(len(names))])
+            std = np.sqrt(((features - centroids[targets]) ** 2).mean(axis=0))
+            std[std < 1e-6] = 1.0
+            weights = centroids / std
+            bias = -0.5 * (weights ** 2).sum(axis=1)
+            return cls(names, weights / std, bias, method, min_confidence)
+
+        # Softmax regression by full-batch gradient descent on standardized
+        # features; the standardization is folded into the weights afterwards
+        mean = features.mean(axis=0)
+        std = features.std(axis=0)
+        std[std < 1e-6] = 1.0
+        x = (features - mean) / std
+        onehot = np.eye(len(names))[targets]
+        weights = np.zeros((len(names), x.shape[1]))
+        bias = np.zeros(len(names))
+        for _ in range(iterations):
+            scores = x @ weights.T + bias
+            scores -= scores.max(axis=1, keepdims=True)
+            probabilities = np.exp(scores)
+            probabilities /= probabilities.sum(axis=1, keepdims=True)
+            error = (probabilities - onehot) / len(x)
+            weights -= learning_rate * (error.T @ x + regularization * weights)
+            bias -= learning_rate * error.sum(axis=0)
+
+        weights = weights / std
+        return cls(names, weights, bias - weights @ mean, method, min_confidence)
+
+    def scores(self, landmarks):
+        """(N, gestures) float32 scores for (21, 3) or (N, 21, 3) landmarks"""
+        features = landmark_features(landmarks)
+        scores = features @ self._weights_t
+        scores += self.bias
+        return scores
+
+    def classify(self, landmarks):
+        """Return a (gesture, confidence) pair for every hand"""
+        scores = self.scores(landmarks)
+        best = scores.argmax(axis=1)
+        # Softmax probability of the best score: 1 / sum(exp(s - s_best))
+        top = scores[np.arange(len(scores)), best]
+        confidence = 1.0 / np.exp(scores - top[:, None]).sum(axis=1)
+        labels = self.labels
+        return [(labels[index], value) if value >= self.min_confidence and labels[index] else (None, 0.0)
+                for index, value in zip(best.tolist(), confidence.tolist())]
+
+    def save(self, path):
+        np.savez(path, labels=np.array([label or '' for label in self.labels]), weights=self.weights,
+                 bias=self.bias, method=np.array(self.method), min_confidence=np.array(self.min_confidence))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data['labels'].tolist(), data['weights'], data['bias'], str(data['method']),
+                       float(data['min_confidence']))
+
+
+def load_labelled(paths):
+    """Read labelled landmark files; returns (float32 (N, 21, 3) points, N labels)"""
+    points = []
+    labels = []
+    for path in paths:
+        if os.path.isdir(path):
+            from session_recorder import load_recording
+
+            frames, _ = load_recording(path)
+            for frame in frames:
+                if not frame.result or not frame.result['landmarks']:
+                    continue
+                # Multi-hand results label every hand; the frame gesture may be a two-hand one
+                hands = frame.result.get('hands') or [frame.result]
+                for hand, landmarks in zip(hands, frame.result['landmarks']):
+                    points.append(as_landmark_array(landmarks)[None])
+                    labels.append(hand['gesture'])
+        elif path.endswith('.npz'):
+            with np.load(path) as data:
+                points.append(as_landmark_array(data['points']).reshape(-1, NUM_LANDMARKS, 3))
+                labels += [label or None for label in data['labels'].tolist()]
+        else:
+            hands = as_landmark_array(np.load(path)).reshape(-1, NUM_LANDMARKS, 3)
+            label = os.path.splitext(os.path.basename(path))[0]
+            points.append(hands)
+            labels += [None if label == NO_GESTURE else label] * len(hands)
+
+    if not points:
+        raise ValueError('No labelled landmarks found')
+    return np.concatenate(points), labels
+
+
+def accuracy(classifier, points, labels):
+    """Fraction of hands whose predicted gesture equals the label"""
+    predicted = [gesture for gesture, _ in classifier.classify(points)]
+    return sum(p == (label or None) for p, label in zip(predicted, labels)) / len(labels)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Train or evaluate a landmark gesture classifier')
+    commands = parser.add_subparsers(dest='command', required=True)
+    train = commands.add_parser('train', help='fit a model to labelled landmark files')
+    train.add_argument('data', nargs='+', help='.npy, .npz files or session recordings')
+    train.add_argument('-o', '--output', required=True, help='model file to write (.npz)')
+    train.add_argument('--method', choices=METHODS, default='centroid')
+    train.add_argument('--min-confidence', type=float, default=0.0,
+                       help='report no gesture below this softmax confidence')
+    evaluate = commands.add_parser('evaluate', help='accuracy of a model on labelled landmark files')
+    evaluate.add_argument('model')
+    evaluate.add_argument('data', nargs='+')
+    args = parser.parse_args(argv)
+
+    try:
+        points, labels = load_labelled(args.data)
+        if args.command == 'train':
+            classifier = LandmarkClassifier.train(points, labels, args.method, min_confidence=args.min_confidence)
+            classifier.save(args.output)
+            print(f"{args.method} model with {len(classifier.labels)} labels trained on {len(points)} hands, "
+                  f"training accuracy {accuracy(classifier, points, labels):.1%}")
+        else:
+            classifier = LandmarkClassifier.load(args.model)
+            print(f"{len(points)} hands, accuracy {accuracy(classifier, points, labels):.1%}")
+    except (ValueError, OSError, KeyError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+import atexit
+import threading
+import time
+
+import cv2
+
+
+def parse_source(source):
+    """A device index for digit strings like '0', otherwise the path as given"""
+    if isinstance(source, str) and source.isdigit():
+        return int(source)
+    return source
+
+
+class LocalCapture:
+    """Recognize frames from a camera or video file attached to the server
+
+    A grab thread reads the source continuously and keeps only the newest
+    frame; a worker thread runs `process(frame)` on it whenever it is free
+    and hands the result to `on_result`. Frames that arrive while the
+    worker is busy replace each other, so a slow recognizer skips frames
+    instead of falling behind. Video files are read at their own frame
+    rate (or `fps`) and, with `loop`, start over at the end.
+    """
+
+    def __init__(self, source, process, on_result=None, loop=True, fps=None):
+        self.source = parse_source(source)
+        self.process = process
+        self.on_result = on_result
+        self.loop = loop
+        self.fps = fps
+
+        self._cond = threading.Condition()
+        self._frame = None
+        self._running = False
+        self._finished = False
+        self._threads = []
+        self._started_at = None
+        self.stats = {
+            'grabbed': 0,
+            'processed': 0,
+            'dropped': 0,
+            'loops': 0,
+            'errors': 0,
+            'process_s': 0.0
+        }
+
+    @property
+    def is_file(self):
+        return isinstance(self.source, str)
+
+    @property
+    def running(self):
+        return self._running
+
+    def start(self):
+        """Open the source and start the grab and worker threads"""
+        if self._running:
+            return self
+        capture = cv2.VideoCapture(self.source)
+        if not capture.isOpened():
+            raise ValueError(f'Could not open video source: {self.source}')
+
+        fps = self.fps
+        if fps is None and self.is_file:
+            fps = capture.get(cv2.CAP_PROP_FPS) or 30.0
+        # Cameras block in read() until their next frame; files need pacing
+        interval = 1.0 / fps if fps else 0.0
+
+        self._running = True
+        self._finished = False
+        self._started_at = time.monotonic()
+        self._threads = [
+            threading.Thread(target=self._grab, args=(capture, interval), name='local-capture-grab', daemon=True),
+            threading.Thread(target=self._work, name='local-capture-recognize', daemon=True)
+        ]
+        for thread in self._threads:
+            thread.start()
+        # Stop recognizing before the interpreter tears down MediaPipe
+        atexit.register(self.stop)
+        return self
+
+    def stop(self, timeout=2.0):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def wait(self, timeout=None):
+        """Block until a non-looping source ran out of frames and its last frame was processed"""
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _read(self, capture):
+        ok, frame = capture.read()
+        if ok or not (self.is_file and self.loop):
+            return frame if ok else None
+
+        # End of the file: rewind, or reopen if the backend cannot seek
+        if not capture.set(cv2.CAP_PROP_POS_FRAMES, 0):
+            capture.release()
+            capture.open(self.source)
+        with self._cond:
+            self.stats['loops'] += 1
+        ok, frame = capture.read()
+        return frame if ok else None
+
+    def _grab(self, capture, interval):
+        next_at = time.monotonic()
+        try:
+            while self._running:
+                frame = self._read(capture)
+                if frame is None:
+                    return
+                with self._cond:
+                    if self._frame is not None:
+                        self.stats['dropped'] += 1
+                    self._frame = frame
+                    self.stats['grabbed'] += 1
+                    self._cond.notify()
+
+                if interval:
+                    next_at += interval
+                    delay = next_at - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                    else:
+                        # Too slow to keep the pace: do not try to catch up
+                        next_at = time.monotonic()
+        finally:
+            capture.release()
+            with self._cond:
+                self._finished = True
+                self._cond.notify_all()
+
+    def _work(self):
+        while True:
+            with self._cond:
+                while self._frame is None and self._running and not self._finished:
+                    self._cond.wait()
+                if self._frame is None or not self._running:
+                    return
+                frame = self._frame
+                self._frame = None
+
+            start = time.perf_counter()
+            try:
+                result = self.process(frame)
+            except Exception:
+                with self._cond:
+                    self.stats['errors'] += 1
+                continue
+            with self._cond:
+                self.stats['processed'] += 1
+                self.stats['process_s'] += time.perf_counter() - start
+            if self.on_result is not None:
+                self.on_result(result)
+
+    def get_stats(self):
+        with self._cond:
+            stats = dict(self.stats)
+        process_s = stats.pop('process_s')
+        elapsed = time.monotonic() - self._started_at if self._started_at else 0.0
+        stats['source'] = str(self.source)
+        stats['running'] = self._running and not self._finished
+        stats['fps'] = stats['processed'] / elapsed if elapsed else 0.0
+        stats['process_ms'] = process_s * 1000.0 / stats['processed'] if stats['processed'] else 0.0
+        return stats
@@ -0,0 +1,88 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class PredictionCache:
+    """Bounded LRU cache in front of WordPredictor.predict_sentences
+
+    Clients send their whole word list again on every new word, and the
+    same few words recur across users, so suggestions are kept per
+    lower-cased word tuple (the predictor ignores case). The least recently
+    used entry is evicted beyond `max_size` entries, and with `ttl` entries
+    also expire that many seconds after they were computed. The cache
+    empties itself when the predictor's index is rebuilt, e.g. by
+    set_templates().
+    """
+
+    def __init__(self, predictor, max_size=1024, ttl=None):
+        self.predictor = predictor
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # words -> (expires_at, sentences), least recently used first
+        self._version = predictor.version
+
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'evicted': 0,
+            'expired': 0,
+            'invalidated': 0
+        }
+
+    def predict_sentences(self, words):
+        """Cached predictor.predict_sentences(words)"""
+        key = tuple(word.lower() for word in words)
+        now = time.monotonic()
+        with self._lock:
+            self._check_version()
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, sentences = entry
+                if expires_at is None or now < expires_at:
+                    self._entries.move_to_end(key)
+                    self.stats['hits'] += 1
+                    return list(sentences)
+                del self._entries[key]
+                self.stats['expired'] += 1
+            self.stats['misses'] += 1
+            version = self._version
+
+        # Predicted outside the lock; concurrent misses on one key both compute
+        sentences = self.predictor.predict_sentences(list(key))
+        expires_at = now + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._check_version()
+            # Suggestions computed from an index that was rebuilt meanwhile are not kept
+            if version == self._version and self.max_size > 0:
+                self._entries[key] = (expires_at, tuple(sentences))
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+                    self.stats['evicted'] += 1
+        return sentences
+
+    def clear(self):
+        with self._lock:
+            self._drop_all()
+
+    def get_stats(self):
+        """Return occupancy, hit rate and lifetime counters"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['size'] = len(self._entries)
+            stats['max_size'] = self.max_size
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+    def _check_version(self):
+        if self.predictor.version != self._version:
+            self._version = self.predictor.version
+            self._drop_all()
+
+    def _drop_all(self):
+        self.stats['invalidated'] += len(self._entries)
+        self._entries.clear()
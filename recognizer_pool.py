@@ -0,0 +1,247 @@
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+class PoolExhausted(RuntimeError):
+    """Raised when every pooled recognizer is busy and none can be evicted"""
+
+
+class _PoolEntry:
+    def __init__(self, recognizer=None):
+        self.recognizer = recognizer
+        self.lock = threading.Lock()
+        self.in_use = 0
+        self.last_used = time.monotonic()
+        # A new session's entry reserves its pool slot before the recognizer
+        # exists; `ready` is set once it was created (or failed to be)
+        self.ready = threading.Event()
+        if recognizer is not None:
+            self.ready.set()
+
+
+class RecognizerPool:
+    """Pool of GestureRecognizer instances keyed by socket session id
+
+    Every session gets its own recognizer so MediaPipe tracking state never
+    mixes between users. Recognizers of disconnected or idle sessions are
+    reset and kept as spares for the next client, re-warmed on a
+    background thread.
+    """
+
+    def __init__(self, factory, max_size=8, idle_ttl=120.0, spares=1, warm=None):
+        self.factory = factory
+        self.max_size = max_size
+        self.idle_ttl = idle_ttl
+        self.spares = spares
+        # Optional warm(recognizer) run on every spare before it is pooled,
+        # e.g. a blank frame, so a new session's first frame does not pay
+        # for the graph's first inference. Resetting a graph undoes it.
+        self.warm = warm
+
+        self._lock = threading.Lock()
+        self._sessions = OrderedDict()  # sid -> _PoolEntry, least recently used first
+        self._spare = []
+        # Reset recognizers of ended sessions, warmed by the refill thread
+        # so disconnects and evictions never wait for an inference
+        self._cold = []
+        self._refilling = False
+
+        self.stats = {
+            'created': 0,
+            'reused': 0,
+            'evicted': 0,
+            'expired': 0,
+            'released': 0
+        }
+
+    def prewarm(self):
+        """Build spare recognizers up front so new sessions skip graph start-up"""
+        while True:
+            with self._lock:
+                recognizer = self._cold.pop() if self._cold else None
+                if recognizer is None:
+                    if len(self._spare) + len(self._sessions) >= self.max_size + self.spares:
+                        return
+                    if len(self._spare) >= self.spares:
+                        return
+            if recognizer is None:
+                recognizer = self._create()
+            if self.warm is not None:
+                self.warm(recognizer)
+            with self._lock:
+                self._spare.append(recognizer)
+
+    @contextmanager
+    def session(self, sid):
+        """Borrow the recognizer bound to `sid`, creating one if needed
+
+        Frames of one session are serialized on the session lock, frames of
+        different sessions run concurrently on their own recognizers.
+        """
+        entry = self._acquire(sid)
+        try:
+            with entry.lock:
+                yield entry.recognizer
+        finally:
+            with self._lock:
+                entry.in_use -= 1
+                entry.last_used = time.monotonic()
+
+    def release(self, sid):
+        """Drop the recognizer of a disconnected session"""
+        with self._lock:
+            entry = self._sessions.pop(sid, None)
+            if entry is None:
+                return
+            self.stats['released'] += 1
+        self._retire(entry)
+
+    def reap(self):
+        """Expire sessions that have been idle for longer than `idle_ttl`"""
+        expired = []
+        now = time.monotonic()
+        with self._lock:
+            for sid, entry in list(self._sessions.items()):
+                if now - entry.last_used < self.idle_ttl:
+                    break
+                if entry.in_use:
+                    continue
+                del self._sessions[sid]
+                expired.append(entry)
+            self.stats['expired'] += len(expired)
+        for entry in expired:
+            self._retire(entry)
+
+    def get_stats(self):
+        """Return pool occupancy and lifetime counters"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['active'] = len(self._sessions)
+            stats['spare'] = len(self._spare)
+            stats['cold'] = len(self._cold)
+            stats['max_size'] = self.max_size
+        return stats
+
+    def close(self):
+        """Close every pooled recognizer"""
+        with self._lock:
+            entries = list(self._sessions.values())
+            spares = self._spare + self._cold
+            self._sessions.clear()
+            self._spare = []
+            self._cold = []
+        for entry in entries:
+            if entry.recognizer is not None:
+                entry.recognizer.close()
+        for recognizer in spares:
+            recognizer.close()
+
+    def _acquire(self, sid):
+        self.reap()
+
+        with self._lock:
+            entry = self._sessions.get(sid)
+            if entry is not None:
+                self._sessions.move_to_end(sid)
+                entry.in_use += 1
+            else:
+                victim = None
+                if len(self._sessions) >= self.max_size:
+                    victim = self._pop_lru_idle()
+
+                # A cold one still beats building a new graph
+                spares = self._spare or self._cold
+                recognizer = spares.pop() if spares else None
+                if recognizer is not None:
+                    self.stats['reused'] += 1
+
+                # Reserve the slot now, so concurrent new sessions see the pool as full
+                reserved = _PoolEntry()
+                reserved.in_use = 1
+                self._sessions[sid] = reserved
+
+        if entry is not None:
+            # Possibly another handler of this session still creating its recognizer
+            entry.ready.wait()
+            if entry.recognizer is None:
+                with self._lock:
+                    entry.in_use -= 1
+                raise PoolExhausted(f'No recognizer could be created for session {sid}')
+            return entry
+
+        entry = reserved
+        try:
+            if victim is not None:
+                if recognizer is None:
+                    # Hand the evicted session's graph straight to the new session
+                    victim.recognizer.reset()
+                    recognizer = victim.recognizer
+                    with self._lock:
+                        self.stats['reused'] += 1
+                else:
+                    self._retire(victim)
+
+            if recognizer is None:
+                recognizer = self._create()
+        except BaseException:
+            # Give the reserved slot back
+            with self._lock:
+                if self._sessions.get(sid) is entry:
+                    del self._sessions[sid]
+            entry.ready.set()
+            raise
+
+        entry.recognizer = recognizer
+        entry.ready.set()
+        self._refill_spares()
+        return entry
+
+    def _pop_lru_idle(self):
+        for sid, entry in self._sessions.items():
+            if not entry.in_use:
+                del self._sessions[sid]
+                self.stats['evicted'] += 1
+                return entry
+        raise PoolExhausted(f'All {self.max_size} recognizers are busy')
+
+    def _retire(self, entry):
+        entry.ready.wait()
+        if entry.recognizer is None:
+            return
+        with entry.lock:
+            entry.recognizer.reset()
+        with self._lock:
+            keep = len(self._spare) + len(self._cold) < self.spares
+            if keep:
+                (self._spare if self.warm is None else self._cold).append(entry.recognizer)
+        if not keep:
+            entry.recognizer.close()
+            return
+        self._refill_spares()
+
+    def _create(self):
+        recognizer = self.factory()
+        with self._lock:
+            self.stats['created'] += 1
+        return recognizer
+
+    def _refill_spares(self):
+        with self._lock:
+            if self._refilling or (len(self._spare) >= self.spares and not self._cold):
+                return
+            self._refilling = True
+
+        def refill():
+            try:
+                self.prewarm()
+            finally:
+                with self._lock:
+                    self._refilling = False
+                    # Retired while this refill was finishing
+                    again = bool(self._cold)
+                if again:
+                    self._refill_spares()
+
+        threading.Thread(target=refill, daemon=True).start()
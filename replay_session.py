@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Replay a recorded session through GestureRecognizer and diff the results
+
+Frames from a SessionRecorder recording are decoded and recognized again,
+either at their original pace or as fast as possible, and each new result
+is compared with the one recorded by the server: gesture, word, confidence
+and landmark positions, plus the per-frame inference time.
+
+    python replay_session.py recordings/20250801-093000-abc123
+    python replay_session.py recordings/20250801-093000-abc123 --realtime --roi-size 256
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from frame_transport import BINARY, FrameDecoder, FramePayload
+from gesture_recognition import GestureRecognizer
+from session_recorder import load_recording
+
+
+def _landmark_array(result):
+    hands = result['landmarks'] if result else []
+    if not hands:
+        return None
+    return np.array([[point['x'], point['y'], point['z']] for point in hands[0]], dtype=np.float32)
+
+
+def compare_results(recorded, replayed):
+    """Return (gesture matches, confidence difference, largest landmark difference)"""
+    same = recorded['gesture'] == replayed['gesture'] and recorded['word'] == replayed['word']
+    confidence = abs(recorded['confidence'] - replayed['confidence'])
+    before, after = _landmark_array(recorded), _landmark_array(replayed)
+    if before is None or after is None:
+        landmarks = 0.0 if before is None and after is None else float('inf')
+    else:
+        landmarks = float(np.abs(before - after).max())
+    return same, confidence, landmarks
+
+
+def replay(directory, realtime=False, all_frames=False, roi_size=None, max_width=None,
+           tolerance=1e-3, factory=None):
+    """Replay one recording and return a summary dict
+
+    By default only the frames that reached the recognizer in the recorded
+    session are replayed, so tracking sees the same frame sequence; with
+    `all_frames` every recorded frame is recognized.
+    """
+    frames, emits = load_recording(directory)
+    if not all_frames:
+        frames = [frame for frame in frames if frame.result is not None]
+    if factory is None:
+        def factory():
+            return GestureRecognizer(roi_size=roi_size)
+
+    gesture_recognizer = factory()
+    decoder = FrameDecoder(max_width=max_width)
+    mismatches = []
+    drifted = 0
+    compared = 0
+    recorded_ms = []
+    replayed_ms = []
+    confidence_diff = 0.0
+    landmark_diff = 0.0
+
+    start = time.monotonic()
+    first = frames[0].timestamp if frames else 0.0
+    try:
+        for index, frame in enumerate(frames):
+            if realtime:
+                delay = (frame.timestamp - first) - (time.monotonic() - start)
+                if delay > 0:
+                    time.sleep(delay)
+
+            begin = time.perf_counter()
+            image = decoder.decode(directory, FramePayload(frame.data, BINARY))
+            result = gesture_recognizer.process_frame(image, rgb=True)
+            replayed_ms.append((time.perf_counter() - begin) * 1000.0)
+
+            if frame.result is None:
+                continue
+            compared += 1
+            recorded_ms.append(frame.ms)
+            same, confidence, landmarks = compare_results(frame.result, result)
+            confidence_diff = max(confidence_diff, confidence)
+            if landmarks != float('inf'):
+                landmark_diff = max(landmark_diff, landmarks)
+            if not same:
+                mismatches.append((index, frame.result['gesture'], result['gesture']))
+            elif landmarks > tolerance or confidence > tolerance:
+                drifted += 1
+    finally:
+        gesture_recognizer.close()
+    wall = time.monotonic() - start
+
+    def percentiles(values):
+        values = np.array(values) if values else np.zeros(1)
+        return float(np.percentile(values, 50)), float(np.percentile(values, 95))
+
+    summary = {
+        'recording': directory,
+        'frames': len(frames),
+        'compared': compared,
+        'emits': len(emits),
+        'mismatches': mismatches,
+        'drifted': drifted,
+        'max_confidence_diff': confidence_diff,
+        'max_landmark_diff': landmark_diff,
+        'wall_s': wall,
+        'duration_s': frames[-1].timestamp - first if frames else 0.0
+    }
+    summary['recorded_p50_ms'], summary['recorded_p95_ms'] = percentiles(recorded_ms)
+    summary['replayed_p50_ms'], summary['replayed_p95_ms'] = percentiles(replayed_ms)
+    return summary
+
+
+def format_summary(summary):
+    """Human-readable replay report"""
+    lines = [
+        f"{summary['recording']}: {summary['frames']} frames replayed in {summary['wall_s']:.2f} s "
+        f"(recorded over {summary['duration_s']:.2f} s), {summary['emits']} results were emitted",
+        f"  recorded  p50 {summary['recorded_p50_ms']:8.2f} ms   p95 {summary['recorded_p95_ms']:8.2f} ms",
+        f"  replayed  p50 {summary['replayed_p50_ms']:8.2f} ms   p95 {summary['replayed_p95_ms']:8.2f} ms",
+        f"  {summary['compared']} results compared: {len(summary['mismatches'])} different gestures, "
+        f"{summary['drifted']} beyond tolerance (max confidence diff {summary['max_confidence_diff']:.4f}, "
+        f"max landmark diff {summary['max_landmark_diff']:.4f})"
+    ]
+    for index, before, after in summary['mismatches'][:20]:
+        lines.append(f"    frame {index}: {before} -> {after}")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Replay a recorded session and diff the results')
+    parser.add_argument('recording', help='session directory written by SessionRecorder')
+    parser.add_argument('--realtime', action='store_true', help='replay at the original pace instead of flat out')
+    parser.add_argument('--all-frames', action='store_true',
+                        help='also recognize frames the server skipped or superseded')
+    parser.add_argument('--roi-size', type=int, default=None, help='HAND_ROI_SIZE to replay with')
+    parser.add_argument('--max-width', type=int, default=None, help='DECODE_MAX_WIDTH to replay with')
+    parser.add_argument('--tolerance', type=float, default=1e-3,
+                        help='largest confidence or landmark difference counted as unchanged')
+    args = parser.parse_args(argv)
+
+    try:
+        summary = replay(args.recording, args.realtime, args.all_frames, args.roi_size, args.max_width,
+                         args.tolerance)
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    for line in format_summary(summary):
+        print(line)
+    return 1 if summary['mismatches'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+import json
+import threading
+
+import numpy as np
+
+from hand_landmarks import NUM_LANDMARKS, as_landmark_array
+
+# Landmark encodings a client can ask for
+JSON = 'json'
+INT16 = 'int16'
+FLOAT16 = 'float16'
+NONE = 'none'
+LANDMARK_FORMATS = (JSON, INT16, FLOAT16, NONE)
+
+# Sent instead of INT16 in delta mode when every coordinate moved by less
+# than an int8 step from the previous result
+INT8_DELTA = 'int8_delta'
+
+# int16 fixed point: 1/8192 of the frame (about 0.13 px at 1080p), range +-4
+INT16_SCALE = 8192
+
+
+def quantize_landmarks(points):
+    """Quantize a (21, 3) or (N, 21, 3) landmark array to int16 fixed point"""
+    scaled = np.rint(np.asarray(points, dtype=np.float32) * INT16_SCALE)
+    return np.clip(scaled, -32768, 32767).astype('<i2')
+
+
+def dequantize_landmarks(quantized):
+    """Inverse of quantize_landmarks: a float32 (21, 3) array for one hand, (N, 21, 3) for several"""
+    values = np.asarray(quantized, dtype='<i2')
+    shape = (NUM_LANDMARKS, 3) if values.size == NUM_LANDMARKS * 3 else (-1, NUM_LANDMARKS, 3)
+    return values.reshape(shape).astype(np.float32) / INT16_SCALE
+
+
+class _SessionFormat:
+    __slots__ = ('landmarks', 'delta', 'previous', 'send_lock')
+
+    def __init__(self, landmarks=JSON, delta=False):
+        self.landmarks = landmarks
+        self.delta = delta
+        # Last int16 landmarks sent, the reference for the next delta
+        self.previous = None
+        # Held from encoding until the payload is handed to the socket
+        self.send_lock = threading.Lock()
+
+
+class ResultEncoder:
+    """Per-session encoding of gesture_result payloads
+
+    Clients that never negotiate get the original JSON landmark dicts.
+    Others choose packed int16 or float16 landmarks (63 values per hand as
+    one binary attachment), no landmarks at all while the overlay is
+    hidden, or int16 with int8 deltas against the previously sent
+    landmarks. Multi-hand results keep their per-hand list in every format.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self.stats = {fmt: 0 for fmt in LANDMARK_FORMATS + (INT8_DELTA,)}
+
+    def negotiate(self, sid, options):
+        """Set a session's format from the client's {'landmarks', 'delta'} options"""
+        options = options or {}
+        landmarks = options.get('landmarks', JSON)
+        if landmarks not in LANDMARK_FORMATS:
+            raise ValueError(f'Unsupported landmark format: {landmarks}')
+        delta = bool(options.get('delta', False))
+        if delta and landmarks != INT16:
+            raise ValueError('Delta mode requires int16 landmarks')
+
+        with self._lock:
+            self._sessions[sid] = _SessionFormat(landmarks, delta)
+        return {'landmarks': landmarks, 'delta': delta, 'scale': INT16_SCALE}
+
+    def encode(self, sid, result):
+        """Build the gesture_result payload for one session"""
+        with self._lock:
+            session = self._sessions.get(sid)
+            fmt = session.landmarks if session else JSON
+            payload = {
+                'gesture': result['gesture'],
+                'confidence': result['confidence'],
+                'word': result['word']
+            }
+            if 'hands' in result:
+                payload['hands'] = result['hands']
+                payload['two_hand'] = result['two_hand']
+
+            if fmt == JSON:
+                payload['landmarks'] = result['landmarks']
+            elif fmt != NONE:
+                fmt, payload['landmarks'] = self._pack(session, result['landmarks'])
+            payload['landmarks_format'] = fmt
+            self.stats[fmt] += 1
+            return payload
+
+    def send(self, sid, result, emit):
+        """Encode a result and pass the payload to `emit(payload)`
+
+        Handlers of one session may run concurrently, so the session stays
+        locked until the payload was emitted: results reach the client in
+        the order they were encoded, and every delta arrives after the
+        landmarks it refers to.
+        """
+        with self._lock:
+            session = self._sessions.get(sid)
+        if session is None:
+            return emit(self.encode(sid, result))
+        with session.send_lock:
+            return emit(self.encode(sid, result))
+
+    def _pack(self, session, landmarks):
+        if not landmarks:
+            session.previous = None
+            return session.landmarks, None
+
+        # Every hand, as one (N, 21, 3) block
+        points = as_landmark_array(landmarks)
+        if session.landmarks == FLOAT16:
+            return FLOAT16, points.astype('<f2').tobytes()
+
+        quantized = quantize_landmarks(points)
+        previous, session.previous = session.previous, quantized
+        if session.delta and previous is not None and previous.shape == quantized.shape:
+            delta = quantized.astype(np.int32) - previous
+            if np.abs(delta).max() <= 127:
+                return INT8_DELTA, delta.astype(np.int8).tobytes()
+        return INT16, quantized.tobytes()
+
+    def release(self, sid):
+        with self._lock:
+            self._sessions.pop(sid, None)
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats['sessions'] = len(self._sessions)
+        return stats
+
+
+def payload_size(payload):
+    """Approximate bytes on the wire: the JSON part plus any binary attachment"""
+    text = {key: value for key, value in payload.items() if not isinstance(value, bytes)}
+    binary = sum(len(value) for value in payload.values() if isinstance(value, bytes))
+    return len(json.dumps(text, separators=(',', ':'))) + binary
+
+
+if __name__ == "__main__":
+    from hand_landmarks import landmarks_to_dicts
+
+    # A hand moving a few pixels per frame, as during a held gesture
+    rng = np.random.default_rng(0)
+    hand = rng.random((NUM_LANDMARKS, 3)).astype(np.float32)
+    frames = [hand + np.float32(0.002) * i for i in range(30)]
+
+    def result(points):
+        return {'gesture': 'five', 'confidence': 0.85, 'word': 'five', 'landmarks': [landmarks_to_dicts(points)]}
+
+    modes = [('json', {}), ('int16', {'landmarks': INT16}), ('float16', {'landmarks': FLOAT16}),
+             ('int16 + delta', {'landmarks': INT16, 'delta': True}), ('none', {'landmarks': NONE})]
+    print(f"{'mode':<16}{'bytes/result':>14}{'max error':>12}")
+    for name, options in modes:
+        encoder = ResultEncoder()
+        encoder.negotiate('bench', options)
+        sizes = [payload_size(encoder.encode('bench', result(points))) for points in frames]
+        error = {INT16: 0.5 / INT16_SCALE, FLOAT16: 2.0 ** -12}.get(options.get('landmarks'), 0.0)
+        print(f"{name:<16}{sum(sizes) / len(sizes):>14.0f}{error:>12.1e}")
@@ -0,0 +1,238 @@
+import json
+import os
+import re
+import struct
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from frame_transport import BINARY, DATA_URL, encoded_buffer
+
+# Every segment file starts with this magic and format version
+MAGIC = b'GREC\x01'
+SEGMENT_NAME = 'segment-{:05d}.grec'
+
+# Record kinds. FRAME bodies are a transport byte and the encoded image;
+# RESULT and EMIT bodies are compact JSON.
+FRAME = 1
+RESULT = 2
+EMIT = 3
+
+# kind, seconds since the session started, body length
+_HEADER = struct.Struct('<BdI')
+_TRANSPORTS = {DATA_URL: 0, BINARY: 1}
+TRANSPORT_NAMES = {code: name for name, code in _TRANSPORTS.items()}
+
+Record = namedtuple('Record', ['kind', 'timestamp', 'body'])
+
+
+class _Writer:
+    __slots__ = ('directory', 'started', 'segment', 'file', 'segment_size', 'size', 'lock', 'full', 'closed')
+
+    def __init__(self, directory, started):
+        self.directory = directory
+        self.started = started
+        self.segment = -1
+        self.file = None
+        self.segment_size = 0
+        self.size = 0
+        self.lock = threading.Lock()
+        self.full = False
+        self.closed = False
+
+
+class SessionRecorder:
+    """Opt-in per-session recording of frames, recognition results and emits
+
+    Each session gets its own directory of segment files under `directory`.
+    Frames are stored as their encoded image bytes (data URLs are stored
+    base64-decoded) with the time they arrived; RESULT records carry the
+    inference time and result of every frame that actually reached the
+    recognizer, keyed by that frame's timestamp; EMIT records are the
+    results sent to the client. A session stops recording once it has
+    written `max_bytes`. Records for a released session are dropped for
+    `released_ttl` seconds, far longer than a handler that was already
+    running for it can take; Socket.IO never reuses a sid after that.
+    """
+
+    def __init__(self, directory, segment_bytes=64 * 1024 * 1024, max_bytes=1024 * 1024 * 1024,
+                 released_ttl=60.0):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.max_bytes = max_bytes
+        self.released_ttl = released_ttl
+        self._lock = threading.Lock()
+        self._sessions = {}
+        # sid -> release time, oldest first, of sessions that disconnected
+        # recently; a handler still running for one of them must not start
+        # a new recording
+        self._released = OrderedDict()
+        self.stats = {
+            'recordings': 0,
+            'frames': 0,
+            'results': 0,
+            'emits': 0,
+            'bytes': 0,
+            'truncated': 0
+        }
+
+    def record_frame(self, sid, payload):
+        """Append an incoming frame payload"""
+        writer = self._writer(sid)
+        if writer is None:
+            return
+        body = bytes([_TRANSPORTS[payload.transport]]) + encoded_buffer(payload).tobytes()
+        self._append(writer, FRAME, payload.received_at - writer.started, body, 'frames')
+
+    def record_result(self, sid, payload, result, seconds):
+        """Append the recognizer's result for `payload` and how long it took"""
+        writer = self._writer(sid)
+        if writer is None:
+            return
+        body = {'frame': payload.received_at - writer.started, 'ms': seconds * 1000.0, 'result': result}
+        self._append(writer, RESULT, time.monotonic() - writer.started, _to_json(body), 'results')
+
+    def record_emit(self, sid, result):
+        """Append a result that was sent to the client"""
+        writer = self._writer(sid)
+        if writer is None:
+            return
+        self._append(writer, EMIT, time.monotonic() - writer.started, _to_json(result), 'emits')
+
+    def wrap(self, process):
+        """Wrap a backend's process(sid, payload) so its results are recorded"""
+        def recorded(sid, payload):
+            start = time.perf_counter()
+            result = process(sid, payload)
+            self.record_result(sid, payload, result, time.perf_counter() - start)
+            return result
+        return recorded
+
+    def _writer(self, sid):
+        """The session's writer, created on first use; None once the session was released"""
+        with self._lock:
+            writer = self._sessions.get(sid)
+            if writer is None:
+                if sid in self._released:
+                    return None
+                name = time.strftime('%Y%m%d-%H%M%S-') + re.sub(r'[^A-Za-z0-9_-]', '_', str(sid))
+                directory = os.path.join(self.directory, name)
+                os.makedirs(directory, exist_ok=True)
+                writer = self._sessions[sid] = _Writer(directory, time.monotonic())
+                self.stats['recordings'] += 1
+            return writer
+
+    def _append(self, writer, kind, timestamp, body, counter):
+        header = _HEADER.pack(kind, timestamp, len(body))
+        size = len(header) + len(body)
+        with writer.lock:
+            if writer.full or writer.closed:
+                return
+            if writer.size + size > self.max_bytes:
+                writer.full = True
+                self._close(writer)
+                with self._lock:
+                    self.stats['truncated'] += 1
+                return
+            if writer.file is None or writer.segment_size + size > self.segment_bytes:
+                self._next_segment(writer)
+            writer.file.write(header)
+            writer.file.write(body)
+            writer.segment_size += size
+            writer.size += size
+        with self._lock:
+            self.stats[counter] += 1
+            self.stats['bytes'] += size
+
+    def _next_segment(self, writer):
+        self._close(writer)
+        writer.segment += 1
+        writer.file = open(os.path.join(writer.directory, SEGMENT_NAME.format(writer.segment)), 'wb')
+        writer.file.write(MAGIC)
+        writer.segment_size = len(MAGIC)
+
+    @staticmethod
+    def _close(writer):
+        if writer.file is not None:
+            writer.file.close()
+            writer.file = None
+
+    def release(self, sid):
+        """Finish a session's recording"""
+        now = time.monotonic()
+        with self._lock:
+            writer = self._sessions.pop(sid, None)
+            self._released.pop(sid, None)
+            self._released[sid] = now
+            while next(iter(self._released.values())) < now - self.released_ttl:
+                self._released.popitem(last=False)
+        if writer is not None:
+            with writer.lock:
+                writer.closed = True
+                self._close(writer)
+
+    def close(self):
+        with self._lock:
+            sids = list(self._sessions)
+        for sid in sids:
+            self.release(sid)
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats['sessions'] = len(self._sessions)
+        stats['directory'] = self.directory
+        return stats
+
+
+def _to_json(value):
+    return json.dumps(value, separators=(',', ':'), default=float).encode()
+
+
+def iter_records(directory):
+    """Yield the Records of one session recording, segment by segment"""
+    names = sorted(name for name in os.listdir(directory) if name.endswith('.grec'))
+    if not names:
+        raise ValueError(f'No recording segments in {directory}')
+    for name in names:
+        with open(os.path.join(directory, name), 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f'{name} is not a session recording segment')
+            while True:
+                header = f.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    # A truncated tail is what a crashed server leaves behind
+                    break
+                kind, timestamp, length = _HEADER.unpack(header)
+                body = f.read(length)
+                if len(body) < length:
+                    break
+                yield Record(kind, timestamp, body)
+
+
+# A recorded frame; `result` and `ms` are None when the frame never reached
+# the recognizer (superseded in the mailbox or answered by the frame gate)
+RecordedFrame = namedtuple('RecordedFrame', ['timestamp', 'transport', 'data', 'result', 'ms'])
+
+
+def load_recording(directory):
+    """Return (frames, emits) of a session recording
+
+    frames are RecordedFrames in arrival order; emits are the
+    (timestamp, result) pairs sent to the client.
+    """
+    frames = []
+    results = {}
+    emits = []
+    for record in iter_records(directory):
+        if record.kind == FRAME:
+            frames.append((record.timestamp, TRANSPORT_NAMES[record.body[0]], record.body[1:]))
+        elif record.kind == RESULT:
+            body = json.loads(record.body)
+            results[body['frame']] = (body['result'], body['ms'])
+        elif record.kind == EMIT:
+            emits.append((record.timestamp, json.loads(record.body)))
+
+    recorded = [RecordedFrame(timestamp, transport, data, *results.get(timestamp, (None, None)))
+                for timestamp, transport, data in frames]
+    return recorded, emits
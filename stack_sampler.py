@@ -0,0 +1,98 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+# Socket.IO handlers on the frame and sentence paths, sampled by default
+HANDLER_FUNCTIONS = (
+    'handle_frame',
+    'handle_binary_frame',
+    'handle_landmarks',
+    'handle_sentence_prediction'
+)
+
+
+class SamplerBusy(RuntimeError):
+    """Raised when a profile is requested while another one is running"""
+
+
+class StackSampler:
+    """Statistical profiler that samples the stacks of every other thread
+
+    Nothing is installed while no profile runs: the thread that asks for a
+    profile reads sys._current_frames() every `interval` seconds for the
+    requested duration and then returns, so an idle sampler costs nothing.
+    Stacks are reported in the collapsed format used by flamegraph.pl and
+    speedscope, one `frame;frame;frame count` line per distinct stack,
+    root first.
+    """
+
+    def __init__(self, interval=0.005, focus=HANDLER_FUNCTIONS):
+        self.interval = interval
+        self.focus = frozenset(focus or ())
+        self._running = threading.Lock()
+        self.stats = {
+            'profiles': 0,
+            'samples': 0
+        }
+
+    def profile(self, seconds, interval=None, all_threads=False):
+        """Sample for `seconds` and return {collapsed stack: count}
+
+        Only stacks passing through one of the `focus` functions are kept
+        unless `all_threads` is set. Raises SamplerBusy if a profile is
+        already running.
+        """
+        if not self._running.acquire(blocking=False):
+            raise SamplerBusy('A profile is already running')
+        try:
+            return self._sample(seconds, interval or self.interval, all_threads)
+        finally:
+            self._running.release()
+
+    def _sample(self, seconds, interval, all_threads):
+        stacks = Counter()
+        samples = 0
+        own = threading.get_ident()
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            frames = sys._current_frames()
+            for ident, frame in frames.items():
+                if ident == own:
+                    continue
+                stack = self._collapse(frame)
+                if not all_threads and not self.focus.intersection(name for _, name in stack):
+                    continue
+                # Request threads come and go, so stacks are merged across threads
+                stacks[';'.join(f'{module}:{name}' for module, name in stack)] += 1
+            # Frames keep their locals alive; drop them before sleeping
+            del frames, frame
+            samples += 1
+            time.sleep(interval)
+
+        self.stats['profiles'] += 1
+        self.stats['samples'] += samples
+        return stacks
+
+    @staticmethod
+    def _collapse(frame):
+        """(module, function) pairs from the outermost call to `frame`"""
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            module = os.path.splitext(os.path.basename(code.co_filename))[0]
+            stack.append((module, code.co_name))
+            frame = frame.f_back
+        stack.reverse()
+        return stack
+
+    def get_stats(self):
+        stats = dict(self.stats)
+        stats['running'] = self._running.locked()
+        return stats
+
+
+def format_collapsed(stacks):
+    """Collapsed-stack text, most frequent stacks first"""
+    return ''.join(f'{stack} {count}\n' for stack, count in stacks.most_common())
@@ -1,4 +1,15 @@
 // Gesture Chat Application
+
+// IEEE 754 half precision bits to a number
+function halfToFloat(bits) {
+    const sign = bits & 0x8000 ? -1 : 1;
+    const exponent = (bits >> 10) & 0x1f;
+    const fraction = bits & 0x3ff;
+    if (exponent === 0) return sign * Math.pow(2, -14) * (fraction / 1024);
+    if (exponent === 0x1f) return fraction ? NaN : sign * Infinity;
+    return sign * Math.pow(2, exponent - 15) * (1 + fraction / 1024);
+}
+
 class GestureChat {
     constructor() {
         this.socket = io();
@@ -10,6 +21,30 @@ class GestureChat {
         this.collectedWords = [];
         this.currentGesture = null;
         this.currentWord = null;
+
+        // Frames go out as raw bytes when the browser supports canvas.toBlob,
+        // falling back to base64 data URLs otherwise
+        this.useBinaryFrames = typeof HTMLCanvasElement.prototype.toBlob === 'function';
+        this.frameFormat = 'image/jpeg';
+        this.frameQuality = 0.7;
+
+        // Capture cadence and size; the server adjusts them to its load
+        this.captureInterval = 200;
+        this.captureWidth = null;
+
+        // Optional client-side hand tracker: a function taking the video element and
+        // returning (or resolving to) 21 [x, y, z] points, or null when no hand is seen.
+        // When set, only landmarks are sent to the server instead of video frames.
+        this.landmarkProvider = null;
+
+        // Set when the server recognizes a camera or video file of its own
+        this.localCapture = false;
+
+        // Landmarks come back as packed int16 with int8 deltas while the overlay
+        // is shown, and are not sent at all while it is hidden
+        this.showLandmarks = true;
+        this.landmarkScale = 8192;
+        this.previousLandmarks = null;
         
         this.initializeElements();
         this.setupEventListeners();
@@ -19,6 +54,7 @@ class GestureChat {
     initializeElements() {
         this.startCameraBtn = document.getElementById('startCamera');
         this.stopCameraBtn = document.getElementById('stopCamera');
+        this.toggleLandmarksBtn = document.getElementById('toggleLandmarks');
         this.gestureNameEl = document.getElementById('gestureName');
         this.gestureConfidenceEl = document.getElementById('gestureConfidence');
         this.wordDisplayEl = document.getElementById('wordDisplay');
@@ -44,6 +80,7 @@ class GestureChat {
     setupEventListeners() {
         this.startCameraBtn.addEventListener('click', () => this.startCamera());
         this.stopCameraBtn.addEventListener('click', () => this.stopCamera());
+        this.toggleLandmarksBtn.addEventListener('click', () => this.setOverlayVisible(!this.showLandmarks));
         this.addWordBtn.addEventListener('click', () => this.addCurrentWord());
         this.clearWordsBtn.addEventListener('click', () => this.clearWords());
         this.predictSentenceBtn.addEventListener('click', () => this.predictSentences());
@@ -69,12 +106,27 @@ class GestureChat {
     setupSocketListeners() {
         this.socket.on('connect', () => {
             this.updateConnectionStatus(true);
+            this.negotiateResultFormat();
         });
         
         this.socket.on('disconnect', () => {
             this.updateConnectionStatus(false);
         });
         
+        this.socket.on('capture_settings', (data) => {
+            this.captureInterval = data.interval_ms;
+            this.captureWidth = data.width;
+            this.frameQuality = data.quality;
+        });
+        
+        this.socket.on('local_capture', (data) => {
+            this.useLocalCapture(data);
+        });
+        
+        this.socket.on('result_format', (data) => {
+            this.landmarkScale = data.scale;
+        });
+        
         this.socket.on('gesture_result', (data) => {
             this.handleGestureResult(data);
         });
@@ -150,6 +202,27 @@ class GestureChat {
         this.clearGestureDisplay();
     }
     
+    useLocalCapture(data) {
+        // Kiosk mode: the server recognizes its own camera or video file and
+        // only sends results, so this page never opens a camera
+        this.stopCamera();
+        this.localCapture = true;
+        this.startCameraBtn.disabled = true;
+        this.addWordBtn.disabled = false;
+        this.updateCameraStatus(true);
+
+        // No video element to follow: draw landmarks over the whole video area
+        const videoRect = this.videoElement.getBoundingClientRect();
+        this.overlayCanvas.width = videoRect.width || 640;
+        this.overlayCanvas.height = videoRect.height || 480;
+        this.overlayCanvas.style.width = this.overlayCanvas.width + 'px';
+        this.overlayCanvas.style.height = this.overlayCanvas.height + 'px';
+        this.overlayCanvas.style.left = '0px';
+        this.overlayCanvas.style.top = '0px';
+
+        this.showNotification(`Recognizing server camera ${data.source}`, 'info');
+    }
+    
     startGestureRecognition() {
         if (!this.isRecording) return;
 
@@ -165,31 +238,120 @@ class GestureChat {
                 return;
             }
 
-            // Set canvas size if not already set
-            if (canvas.width !== this.videoElement.videoWidth) {
-                canvas.width = this.videoElement.videoWidth;
-                canvas.height = this.videoElement.videoHeight;
+            // Size the canvas to the video, scaled down to the requested width
+            const scale = this.captureWidth ? Math.min(1, this.captureWidth / this.videoElement.videoWidth) : 1;
+            const width = Math.round(this.videoElement.videoWidth * scale);
+            if (canvas.width !== width) {
+                canvas.width = width;
+                canvas.height = Math.round(this.videoElement.videoHeight * scale);
                 console.log(`Capture canvas size: ${canvas.width}x${canvas.height}`);
             }
 
             try {
-                ctx.drawImage(this.videoElement, 0, 0, canvas.width, canvas.height);
-                const frameData = canvas.toDataURL('image/jpeg', 0.7);
-
-                this.socket.emit('process_frame', { frame: frameData });
+                if (this.landmarkProvider) {
+                    Promise.resolve(this.landmarkProvider(this.videoElement))
+                        .then(points => this.sendLandmarks(points))
+                        .catch(error => console.error('Error tracking hand:', error));
+                } else {
+                    ctx.drawImage(this.videoElement, 0, 0, canvas.width, canvas.height);
+                    this.sendFrame(canvas);
+                }
             } catch (error) {
                 console.error('Error capturing frame:', error);
             }
 
-            setTimeout(captureFrame, 200); // Process every 200ms for better performance
+            setTimeout(captureFrame, this.captureInterval); // Interval set by the server
         };
 
         captureFrame();
     }
+
+    sendFrame(canvas) {
+        if (!this.useBinaryFrames) {
+            const frameData = canvas.toDataURL(this.frameFormat, this.frameQuality);
+            this.socket.emit('process_frame', { frame: frameData });
+            return;
+        }
+
+        canvas.toBlob((blob) => {
+            if (!blob || !this.isRecording) return;
+            blob.arrayBuffer()
+                .then(buffer => this.socket.emit('process_frame_binary', buffer))
+                .catch(error => console.error('Error encoding frame:', error));
+        }, this.frameFormat, this.frameQuality);
+    }
+    
+    sendLandmarks(points) {
+        if (!points || points.length === 0) {
+            this.handleGestureResult({ gesture: null });
+            return;
+        }
+
+        // 63 little-endian float32 values, 252 bytes per frame
+        const packed = Float32Array.from(points.flat ? points.flat() : points);
+        this.socket.emit('process_landmarks', packed.buffer);
+    }
+    
+    negotiateResultFormat() {
+        this.previousLandmarks = null;
+        const format = this.showLandmarks ? { landmarks: 'int16', delta: true } : { landmarks: 'none' };
+        this.socket.emit('set_result_format', format);
+    }
+    
+    setOverlayVisible(visible) {
+        // Hidden landmarks are not sent at all: the server switches to the 'none' format
+        this.showLandmarks = visible;
+        if (!visible) this.clearOverlay();
+        this.toggleLandmarksBtn.innerHTML = visible
+            ? '<i class="fas fa-eye-slash"></i> Hide Landmarks'
+            : '<i class="fas fa-eye"></i> Show Landmarks';
+        this.negotiateResultFormat();
+    }
+    
+    decodeLandmarks(data) {
+        if (data.landmarks_format === undefined || data.landmarks_format === 'json') {
+            return data.landmarks;
+        }
+        if (!data.landmarks) {
+            this.previousLandmarks = null;
+            return [];
+        }
+        
+        switch (data.landmarks_format) {
+            case 'int16':
+                this.previousLandmarks = new Int16Array(data.landmarks);
+                return this.toLandmarkDicts(this.previousLandmarks, 1 / this.landmarkScale);
+            case 'int8_delta': {
+                // A delta for landmarks we never saw, e.g. sent before a renegotiation
+                if (!this.previousLandmarks) return [];
+                const delta = new Int8Array(data.landmarks);
+                this.previousLandmarks = this.previousLandmarks.map((value, i) => value + delta[i]);
+                return this.toLandmarkDicts(this.previousLandmarks, 1 / this.landmarkScale);
+            }
+            case 'float16':
+                return this.toLandmarkDicts(Array.from(new Uint16Array(data.landmarks), halfToFloat), 1);
+            default:
+                return [];
+        }
+    }
+    
+    toLandmarkDicts(values, scale) {
+        // 63 values (21 points) per hand
+        const hands = [];
+        for (let start = 0; start + 62 < values.length; start += 63) {
+            const landmarks = [];
+            for (let i = start; i < start + 63; i += 3) {
+                landmarks.push({ x: values[i] * scale, y: values[i + 1] * scale, z: values[i + 2] * scale });
+            }
+            hands.push(landmarks);
+        }
+        return hands;
+    }
     
     handleGestureResult(data) {
         this.currentGesture = data.gesture;
         this.currentWord = data.word;
+        const landmarks = this.decodeLandmarks(data);
         
         if (data.gesture) {
             this.gestureNameEl.textContent = data.gesture;
@@ -197,7 +359,9 @@ class GestureChat {
             this.wordDisplayEl.textContent = data.word || 'Unknown';
             
             // Draw landmarks on overlay canvas
-            this.drawLandmarks(data.landmarks);
+            if (this.showLandmarks) {
+                this.drawLandmarks(landmarks);
+            }
         } else {
             this.gestureNameEl.textContent = 'None';
             this.gestureConfidenceEl.textContent = '';
@@ -211,7 +375,10 @@ class GestureChat {
         
         if (!landmarksArray || landmarksArray.length === 0) return;
         
-        const landmarks = landmarksArray[0]; // Use first hand
+        landmarksArray.forEach(landmarks => this.drawHand(landmarks));
+    }
+    
+    drawHand(landmarks) {
         const canvasWidth = this.overlayCanvas.width;
         const canvasHeight = this.overlayCanvas.height;
         
@@ -0,0 +1,80 @@
+import numpy as np
+
+from gesture_rules import compiled_rule_table
+from hand_landmarks import HandFeatures, NUM_LANDMARKS
+
+# Joint heights above the wrist, in hand lengths, for an extended and a
+# curled finger (MCP, PIP, DIP, tip). Curled tips sit below their PIP.
+_EXTENDED = np.array([0.40, 0.60, 0.70, 0.80])
+_CURLED = np.array([0.40, 0.55, 0.50, 0.45])
+# Knuckle x offsets of the index, middle, ring and pinky fingers
+_KNUCKLES = np.array([-0.09, -0.03, 0.03, 0.09])
+# Thumb joint distances from the wrist (CMC, MCP, IP, tip)
+_THUMB_EXTENDED = np.array([0.08, 0.16, 0.26, 0.36])
+_THUMB_CURLED = np.array([0.08, 0.16, 0.26, 0.18])
+
+
+def random_hands(rng, count):
+    """Plausible random hands as a float32 (count, 21, 3) array
+
+    Every hand gets a random finger mask, wrist position, size, lean and
+    thumb direction, and a quarter of them pinch thumb and index together,
+    so together they reach every state the gesture rules look at.
+    """
+    masks = rng.integers(0, 32, count)
+    wrist = np.stack([rng.uniform(0.05, 0.95, count), rng.uniform(0.2, 1.0, count)], axis=1)
+    size = rng.uniform(0.15, 0.35, count)
+    lean = rng.uniform(-1.0, 1.0, count)
+    thumb_angle = rng.uniform(0.0, 2.0 * np.pi, count)
+
+    points = np.zeros((count, NUM_LANDMARKS, 3))
+    points[:, 0, :2] = wrist
+
+    # Index to pinky, leaning sideways with height
+    extended = (masks[:, None] >> np.arange(1, 5)) & 1
+    heights = np.where(extended[..., None], _EXTENDED, _CURLED) * size[:, None, None]
+    finger_points = points[:, 5:21, :].reshape(count, 4, 4, 3)
+    finger_points[..., 1] = wrist[:, 1, None, None] - heights
+    finger_points[..., 0] = (wrist[:, 0, None, None] + _KNUCKLES[None, :, None] * size[:, None, None]
+                             + lean[:, None, None] * heights)
+    points[:, 5:21] = finger_points.reshape(count, 16, 3)
+
+    # Thumb along a random direction, tip pulled back when curled
+    radii = np.where((masks & 1)[:, None], _THUMB_EXTENDED, _THUMB_CURLED) * size[:, None]
+    points[:, 1:5, 0] = wrist[:, 0, None] + radii * np.cos(thumb_angle)[:, None]
+    points[:, 1:5, 1] = wrist[:, 1, None] - radii * np.sin(thumb_angle)[:, None]
+
+    pinch = rng.random(count) < 0.25
+    points[pinch, 4, :2] = points[pinch, 8, :2] + rng.uniform(-0.04, 0.04, (pinch.sum(), 2))
+
+    points[..., 2] = rng.normal(0.0, 0.02, (count, NUM_LANDMARKS))
+    points[:, :, :2] += rng.normal(0.0, 0.002, (count, NUM_LANDMARKS, 2))
+    return points.astype(np.float32)
+
+
+def noise_hands(rng, count):
+    """Uniformly random points, mostly classified as nothing or as odd gestures"""
+    return rng.random((count, NUM_LANDMARKS, 3)).astype(np.float32)
+
+
+def gesture_hands(seed=0, per_gesture=8, gesture_mappings=None, max_rounds=50):
+    """Seeded synthetic hands for every gesture the rules can produce
+
+    Returns {gesture: (per_gesture, 21, 3) array}. Gestures in the
+    mappings that no rule can produce are absent; compiled_rule_table()
+    reports them as unproducible.
+    """
+    rule_table = compiled_rule_table(gesture_mappings)
+    wanted = {gesture for gesture in rule_table.gestures if gesture}
+    rng = np.random.default_rng(seed)
+    found = {gesture: [] for gesture in wanted}
+
+    for _ in range(max_rounds):
+        hands = random_hands(rng, 4096)
+        for points, (gesture, _) in zip(hands, rule_table.classify(HandFeatures(hands))):
+            if gesture in found and len(found[gesture]) < per_gesture:
+                found[gesture].append(points)
+        if all(len(examples) >= per_gesture for examples in found.values()):
+            break
+
+    return {gesture: np.stack(examples) for gesture, examples in sorted(found.items()) if examples}
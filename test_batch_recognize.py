@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Simple test script to verify headless batch recognition and its output files
+"""
+
+import csv
+import os
+import tempfile
+
+import cv2
+import numpy as np
+from batch_recognize import main, recognize_source, write_results
+from test_hand_landmarks import open_palm
+
+
+class FakeRecognizer:
+    """Finds an open palm in every bright frame, without MediaPipe"""
+
+    def detect_landmarks(self, frame, rgb=False):
+        return open_palm() if frame.mean() > 100 else None
+
+    def recognize_gesture(self, points):
+        return ('five', 0.85) if points is not None else (None, 0.0)
+
+    def build_result(self, points, gesture, confidence):
+        return {'word': gesture}
+
+    def close(self):
+        pass
+
+
+def write_images(directory, count):
+    for i in range(count):
+        value = 200 if i % 2 else 0
+        cv2.imwrite(os.path.join(directory, f'frame{i:03d}.png'), np.full((48, 64, 3), value, dtype=np.uint8))
+
+
+def test_folder_to_csv_and_npz():
+    """Every skipped-to frame is recognized in order and written out"""
+    with tempfile.TemporaryDirectory() as directory:
+        write_images(directory, 7)
+        records, summary = recognize_source(directory, workers=3, skip=2, factory=FakeRecognizer)
+
+        assert [record.index for record in records] == [0, 2, 4, 6]
+        assert summary['frames'] == 4
+        assert summary['skipped'] == 3
+        assert summary['hands'] == 0
+        assert 'detect_p95_ms' in summary
+
+        records, _ = recognize_source(directory, workers=2, factory=FakeRecognizer)
+        csv_path = os.path.join(directory, 'out.csv')
+        npz_path = os.path.join(directory, 'out.npz')
+        write_results(records, csv_path)
+        write_results(records, npz_path)
+
+        with open(csv_path) as f:
+            rows = list(csv.DictReader(f))
+        assert rows[1]['gesture'] == 'five'
+        assert float(rows[1]['y0']) == 0.8
+        assert rows[0]['x0'] == ''
+
+        saved = np.load(npz_path)
+        assert saved['landmarks'].shape == (7, 21, 3)
+        assert np.isnan(saved['landmarks'][0]).all()
+        assert list(saved['gesture'][:2]) == ['', 'five']
+
+
+def test_video_source():
+    """Video frames carry their index and timestamp"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'clip.avi')
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), 10, (64, 48))
+        for i in range(6):
+            writer.write(np.full((48, 64, 3), 200 if i >= 3 else 0, dtype=np.uint8))
+        writer.release()
+
+        records, summary = recognize_source(path, workers=1, factory=FakeRecognizer)
+        assert [record.gesture for record in records] == [None] * 3 + ['five'] * 3
+        assert records[1].timestamp_ms > records[0].timestamp_ms
+
+
+def test_tracking_uses_one_worker_in_frame_order():
+    """Tracked video frames all reach one recognizer, in order, whatever --workers says"""
+    seen = []
+
+    class OrderRecognizer(FakeRecognizer):
+        def detect_landmarks(self, frame, rgb=False):
+            seen.append((id(self), int(round(frame.mean() / 20))))
+            return super().detect_landmarks(frame, rgb)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'clip.avi')
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), 10, (64, 48))
+        for i in range(10):
+            writer.write(np.full((48, 64, 3), i * 20, dtype=np.uint8))
+        writer.release()
+
+        records, summary = recognize_source(path, workers=4, factory=OrderRecognizer)
+        assert summary['workers'] == 1
+        assert len({recognizer for recognizer, _ in seen}) == 1
+        assert [value for _, value in seen] == list(range(10))
+
+        seen.clear()
+        records, summary = recognize_source(path, workers=4, static_image_mode=True, factory=OrderRecognizer)
+        assert summary['workers'] == 4 and len(records) == 10
+
+
+def test_cli_reports_bad_source():
+    """A missing video fails with an error code, not a traceback"""
+    with tempfile.TemporaryDirectory() as directory:
+        assert main([os.path.join(directory, 'missing.mp4'), '--workers', '1']) == 1
+
+
+if __name__ == "__main__":
+    test_folder_to_csv_and_npz()
+    test_video_source()
+    test_tracking_uses_one_worker_in_frame_order()
+    test_cli_reports_bad_source()
+    print("Batch recognition tests passed!")
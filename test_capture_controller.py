@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Simple test script to verify the adaptive capture controller
+"""
+
+from capture_controller import CaptureController, CapturePolicy, CaptureSettings, SessionLoad
+
+
+def run(controller, latency, queue_depth, seconds, start=0.0, fps=10):
+    """Feed `seconds` worth of frames and return every settings push"""
+    pushes = []
+    for i in range(int(seconds * fps)):
+        settings = controller.record('a', latency, queue_depth, now=start + i / fps)
+        if settings is not None:
+            pushes.append(settings)
+    return pushes
+
+
+def test_first_frame_announces_defaults():
+    """A new session is told the policy's initial settings once"""
+    controller = CaptureController()
+    assert controller.record('a', 0.05, now=0.0) == CaptureSettings(200, 640, 0.7)
+    assert controller.record('a', 0.05, now=0.1) is None
+
+
+def test_initial_interval_respects_bounds():
+    """The client's default interval is clamped to the configured bounds"""
+    assert CapturePolicy(min_interval_ms=300).initial().interval_ms == 300
+    assert CapturePolicy(min_interval_ms=50, max_interval_ms=150).initial().interval_ms == 150
+    assert CapturePolicy().initial().interval_ms == 200
+
+
+def test_backs_off_under_load_and_recovers():
+    """A backlog stretches the interval, then width and quality; idling undoes it"""
+    controller = CaptureController(period=1.0)
+    pushes = run(controller, 0.4, 1, seconds=12)
+    final = pushes[-1]
+    assert final.interval_ms == 1000
+    assert final.width < 640
+
+    recovered = run(controller, 0.01, 0, seconds=60, start=12.0)[-1]
+    assert recovered == CaptureSettings(100, 640, 0.7)
+    stats = controller.get_stats()
+    assert stats['backoffs'] > 0 and stats['recoveries'] > 0
+
+
+def test_custom_policy_hook():
+    """Policies only need initial() and adjust()"""
+    class FixedPolicy(CapturePolicy):
+        def adjust(self, settings, load):
+            assert isinstance(load, SessionLoad)
+            return settings._replace(interval_ms=500)
+
+    controller = CaptureController(FixedPolicy(), period=0.5)
+    pushes = run(controller, 0.05, 0, seconds=2)
+    assert [settings.interval_ms for settings in pushes] == [200, 500]
+    controller.release('a')
+    assert controller.get_stats()['sessions'] == 0
+
+
+if __name__ == "__main__":
+    test_first_frame_announces_defaults()
+    test_initial_interval_respects_bounds()
+    test_backs_off_under_load_and_recovers()
+    test_custom_policy_hook()
+    print("Capture controller tests passed!")
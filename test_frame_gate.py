@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Simple test script to verify the motion and hand-presence frame gate
+"""
+
+import cv2
+import numpy as np
+from frame_gate import FrameGate
+from frame_transport import payload_from_binary
+
+
+def jpeg(value, noise=0):
+    """A flat grey frame, optionally with a bright square whose size is `noise`"""
+    frame = np.full((240, 320, 3), value, dtype=np.uint8)
+    frame[:noise, :noise] = 255
+    return payload_from_binary(cv2.imencode('.jpg', frame)[1].tobytes())
+
+
+class FakeBackend:
+    def __init__(self, hand=True):
+        self.hand = hand
+        self.calls = 0
+
+    def process(self, sid, payload):
+        self.calls += 1
+        return {'gesture': None, 'confidence': 0.0, 'word': None, 'landmarks': [[{}]] if self.hand else []}
+
+
+def test_duplicate_and_static_frames_are_skipped():
+    """Identical bytes and near-identical images reuse the last result"""
+    gate = FrameGate(motion_threshold=2.0, max_reuse=10)
+    backend = FakeBackend()
+
+    first = gate.process('a', jpeg(100), backend.process)
+    assert gate.process('a', jpeg(100), backend.process) is first
+    assert gate.process('a', jpeg(101), backend.process) is first
+    gate.process('a', jpeg(100, noise=120), backend.process)
+
+    assert backend.calls == 2
+    stats = gate.get_stats()
+    assert stats['duplicate'] == 1
+    assert stats['static'] == 1
+    assert stats['skip_ratio'] == 0.5
+
+
+def test_reuse_is_bounded():
+    """A static scene is still processed every max_reuse + 1 frames"""
+    gate = FrameGate(max_reuse=3)
+    backend = FakeBackend()
+    for _ in range(8):
+        gate.process('a', jpeg(100), backend.process)
+    assert backend.calls == 2
+
+
+def test_no_hand_backoff_probes():
+    """After idle_after frames without a hand only every probe_every-th frame runs"""
+    gate = FrameGate(motion_threshold=0, idle_after=3, probe_every=4)
+    backend = FakeBackend(hand=False)
+    for i in range(23):
+        gate.process('a', jpeg(i * 10), backend.process)
+
+    # 3 frames to go idle, then 20 frames probed once every 4
+    assert backend.calls == 3 + 5
+    assert gate.get_stats()['no_hand'] == 15
+
+    backend.hand = True
+    for i in range(8):
+        gate.process('a', jpeg(i * 20 + 5), backend.process)
+    # Three more frames are skipped, the next probe finds the hand and the
+    # remaining four are processed again
+    assert backend.calls == 8 + 1 + 4
+
+
+if __name__ == "__main__":
+    test_duplicate_and_static_frames_are_skipped()
+    test_reuse_is_bounded()
+    test_no_hand_backoff_probes()
+    print("Frame gate tests passed!")
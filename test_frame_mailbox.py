@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Simple test script to verify latest-frame-wins backpressure
+"""
+
+import time
+from frame_mailbox import FrameMailbox
+from frame_transport import FramePayload, BINARY
+
+
+def make_payload(tag, age=0.0):
+    return FramePayload(tag, BINARY, received_at=time.monotonic() - age)
+
+
+def test_newest_frame_replaces_pending_one():
+    """Frames arriving while a session is busy collapse to the newest one"""
+    mailbox = FrameMailbox(deadline=10.0)
+
+    assert mailbox.offer('a', make_payload(b'1'))
+    drain = mailbox.drain('a')
+    assert next(drain).data == b'1'
+
+    # Two more frames arrive while frame 1 is being processed
+    assert not mailbox.offer('a', make_payload(b'2'))
+    assert not mailbox.offer('a', make_payload(b'3'))
+
+    assert [payload.data for payload in drain] == [b'3']
+    stats = mailbox.get_stats()
+    assert stats['received'] == 3
+    assert stats['dropped'] == 1
+
+    # The session is idle again, so the next frame starts a new drain
+    assert mailbox.offer('a', make_payload(b'4'))
+
+
+def test_stale_frames_are_expired():
+    """Frames older than the deadline are skipped"""
+    mailbox = FrameMailbox(deadline=0.5)
+
+    assert mailbox.offer('a', make_payload(b'old', age=1.0))
+    assert list(mailbox.drain('a')) == []
+    assert mailbox.get_stats()['expired'] == 1
+
+
+def test_failed_consumer_does_not_wedge_session():
+    """An exception while processing leaves the session drainable"""
+    mailbox = FrameMailbox(deadline=10.0)
+
+    assert mailbox.offer('a', make_payload(b'1'))
+    try:
+        for payload in mailbox.drain('a'):
+            raise RuntimeError('decode failed')
+    except RuntimeError:
+        pass
+
+    assert mailbox.offer('a', make_payload(b'2'))
+
+
+def test_sessions_are_independent():
+    """A busy session does not hold back frames of another one"""
+    mailbox = FrameMailbox(deadline=10.0)
+
+    assert mailbox.offer('a', make_payload(b'a1'))
+    assert mailbox.offer('b', make_payload(b'b1'))
+    assert mailbox.depth('a') == 1
+    mailbox.release('a')
+    assert mailbox.depth('a') == 0
+
+
+if __name__ == "__main__":
+    test_newest_frame_replaces_pending_one()
+    test_stale_frames_are_expired()
+    test_failed_consumer_does_not_wedge_session()
+    test_sessions_are_independent()
+    print("Frame mailbox tests passed!")
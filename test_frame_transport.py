@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Simple test script to verify frame payload decoding
+"""
+
+import base64
+
+import cv2
+import numpy as np
+
+import frame_transport
+from frame_transport import FrameDecoder, TransportStats, payload_from_binary, payload_from_data_url
+
+# A colour whose channels all differ, stored BGR as OpenCV writes it
+BGR = (30, 120, 220)
+RGB = BGR[::-1]
+
+
+def solid_jpeg(width=64, height=48):
+    return cv2.imencode('.jpg', np.full((height, width, 3), BGR, dtype=np.uint8))[1].tobytes()
+
+
+def assert_rgb(frame):
+    assert np.abs(frame.reshape(-1, 3).mean(axis=0) - RGB).max() < 3, frame.reshape(-1, 3).mean(axis=0)
+
+
+def test_frames_decode_to_rgb():
+    decoder = FrameDecoder()
+    jpeg = solid_jpeg()
+    assert_rgb(decoder.decode('a', payload_from_binary(jpeg)))
+    data_url = 'data:image/jpeg;base64,' + base64.b64encode(jpeg).decode()
+    assert_rgb(decoder.decode('a', payload_from_data_url({'frame': data_url})))
+
+
+def test_reduced_scale_follows_max_width():
+    payload = payload_from_binary(solid_jpeg(640, 480))
+    for max_width, widths in ((None, [640, 640]), (500, [640, 640]), (300, [640, 320]), (160, [640, 160])):
+        decoder = FrameDecoder(max_width=max_width)
+        # The first frame of a session is full size; its width picks the scale for the next
+        assert [decoder.decode('a', payload).shape[1] for _ in range(2)] == widths, max_width
+        assert_rgb(decoder.decode('a', payload))
+
+    decoder = FrameDecoder(max_width=160)
+    decoder.decode('a', payload)
+    decoder.release('a')
+    assert decoder.decode('a', payload).shape[1] == 640
+
+
+def test_bgr_fallback_without_rgb_decoding():
+    saved_flags = frame_transport._RGB_FLAGS
+    saved_rgb = getattr(cv2, 'IMREAD_COLOR_RGB', None)
+    try:
+        if saved_rgb is not None:
+            del cv2.IMREAD_COLOR_RGB
+        # Older OpenCV: the probe finds no RGB flags and decode converts
+        assert frame_transport._rgb_flags() is None
+        frame_transport._RGB_FLAGS = None
+        decoder = FrameDecoder(max_width=300)
+        payload = payload_from_binary(solid_jpeg(640, 480))
+        frames = [decoder.decode('a', payload) for _ in range(2)]
+        assert [frame.shape[1] for frame in frames] == [640, 320]
+        for frame in frames:
+            assert_rgb(frame)
+    finally:
+        if saved_rgb is not None:
+            cv2.IMREAD_COLOR_RGB = saved_rgb
+        frame_transport._RGB_FLAGS = saved_flags
+
+
+def test_undecodable_bytes_raise_value_error():
+    stats = TransportStats()
+    decoder = FrameDecoder(stats=stats)
+    for data in (b'not an image', solid_jpeg()[:20]):
+        try:
+            decoder.decode('a', payload_from_binary(data))
+            assert False, 'expected ValueError'
+        except ValueError as e:
+            assert str(e) == 'Failed to decode frame'
+    try:
+        payload_from_data_url({'frame': 'no comma'})
+        assert False, 'expected ValueError'
+    except ValueError:
+        pass
+    # The decoder still works afterwards
+    assert_rgb(decoder.decode('a', payload_from_binary(solid_jpeg())))
+
+
+if __name__ == "__main__":
+    test_frames_decode_to_rgb()
+    test_reduced_scale_follows_max_width()
+    test_bgr_fallback_without_rgb_decoding()
+    test_undecodable_bytes_raise_value_error()
+    print("Frame transport tests passed!")
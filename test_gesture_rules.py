@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Simple test script to verify the compiled gesture rule table
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+from gesture_recognition import GESTURE_MAPPINGS, GestureRecognizer
+from gesture_rules import GestureRuleTable, classify_pairs, compiled_rule_table, hand_pairs
+from hand_landmarks import HandFeatures, hand_state
+from test_hand_landmarks import open_palm
+
+
+def test_every_rule_gesture_is_mapped():
+    """Compiling against the mappings rejects rules for unknown gestures"""
+    table = compiled_rule_table(GESTURE_MAPPINGS)
+    assert all(rule.gesture in GESTURE_MAPPINGS for rule in table.rules if rule.gesture)
+
+
+def test_unreachable_rules_are_reported():
+    """Branches shadowed by earlier ones are found by the compiler"""
+    table = compiled_rule_table(GESTURE_MAPPINGS)
+    unreachable = {rule.gesture for rule in table.unreachable_rules}
+
+    # 'two' is shadowed by 'peace', the second fist branch by 'zero'
+    assert 'two' in unreachable
+    assert 'cold_shiver' in unreachable
+    assert 'thanks_bow' in table.unproducible_gestures
+    assert 'peace' not in unreachable
+
+
+def test_open_palm_position_bins():
+    """The wrist position picks between five-finger gestures"""
+    table = compiled_rule_table(GESTURE_MAPPINGS)
+
+    centred = open_palm()
+    off_centre = open_palm()
+    off_centre[:, 0] -= 0.3
+    # float32(0.6) is just above 0.6, so x < 0.6 fails and this is not 'please_pray'
+    on_edge = open_palm()
+    on_edge[:, 0] += np.float32(0.6) - on_edge[0, 0]
+    on_edge[0, 0] = np.float32(0.6)
+
+    results = table.classify(HandFeatures(np.stack([centred, off_centre, on_edge])))
+    assert results[0] == ('please_pray', 0.8)
+    assert results[1] == ('five', 0.85)
+    assert results[2] == ('five', 0.85)
+
+
+def test_single_hand_keys_match_batch():
+    """The scalar single-hand key equals the vectorized key"""
+    table = compiled_rule_table(GESTURE_MAPPINGS)
+    rng = np.random.default_rng(3)
+    hands = rng.random((2000, 21, 3)).astype(np.float32)
+    hands[0] = open_palm()
+    hands[1, 0, 0] = np.nan
+
+    features = HandFeatures(hands)
+    assert [table.hand_key(hand_state(points)) for points in hands] == table.keys(features).tolist()
+    assert [table.classify_hand(hand_state(points)) for points in hands] == table.classify(features)
+
+
+def test_orientation_keeps_point_types():
+    """Tip positions come back as the caller's own point objects"""
+    gesture_recognizer = GestureRecognizer(load_hands=False)
+    points = open_palm()
+    objects = [SimpleNamespace(x=x, y=y, z=z) for x, y, z in points.tolist()]
+    orientation = gesture_recognizer.analyze_hand_orientation(objects)
+    assert orientation['thumb_position'] is objects[4] and orientation['index_position'] is objects[8]
+    assert orientation == dict(gesture_recognizer.analyze_hand_orientation(points),
+                               thumb_position=objects[4], index_position=objects[8])
+    assert np.array_equal(gesture_recognizer.analyze_hand_orientation(points)['index_position'], points[8])
+
+
+def test_custom_rules_compile():
+    """The compiler works on any ordered rule list"""
+    rules = compiled_rule_table().rules[:1]
+    table = GestureRuleTable(rules)
+    assert table.unreachable_rules == []
+
+
+def fist():
+    """open_palm with every fingertip curled below its PIP joint"""
+    points = open_palm()
+    points[4] = (0.45, 0.76, 0)
+    points[[8, 12, 16, 20], 1] = 0.55
+    return points
+
+
+def shifted(points, dx):
+    points = points.copy()
+    points[:, 0] += dx
+    return points
+
+
+def test_two_hand_rules():
+    """Open hands together pray, fists together shiver, hands apart match nothing"""
+    hands = np.stack([
+        shifted(open_palm(), -0.05), shifted(open_palm(), 0.05),
+        shifted(open_palm(), -0.3), shifted(open_palm(), 0.3),
+        shifted(fist(), -0.05), shifted(fist(), 0.05)
+    ])
+    features = HandFeatures(hands)
+    assert features.num_extended.tolist() == [5, 5, 5, 5, 0, 0]
+
+    pairs = hand_pairs(features, [0, 2, 4], [1, 3, 5])
+    assert classify_pairs(pairs) == [('please_pray', 0.9), (None, 0.0), ('cold_shiver', 0.9)]
+
+
+def test_multi_hand_result():
+    """Every hand is classified; a two-hand gesture becomes the frame's gesture"""
+    gesture_recognizer = GestureRecognizer(load_hands=False, max_hands=2)
+    # Off centre, where a single open hand is just 'five'
+    points = np.stack([shifted(open_palm(), -0.25), shifted(open_palm(), -0.15)])
+    per_hand, two_hand = gesture_recognizer.classify_hands(points)
+    assert per_hand == [('five', 0.85), ('five', 0.85)]
+
+    result = gesture_recognizer.build_hands_result(points, [('Right', 0.9), ('Left', 0.8)], per_hand, two_hand)
+    assert (result['gesture'], result['word'], result['two_hand']) == ('please_pray', 'please', True)
+    assert len(result['landmarks']) == 2
+    assert [hand['handedness'] for hand in result['hands']] == ['Right', 'Left']
+    assert result['hands'][1]['word'] == 'five'
+
+    single = gesture_recognizer.build_hands_result(points[:1], [('Right', 0.9)],
+                                                   *gesture_recognizer.classify_hands(points[:1]))
+    assert (single['gesture'], single['two_hand']) == ('five', False)
+
+
+if __name__ == "__main__":
+    test_every_rule_gesture_is_mapped()
+    test_unreachable_rules_are_reported()
+    test_open_palm_position_bins()
+    test_single_hand_keys_match_batch()
+    test_orientation_keeps_point_types()
+    test_custom_rules_compile()
+    test_two_hand_rules()
+    test_multi_hand_result()
+    print("Gesture rule tests passed!")
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Simple test script to verify the per-session gesture stabilizer
+"""
+
+from gesture_stabilizer import GestureStabilizer
+
+
+def result(gesture, confidence=0.85):
+    return {'gesture': gesture, 'confidence': confidence, 'word': gesture, 'landmarks': []}
+
+
+def test_flicker_is_suppressed():
+    """A single-frame misclassification never reaches the client"""
+    stabilizer = GestureStabilizer(window=5, min_votes=3, keepalive=10.0)
+    sequence = ['five', 'five', 'five', 'peace', 'five', 'five']
+    emitted = [stabilizer.update('a', result(gesture), now=0.1 * i) for i, gesture in enumerate(sequence)]
+
+    # 'five' wins on its third vote; the stray 'peace' changes nothing
+    assert [r['gesture'] for r in emitted if r] == ['five']
+    assert emitted[2]['gesture'] == 'five'
+    assert stabilizer.get_stats()['changes'] == 1
+
+
+def test_change_and_keepalive():
+    """A held gesture switches after enough votes and is repeated on keepalive"""
+    stabilizer = GestureStabilizer(window=3, min_votes=2, keepalive=1.0)
+    assert stabilizer.update('a', result('one', 0.8), now=0.0) is None
+    assert stabilizer.update('a', result('one'), now=0.1)['gesture'] == 'one'
+    assert stabilizer.update('a', result('one'), now=0.2) is None
+
+    repeated = stabilizer.update('a', result('one'), now=1.2)
+    assert repeated['gesture'] == 'one'
+    # The 0.8 vote has left the three-frame window
+    assert abs(repeated['confidence'] - 0.85) < 1e-9
+
+    stats = stabilizer.get_stats()
+    assert stats['changes'] == 1
+    assert stats['keepalives'] == 1
+    assert stats['suppressed'] == 2
+
+
+def test_sessions_are_independent():
+    """Each client has its own history, dropped on release"""
+    stabilizer = GestureStabilizer(window=3, min_votes=1, keepalive=10.0)
+    assert stabilizer.update('a', result('one'), now=0.0)['gesture'] == 'one'
+    assert stabilizer.update('b', result('two'), now=0.0)['gesture'] == 'two'
+    stabilizer.release('a')
+    assert stabilizer.get_stats()['sessions'] == 1
+
+
+if __name__ == "__main__":
+    test_flicker_is_suppressed()
+    test_change_and_keepalive()
+    test_sessions_are_independent()
+    print("Gesture stabilizer tests passed!")
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Simple test script to verify the NumPy landmark container and hand features
+"""
+
+import numpy as np
+from hand_landmarks import HandFeatures, as_landmark_array, landmarks_to_dicts, validate_landmarks
+
+
+def open_palm():
+    """Upright hand with all four fingers stacked tip above PIP above MCP"""
+    points = np.zeros((21, 3), dtype=np.float32)
+    points[0] = (0.5, 0.8, 0.0)
+    points[1:5] = [(0.40, 0.75, 0), (0.35, 0.70, 0), (0.30, 0.65, 0), (0.25, 0.60, 0)]
+    for finger, x in enumerate((0.42, 0.48, 0.54, 0.60)):
+        mcp = 5 + finger * 4
+        points[mcp:mcp + 4] = [(x, 0.60, 0), (x, 0.50, 0), (x, 0.45, 0), (x, 0.40, 0)]
+    return points
+
+
+def test_conversion_round_trip():
+    """Dict landmarks convert to a float32 (21, 3) array and back"""
+    points = open_palm()
+    dicts = landmarks_to_dicts(points)
+
+    assert len(dicts) == 21
+    converted = as_landmark_array(dicts)
+    assert converted.dtype == np.float32
+    assert np.array_equal(converted, points)
+    assert as_landmark_array(points.ravel()).shape == (21, 3)
+
+
+def test_open_palm_features():
+    """All five fingers of an open palm count as extended"""
+    features = HandFeatures(open_palm())
+
+    assert features.extended.shape == (1, 5)
+    assert features.extended.all()
+    assert features.num_extended[0] == 5
+    assert features.finger_mask()[0] == 0b11111
+    assert features.fingers_up[0]
+    assert not features.tilted[0]
+    assert features.tip_distances.shape == (1, 5, 5)
+    assert np.allclose(np.diagonal(features.tip_distances[0]), 0.0)
+
+
+def test_batch_matches_single_hands():
+    """A (N, 21, 3) batch gives the same features as N single hands"""
+    rng = np.random.default_rng(7)
+    batch = rng.random((16, 21, 3)).astype(np.float32)
+    batch_features = HandFeatures(batch)
+
+    for i, points in enumerate(batch):
+        single = HandFeatures(points)
+        assert np.array_equal(single.extended[0], batch_features.extended[i])
+        assert np.array_equal(single.tip_distances[0], batch_features.tip_distances[i])
+        assert np.array_equal(single.center[0], batch_features.center[i])
+
+
+def test_tip_distances_are_computed_on_demand():
+    """One fingertip pair needs no 5x5 distance matrix, and both agree"""
+    rng = np.random.default_rng(11)
+    features = HandFeatures(rng.random((8, 21, 3)).astype(np.float32))
+    pair = features.tip_distance(0, 1)
+    assert features._tip_distances is None
+    assert np.array_equal(pair, features.tip_distances[:, 0, 1])
+    assert np.array_equal(features.tip_distance(3, 1), features.tip_distances[:, 3, 1])
+
+
+def test_bad_shape_is_rejected():
+    """Anything that is not 21 points of x/y/z raises ValueError"""
+    try:
+        as_landmark_array(np.zeros((20, 3)))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('expected ValueError')
+
+
+def expect_invalid(landmarks):
+    try:
+        validate_landmarks(landmarks)
+    except ValueError as e:
+        return str(e)
+    raise AssertionError(f'expected ValueError for {landmarks!r}')
+
+
+def test_client_landmarks_are_validated():
+    """Client landmarks must be 21 finite, in-range x/y/z points"""
+    hand = open_palm()
+    for accepted in (hand, hand.ravel().tolist(), hand.tolist(), hand.astype('<f4').tobytes(),
+                     {'landmarks': hand.tolist()}):
+        assert np.array_equal(validate_landmarks(accepted), hand)
+
+    # Wrong point count, wrong dimensionality, ragged lists, wrong byte count
+    expect_invalid(hand[:20].tolist())
+    expect_invalid(hand.reshape(7, 9).tolist())
+    expect_invalid(hand.reshape(3, 7, 3).tolist())
+    expect_invalid(hand.tolist()[:-1] + [[0.5, 0.5]])
+    expect_invalid(hand[:20].astype('<f4').tobytes())
+    expect_invalid([['a', 'b', 'c']] * 21)
+    expect_invalid(None)
+    expect_invalid({})
+
+    for value in (np.nan, np.inf, -np.inf):
+        bad = hand.copy()
+        bad[3, 1] = value
+        assert expect_invalid(bad.tolist()) == 'Landmarks must be finite'
+    far = hand.copy()
+    far[0, 0] = 1e6
+    assert 'within' in expect_invalid(far.astype('<f4').tobytes())
+
+
+if __name__ == "__main__":
+    test_conversion_round_trip()
+    test_open_palm_features()
+    test_batch_matches_single_hands()
+    test_tip_distances_are_computed_on_demand()
+    test_bad_shape_is_rejected()
+    test_client_landmarks_are_validated()
+    print("Hand landmark tests passed!")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Simple test script to verify hand region-of-interest cropping
+"""
+
+import numpy as np
+from hand_roi import HandRoi
+from test_hand_landmarks import open_palm
+
+
+def small_hand():
+    """Open palm shrunk around its wrist to a hand far from the camera"""
+    points = open_palm()
+    points[:, :2] = points[0, :2] + (points[:, :2] - points[0, :2]) * 0.3
+    return points
+
+
+def test_box_follows_hand():
+    """The ROI is a padded square around the landmarks, inside the frame"""
+    roi = HandRoi(size=128, padding=0.5)
+    shape = (1080, 1920, 3)
+    roi.update(small_hand(), shape)
+
+    x0, y0, side = roi.box
+    xs = small_hand()[:, 0] * shape[1]
+    ys = small_hand()[:, 1] * shape[0]
+    assert x0 <= xs.min() and xs.max() <= x0 + side
+    assert y0 <= ys.min() and ys.max() <= y0 + side
+    assert y0 + side <= shape[0]
+
+    crop = roi.crop(np.zeros(shape, dtype=np.uint8))
+    assert crop.shape == (128, 128, 3)
+
+
+def test_landmarks_map_back_to_frame():
+    """Landmarks normalized to the crop land where the hand is in the frame"""
+    roi = HandRoi()
+    shape = (720, 1280, 3)
+    roi.update(small_hand(), shape)
+    x0, y0, side = roi.box
+
+    hand = small_hand().astype(np.float64)
+    in_crop = hand.copy()
+    in_crop[:, 0] = (hand[:, 0] * shape[1] - x0) / side
+    in_crop[:, 1] = (hand[:, 1] * shape[0] - y0) / side
+
+    mapped = roi.to_frame(in_crop.astype(np.float32), shape)
+    assert np.allclose(mapped[:, :2], hand[:, :2], atol=1e-5)
+
+
+def test_tracking_lost_and_large_hands():
+    """No hand or a hand filling the frame falls back to full-frame detection"""
+    roi = HandRoi()
+    roi.update(small_hand(), (480, 640, 3))
+    assert roi.tracking
+    roi.update(None, (480, 640, 3))
+    assert not roi.tracking
+
+    # The open palm spans 0.4 of the frame height, so its padded box fills the view
+    roi.update(open_palm(), (480, 640, 3))
+    assert not roi.tracking
+
+
+if __name__ == "__main__":
+    test_box_follows_hand()
+    test_landmarks_map_back_to_frame()
+    test_tracking_lost_and_large_hands()
+    print("Hand ROI tests passed!")
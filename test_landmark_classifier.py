@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Simple test script to verify the learned landmark classifier
+"""
+
+import os
+import tempfile
+
+import numpy as np
+
+from gesture_recognition import GestureRecognizer
+from landmark_classifier import NUM_FEATURES, LandmarkClassifier, landmark_features, load_labelled, main
+from test_gesture_rules import fist
+from test_hand_landmarks import open_palm
+
+
+def labelled_hands(count=20, seed=0):
+    """Jittered open palms labelled 'five' and fists labelled 'zero'"""
+    rng = np.random.default_rng(seed)
+    palms = open_palm()[None] + rng.normal(0.0, 0.005, (count, 21, 3)).astype(np.float32)
+    fists = fist()[None] + rng.normal(0.0, 0.005, (count, 21, 3)).astype(np.float32)
+    return np.concatenate([palms, fists]), ['five'] * count + ['zero'] * count
+
+
+def test_features_ignore_hand_size_but_keep_position():
+    hand = open_palm()
+    wrist = hand[0].copy()
+    # The same hand at twice the size around its wrist
+    bigger = wrist + (hand - wrist) * 2.0
+    features = landmark_features(np.stack([hand, bigger]))
+    assert features.shape == (2, NUM_FEATURES) and features.dtype == np.float32
+    assert np.allclose(features[0], features[1], atol=1e-5)
+
+    moved = hand.copy()
+    moved[:, 0] += 0.2
+    assert np.allclose(landmark_features(moved)[0, :-2], features[0, :-2], atol=1e-5)
+    assert not np.allclose(landmark_features(moved)[0, -2:], features[0, -2:])
+
+
+def test_both_methods_separate_simple_gestures():
+    points, labels = labelled_hands()
+    test_points, test_labels = labelled_hands(seed=1)
+    for method in ('centroid', 'linear'):
+        classifier = LandmarkClassifier.train(points, labels, method)
+        predicted = classifier.classify(test_points)
+        assert [gesture for gesture, _ in predicted] == test_labels, method
+        assert all(0.5 < confidence <= 1.0 for _, confidence in predicted)
+
+
+def test_batch_matches_single_hands():
+    points, labels = labelled_hands()
+    classifier = LandmarkClassifier.train(points, labels)
+    batch = classifier.classify(points)
+    assert batch == [classifier.classify(hand)[0] for hand in points]
+
+
+def test_no_gesture_label_and_min_confidence():
+    points, labels = labelled_hands()
+    labels = [None if label == 'zero' else label for label in labels]
+    classifier = LandmarkClassifier.train(points, labels)
+    assert classifier.classify(fist())[0] == (None, 0.0)
+    assert classifier.classify(open_palm())[0][0] == 'five'
+
+    classifier.min_confidence = 1.1
+    assert classifier.classify(open_palm())[0] == (None, 0.0)
+
+
+def test_save_load_and_labelled_files():
+    points, labels = labelled_hands()
+    with tempfile.TemporaryDirectory() as directory:
+        np.save(os.path.join(directory, 'five.npy'), points[:20])
+        np.savez(os.path.join(directory, 'more.npz'), points=points[20:], labels=np.array(labels[20:]))
+        np.save(os.path.join(directory, 'none.npy'), points[:1] + 0.3)
+
+        loaded, loaded_labels = load_labelled([os.path.join(directory, name)
+                                               for name in ('five.npy', 'more.npz', 'none.npy')])
+        assert loaded.shape == (41, 21, 3)
+        assert loaded_labels == labels + [None]
+
+        model = os.path.join(directory, 'model.npz')
+        assert main(['train', os.path.join(directory, 'five.npy'), os.path.join(directory, 'more.npz'),
+                     '-o', model, '--method', 'linear']) == 0
+        classifier = LandmarkClassifier.load(model)
+        assert classifier.method == 'linear'
+        assert classifier.weights.dtype == np.float32
+        assert classifier.classify(points[25])[0][0] == 'zero'
+        assert main(['evaluate', model, os.path.join(directory, 'missing.npy')]) == 1
+
+
+def test_recognizer_uses_classifier():
+    points, labels = labelled_hands()
+    # Swapped labels, so the result can only come from the classifier
+    swapped = ['zero' if label == 'five' else 'five' for label in labels]
+    gesture_recognizer = GestureRecognizer(load_hands=False, classifier=LandmarkClassifier.train(points, swapped))
+    assert gesture_recognizer.recognize_gesture(open_palm())[0] == 'zero'
+    result = gesture_recognizer.process_landmarks(fist())
+    assert result['gesture'] == 'five' and result['word'] == 'five'
+
+
+if __name__ == "__main__":
+    test_features_ignore_hand_size_but_keep_position()
+    test_both_methods_separate_simple_gestures()
+    test_batch_matches_single_hands()
+    test_no_gesture_label_and_min_confidence()
+    test_save_load_and_labelled_files()
+    test_recognizer_uses_classifier()
+    print("Landmark classifier tests passed!")
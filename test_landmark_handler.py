@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Simple test script to verify gesture results for client-computed landmarks
+"""
+
+import app
+from gesture_recognition import GestureRecognizer
+from test_gesture_rules import fist
+from test_hand_landmarks import open_palm
+
+
+def test_process_landmarks_classifies_valid_hands():
+    gesture_recognizer = GestureRecognizer(load_hands=False)
+    for hand in (open_palm(), fist()):
+        result = gesture_recognizer.process_landmarks(hand.tolist())
+        assert (result['gesture'], result['confidence']) == gesture_recognizer.recognize_gesture(hand)
+        assert len(result['landmarks']) == 1 and len(result['landmarks'][0]) == 21
+
+    try:
+        gesture_recognizer.process_landmarks([[0.5, 0.5, 0.0]] * 20)
+        assert False, 'expected ValueError'
+    except ValueError:
+        pass
+
+
+def test_socket_handler_answers_errors_and_results():
+    client = app.socketio.test_client(app.app)
+    try:
+        for bad in (b'123', [[0.5, 0.5, 0.0]] * 20, [[float('nan'), 0.5, 0.0]] * 21, None):
+            client.emit('process_landmarks', bad)
+            received = client.get_received()
+            assert [message['name'] for message in received] == ['error']
+            assert received[0]['args'][0]['message']
+
+        # A gesture is emitted once it is stable over several frames
+        packed = open_palm().astype('<f4').tobytes()
+        results = []
+        for _ in range(app.app.config['STABLE_MIN_VOTES']):
+            client.emit('process_landmarks', packed)
+            results += [message['args'][0] for message in client.get_received()
+                        if message['name'] == 'gesture_result']
+        assert len(results) == 1
+        assert results[0]['gesture'] == app.get_landmark_recognizer().recognize_gesture(open_palm())[0]
+        assert len(results[0]['landmarks'][0]) == 21
+    finally:
+        client.disconnect()
+
+
+if __name__ == "__main__":
+    test_process_landmarks_classifies_valid_hands()
+    test_socket_handler_answers_errors_and_results()
+    print("Landmark handler tests passed!")
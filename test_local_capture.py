@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Simple test script to verify the server-local capture source
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from local_capture import LocalCapture, parse_source
+
+
+def write_clip(directory, frames=5):
+    """A short MJPG clip whose frames are filled with their own index * 40"""
+    path = os.path.join(directory, 'clip.avi')
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), 50, (64, 48))
+    for i in range(frames):
+        writer.write(np.full((48, 64, 3), i * 40, dtype=np.uint8))
+    writer.release()
+    return path
+
+
+def frame_index(frame):
+    return int(round(frame.mean() / 40))
+
+
+def test_parse_source():
+    assert parse_source('0') == 0
+    assert parse_source(2) == 2
+    assert parse_source('clip.avi') == 'clip.avi'
+
+
+def test_file_plays_once_without_loop():
+    with tempfile.TemporaryDirectory() as directory:
+        seen = []
+        capture = LocalCapture(write_clip(directory), lambda frame: frame_index(frame), seen.append,
+                               loop=False, fps=20)
+        capture.start()
+        capture.wait(5.0)
+
+        stats = capture.get_stats()
+        assert seen == [0, 1, 2, 3, 4]
+        assert stats['grabbed'] == 5 and stats['processed'] == 5
+        assert stats['loops'] == 0 and not stats['running']
+
+
+def test_looping_file_starts_over():
+    with tempfile.TemporaryDirectory() as directory:
+        seen = []
+        capture = LocalCapture(write_clip(directory), lambda frame: frame_index(frame), seen.append, fps=200)
+        capture.start()
+        deadline = time.monotonic() + 5.0
+        while capture.get_stats()['loops'] < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        capture.stop()
+
+        stats = capture.get_stats()
+        assert stats['loops'] >= 2
+        assert stats['grabbed'] > 5
+        assert seen.count(0) >= 2
+
+
+def test_slow_recognizer_sees_only_the_newest_frame():
+    with tempfile.TemporaryDirectory() as directory:
+        seen = []
+        first = threading.Event()
+        release = threading.Event()
+
+        def slow(frame):
+            # Hold the first frame until the grab thread has read the rest
+            if not first.is_set():
+                first.set()
+                release.wait(5.0)
+            return frame_index(frame)
+
+        capture = LocalCapture(write_clip(directory), slow, seen.append, loop=False, fps=1000)
+        capture.start()
+        first.wait(5.0)
+        deadline = time.monotonic() + 5.0
+        while capture.get_stats()['grabbed'] < 5 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        release.set()
+        capture.wait(5.0)
+
+        stats = capture.get_stats()
+        assert seen == [0, 4]
+        assert stats['dropped'] == 3
+
+
+def test_errors_are_counted_and_skipped():
+    with tempfile.TemporaryDirectory() as directory:
+        seen = []
+
+        def flaky(frame):
+            index = frame_index(frame)
+            if index == 2:
+                raise RuntimeError('bad frame')
+            return index
+
+        capture = LocalCapture(write_clip(directory), flaky, seen.append, loop=False, fps=20)
+        capture.start()
+        capture.wait(5.0)
+        assert seen == [0, 1, 3, 4]
+        assert capture.get_stats()['errors'] == 1
+
+
+def test_missing_source_fails_to_start():
+    with tempfile.TemporaryDirectory() as directory:
+        capture = LocalCapture(os.path.join(directory, 'missing.avi'), lambda frame: None)
+        try:
+            capture.start()
+            assert False, 'expected ValueError'
+        except ValueError:
+            pass
+        assert not capture.running
+
+
+if __name__ == "__main__":
+    test_parse_source()
+    test_file_plays_once_without_loop()
+    test_looping_file_starts_over()
+    test_slow_recognizer_sees_only_the_newest_frame()
+    test_errors_are_counted_and_skipped()
+    test_missing_source_fails_to_start()
+    print("Local capture tests passed!")
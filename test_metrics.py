@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Simple test script to verify the pipeline latency histograms and metrics output
+"""
+
+from metrics import Histogram, PipelineMetrics, RateMeter
+
+
+def test_histogram_buckets_are_cumulative():
+    """Values land in the first bucket whose bound is not below them"""
+    histogram = Histogram(buckets=(0.001, 0.01))
+    for seconds in (0.0005, 0.001, 0.005, 0.5):
+        histogram.observe(seconds)
+    counts, total = histogram.snapshot()
+    assert counts == [2, 3, 4]
+    assert abs(total - 0.5065) < 1e-12
+
+
+def test_rate_meter_skips_the_current_second():
+    meter = RateMeter(window=5)
+    for second in range(100, 105):
+        for _ in range(second - 99):
+            meter.mark(now=second + 0.5)
+    # Seconds 101-104 are complete: 2 + 3 + 4 + 5 frames over 4 s
+    assert meter.rate(now=105.2) == 14 / 4
+    assert meter.rate(now=200.0) == 0.0
+
+
+def test_prometheus_text():
+    metrics = PipelineMetrics(stages=('imdecode',), buckets=(0.001,))
+    metrics.observe('imdecode', 0.0002)
+    metrics.observe('imdecode', 0.003)
+    metrics.add_counter('frames_dropped', 'Dropped frames', lambda: 7)
+    metrics.add_gauge('active_sessions', 'Sessions', lambda: 2)
+
+    lines = metrics.render().splitlines()
+    assert '# TYPE gesture_stage_seconds histogram' in lines
+    assert 'gesture_stage_seconds_bucket{stage="imdecode",le="0.001"} 1' in lines
+    assert 'gesture_stage_seconds_bucket{stage="imdecode",le="+Inf"} 2' in lines
+    assert 'gesture_stage_seconds_count{stage="imdecode"} 2' in lines
+    assert 'gesture_frames_dropped_total 7' in lines
+    assert '# TYPE gesture_active_sessions gauge' in lines
+    assert 'gesture_active_sessions 2' in lines
+    assert metrics.get_stats()['imdecode']['count'] == 2
+
+
+if __name__ == "__main__":
+    test_histogram_buckets_are_cumulative()
+    test_rate_meter_skips_the_current_second()
+    test_prometheus_text()
+    print("Metrics tests passed!")
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Simple test script to verify micro-batched inference across sessions
+"""
+
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from frame_transport import payload_from_binary
+from gesture_recognition import GestureRecognizer
+from inference_backends import MicroBatchBackend
+from recognizer_pool import RecognizerPool
+from test_gesture_rules import fist
+from test_hand_landmarks import open_palm
+
+
+class FrameHands(GestureRecognizer):
+    """Reads the hand off the frame's brightness instead of running MediaPipe
+
+    Bright frames show an open palm, grey ones a fist, dark ones no hand,
+    and mid-grey frames make detection fail.
+    """
+
+    delay = 0.0
+
+    def __init__(self):
+        super().__init__(load_hands=False)
+
+    def detect_landmarks(self, frame, rgb=False):
+        time.sleep(self.delay)
+        value = frame.mean()
+        if value > 180:
+            return open_palm()
+        if 130 < value < 170:
+            raise RuntimeError('detector failed')
+        if value > 80:
+            return fist()
+        return None
+
+
+def solid_payload(value):
+    return payload_from_binary(cv2.imencode('.jpg', np.full((48, 64, 3), value, dtype=np.uint8))[1].tobytes())
+
+
+def expected_gesture(points):
+    return FrameHands().recognize_gesture(points)[0]
+
+
+def test_batch_results_reach_their_own_future():
+    backend = MicroBatchBackend(RecognizerPool(FrameHands, max_size=8, spares=0), max_batch=8, window=0.05)
+    try:
+        futures = [(sid, backend.submit(sid, solid_payload(value)))
+                   for sid, value in [('palm', 220), ('fist', 100), ('empty', 0), ('palm-2', 220), ('fist-2', 100)]]
+        results = {sid: future.result(timeout=5.0) for sid, future in futures}
+
+        assert results['palm']['gesture'] == results['palm-2']['gesture'] == expected_gesture(open_palm())
+        assert results['fist']['gesture'] == results['fist-2']['gesture'] == expected_gesture(fist())
+        assert results['palm']['gesture'] != results['fist']['gesture']
+        assert results['empty']['gesture'] is None and results['empty']['landmarks'] == []
+        # All five frames arrived within one window
+        assert backend.get_stats()['mean_batch_size'] == 5.0
+    finally:
+        backend.close()
+
+
+def test_failing_frame_only_fails_itself():
+    backend = MicroBatchBackend(RecognizerPool(FrameHands, max_size=8, spares=0), max_batch=8, window=0.05)
+    try:
+        good = backend.submit('palm', solid_payload(220))
+        bad = backend.submit('broken', solid_payload(150))
+        other = backend.submit('fist', solid_payload(100))
+        try:
+            bad.result(timeout=5.0)
+            assert False, 'expected RuntimeError'
+        except RuntimeError as e:
+            assert str(e) == 'detector failed'
+        assert good.result(timeout=5.0)['gesture'] == expected_gesture(open_palm())
+        assert other.result(timeout=5.0)['gesture'] == expected_gesture(fist())
+    finally:
+        backend.close()
+
+
+def test_classification_error_fails_its_batch_only():
+    class FlakyHands(FrameHands):
+        failures = 1
+
+        def classify_features(self, features):
+            if FlakyHands.failures:
+                FlakyHands.failures -= 1
+                raise RuntimeError('classifier failed')
+            return super().classify_features(features)
+
+    backend = MicroBatchBackend(RecognizerPool(FlakyHands, max_size=8, spares=0), max_batch=8, window=0.05)
+    try:
+        failed = [backend.submit(sid, solid_payload(220)) for sid in ('palm', 'palm-2')]
+        for future in failed:
+            try:
+                future.result(timeout=5.0)
+                assert False, 'expected RuntimeError'
+            except RuntimeError as e:
+                assert str(e) == 'classifier failed'
+
+        # The collector survived and serves the next batch
+        assert backend.submit('palm', solid_payload(220)).result(timeout=5.0)['gesture'] == \
+            expected_gesture(open_palm())
+        assert backend.get_stats()['batches'] == 2
+    finally:
+        backend.close()
+
+
+def test_close_drains_pending_frames():
+    class SlowHands(FrameHands):
+        delay = 0.02
+
+    backend = MicroBatchBackend(RecognizerPool(SlowHands, max_size=8, spares=0), max_batch=2, window=0.001,
+                                threads=2)
+    futures = []
+
+    def client(sid):
+        for _ in range(5):
+            futures.append(backend.submit(sid, solid_payload(220)))
+
+    threads = [threading.Thread(target=client, args=(f'client-{i}',)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    backend.close()
+
+    assert len(futures) == 20
+    assert all(future.done() for future in futures)
+    assert all(future.result()['gesture'] == expected_gesture(open_palm()) for future in futures)
+
+
+if __name__ == "__main__":
+    test_batch_results_reach_their_own_future()
+    test_failing_frame_only_fails_itself()
+    test_classification_error_fails_its_batch_only()
+    test_close_drains_pending_frames()
+    print("Micro-batch backend tests passed!")
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Simple test script to verify the sentence prediction cache
+"""
+
+import threading
+import time
+
+from prediction_cache import PredictionCache
+from word_predictor import WordPredictor
+
+
+class CountingPredictor(WordPredictor):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def predict_sentences(self, words):
+        self.calls += 1
+        return super().predict_sentences(words)
+
+
+def test_hits_are_keyed_on_lowercased_words():
+    predictor = CountingPredictor()
+    cache = PredictionCache(predictor)
+    first = cache.predict_sentences(['Hello', 'YOU'])
+    assert cache.predict_sentences(['hello', 'you']) == first
+    assert first == WordPredictor().predict_sentences(['Hello', 'YOU'])
+    # Word order matters to the predictor, so it is part of the key
+    cache.predict_sentences(['you', 'hello'])
+    assert predictor.calls == 2
+
+    # Callers get their own list
+    cache.predict_sentences(['hello', 'you']).append('changed')
+    assert cache.predict_sentences(['hello', 'you']) == first
+
+    stats = cache.get_stats()
+    assert stats['hits'] == 3 and stats['misses'] == 2
+    assert stats['size'] == 2 and stats['hit_rate'] == 0.6
+
+
+def test_least_recently_used_is_evicted():
+    predictor = CountingPredictor()
+    cache = PredictionCache(predictor, max_size=2)
+    cache.predict_sentences(['hello'])
+    cache.predict_sentences(['help'])
+    cache.predict_sentences(['hello'])
+    cache.predict_sentences(['water'])
+    assert cache.get_stats()['evicted'] == 1
+
+    calls = predictor.calls
+    cache.predict_sentences(['hello'])
+    assert predictor.calls == calls
+    cache.predict_sentences(['help'])
+    assert predictor.calls == calls + 1
+
+
+def test_entries_expire_after_ttl():
+    predictor = CountingPredictor()
+    cache = PredictionCache(predictor, ttl=0.05)
+    cache.predict_sentences(['hello'])
+    cache.predict_sentences(['hello'])
+    time.sleep(0.1)
+    cache.predict_sentences(['hello'])
+    stats = cache.get_stats()
+    assert predictor.calls == 2
+    assert stats['expired'] == 1 and stats['hits'] == 1
+
+
+def test_template_changes_invalidate():
+    predictor = WordPredictor()
+    cache = PredictionCache(predictor)
+    before = cache.predict_sentences(['water'])
+    predictor.set_templates('basic_needs', ['I am thirsty', 'Water please', 'I need a drink'])
+    after = cache.predict_sentences(['water'])
+    assert after != before
+    assert after == predictor.predict_sentences(['water'])
+    assert cache.get_stats()['invalidated'] == 1
+
+
+def test_disabled_and_concurrent_use():
+    predictor = CountingPredictor()
+    cache = PredictionCache(predictor, max_size=0)
+    cache.predict_sentences(['hello'])
+    cache.predict_sentences(['hello'])
+    assert predictor.calls == 2 and cache.get_stats()['size'] == 0
+
+    cache = PredictionCache(WordPredictor(), max_size=4)
+    lists = [['hello'], ['help', 'you'], ['one', 'good'], ['sad'], ['water', 'please'], ['love', 'you']]
+    expected = [WordPredictor().predict_sentences(words) for words in lists]
+    errors = []
+
+    def worker(offset):
+        for i in range(300):
+            index = (i + offset) % len(lists)
+            if cache.predict_sentences(lists[index]) != expected[index]:
+                errors.append(lists[index])
+
+    threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = cache.get_stats()
+    assert not errors
+    assert stats['hits'] + stats['misses'] == 1200
+    assert stats['size'] <= 4
+
+
+if __name__ == "__main__":
+    test_hits_are_keyed_on_lowercased_words()
+    test_least_recently_used_is_evicted()
+    test_entries_expire_after_ttl()
+    test_template_changes_invalidate()
+    test_disabled_and_concurrent_use()
+    print("Prediction cache tests passed!")
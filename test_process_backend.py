@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Simple test script to verify the worker process inference backend
+"""
+
+import os
+import queue
+import signal
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeout
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+from frame_transport import payload_from_binary
+from inference_backends import ProcessPoolBackend, _worker_main
+
+
+def solid_payload(value, shape=(48, 64, 3)):
+    return payload_from_binary(cv2.imencode('.jpg', np.full(shape, value, dtype=np.uint8))[1].tobytes())
+
+
+def echo_worker(worker_id, slot_names, requests, results, threads, sessions, roi_size=None, max_hands=1,
+                classifier=None):
+    """Worker loop that answers with the frame's brightness instead of running MediaPipe"""
+    slots = [shared_memory.SharedMemory(name=name) for name in slot_names]
+    while True:
+        message = requests.get()
+        if message is None:
+            break
+        if message[0] == 'release':
+            continue
+        _, request_id, sid, slot, shape = message
+        frame = np.ndarray(shape, dtype=np.uint8, buffer=slots[slot].buf)
+        if sid.startswith('fail'):
+            results.put((request_id, slot, None, f'cannot recognize {sid}'))
+        else:
+            results.put((request_id, slot, {'sid': sid, 'value': int(round(frame.mean())), 'worker': worker_id},
+                         None))
+        del frame
+    for shm in slots:
+        shm.close()
+
+
+def echo_backend(**kwargs):
+    options = dict(workers=1, slots=2, max_frame_shape=(48, 64, 3), worker_main=echo_worker)
+    options.update(kwargs)
+    return ProcessPoolBackend(**options)
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_results_reach_their_own_future():
+    backend = echo_backend(workers=2, slots=4)
+    try:
+        sids = [f'client-{i}' for i in range(6)]
+        futures = [(sid, value, backend.submit(sid, solid_payload(value)))
+                   for value, sid in zip(range(20, 260, 40), sids) for _ in range(2)]
+        for sid, value, future in futures:
+            result = future.result(timeout=10.0)
+            assert result['sid'] == sid
+            assert abs(result['value'] - value) <= 2
+            assert result['worker'] == backend._worker_for(sid)
+
+        stats = backend.get_stats()
+        assert stats['frames'] == 12 and stats['pending'] == 0
+        assert stats['free_slots'] == 4
+    finally:
+        backend.close()
+
+
+def test_errors_and_oversize_frames():
+    backend = echo_backend()
+    try:
+        try:
+            backend.process('fail-1', solid_payload(10))
+            assert False, 'expected RuntimeError'
+        except RuntimeError as e:
+            assert str(e) == 'cannot recognize fail-1'
+
+        try:
+            backend.submit('big', solid_payload(10, shape=(96, 128, 3)))
+            assert False, 'expected ValueError'
+        except ValueError:
+            pass
+
+        assert backend.process('ok', solid_payload(100))['sid'] == 'ok'
+        stats = backend.get_stats()
+        assert stats['errors'] == 1 and stats['frames'] == 1
+        assert stats['free_slots'] == 2
+    finally:
+        backend.close()
+
+
+def test_timeouts_when_worker_stalls():
+    backend = echo_backend(slots=1, timeout=0.2)
+    try:
+        backend.start()
+        worker = backend._processes[0]
+        os.kill(worker.pid, signal.SIGSTOP)
+        try:
+            first = backend.submit('a', solid_payload(50))
+            try:
+                backend.submit('a', solid_payload(60))
+                assert False, 'expected TimeoutError'
+            except TimeoutError:
+                pass
+            try:
+                first.result(timeout=0.2)
+                assert False, 'expected a timeout'
+            except FutureTimeout:
+                pass
+        finally:
+            os.kill(worker.pid, signal.SIGCONT)
+
+        assert first.result(timeout=5.0)['sid'] == 'a'
+        assert wait_for(lambda: backend.get_stats()['free_slots'] == 1)
+        stats = backend.get_stats()
+        assert stats['timeouts'] == 1 and stats['slot_waits'] == 1
+    finally:
+        backend.close()
+
+
+def test_dead_worker_is_replaced():
+    backend = echo_backend(watch_interval=0.05)
+    try:
+        backend.start()
+        worker = backend._processes[0]
+        # Stopped first, so the frame is still pending when the worker dies
+        os.kill(worker.pid, signal.SIGSTOP)
+        future = backend.submit('a', solid_payload(50))
+        worker.kill()
+        try:
+            future.result(timeout=5.0)
+            assert False, 'expected RuntimeError'
+        except RuntimeError as e:
+            assert 'died' in str(e)
+
+        assert wait_for(lambda: backend.get_stats()['free_slots'] == 2)
+        # The session's frames go to the replacement worker
+        assert backend.process('a', solid_payload(80))['sid'] == 'a'
+        stats = backend.get_stats()
+        assert stats['worker_restarts'] == 1
+        assert stats['alive_workers'] == 1 and stats['pending'] == 0
+    finally:
+        backend.close()
+
+
+def test_real_worker_passes_errors_back():
+    # An invalid recognizer configuration fails in the worker on every frame
+    backend = ProcessPoolBackend(workers=1, slots=1, max_frame_shape=(48, 64, 3), roi_size=64, max_hands=2)
+    try:
+        try:
+            backend.submit('a', solid_payload(10)).result(timeout=30.0)
+            assert False, 'expected RuntimeError'
+        except RuntimeError as e:
+            assert 'max_hands=1' in str(e)
+        assert backend.get_stats()['free_slots'] == 1
+    finally:
+        backend.close()
+
+
+def test_worker_main_answers_in_process():
+    # The real worker loop on a thread, with recognizers built without a Hands graph
+    shape = (48, 64, 3)
+    slot = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)))
+    requests, results = queue.Queue(), queue.Queue()
+    saved_threads = cv2.getNumThreads()
+    try:
+        np.ndarray(shape, dtype=np.uint8, buffer=slot.buf)[:] = 0
+        requests.put(('release', 'unknown'))
+        requests.put(('frame', 7, 'a', 0, shape))
+        requests.put(('release', 'a'))
+        requests.put(None)
+        worker = threading.Thread(target=_worker_main, args=(0, [slot.name], requests, results, 1, 2),
+                                  kwargs={'load_hands': False})
+        worker.start()
+        worker.join(timeout=60.0)
+        assert not worker.is_alive()
+
+        request_id, slot_index, result, error = results.get_nowait()
+        assert (request_id, slot_index, error) == (7, 0, None)
+        assert result['gesture'] is None and result['landmarks'] == []
+        assert results.empty()
+    finally:
+        cv2.setNumThreads(saved_threads)
+        slot.close()
+        slot.unlink()
+
+
+if __name__ == "__main__":
+    test_results_reach_their_own_future()
+    test_errors_and_oversize_frames()
+    test_timeouts_when_worker_stalls()
+    test_dead_worker_is_replaced()
+    test_real_worker_passes_errors_back()
+    test_worker_main_answers_in_process()
+    print("Process backend tests passed!")
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Simple test script to verify per-session recognizer pooling
+"""
+
+import threading
+import time
+from recognizer_pool import RecognizerPool, PoolExhausted
+
+
+class FakeRecognizer:
+    """Stand-in for GestureRecognizer that records lifecycle calls"""
+
+    def __init__(self):
+        self.resets = 0
+        self.closed = False
+
+    def reset(self):
+        self.resets += 1
+
+    def close(self):
+        self.closed = True
+
+
+def test_sessions_get_their_own_recognizer():
+    """Each session id is bound to a distinct, stable recognizer"""
+    pool = RecognizerPool(FakeRecognizer, max_size=4, spares=0)
+
+    with pool.session('a') as first:
+        pass
+    with pool.session('b') as second:
+        pass
+    with pool.session('a') as again:
+        pass
+
+    assert first is not second
+    assert first is again
+    assert pool.get_stats()['active'] == 2
+
+
+def test_released_recognizer_becomes_spare():
+    """Disconnecting resets the recognizer and keeps it warm for the next client"""
+    pool = RecognizerPool(FakeRecognizer, max_size=4, spares=1)
+    pool.prewarm()
+    assert pool.get_stats()['spare'] == 1
+
+    with pool.session('a') as recognizer:
+        pass
+    pool.release('a')
+
+    with pool.session('b'):
+        pass
+
+    # Whether it was kept or closed depends on the background refill, but it
+    # must never reach another client with stale tracking state
+    assert recognizer.resets == 1
+    assert pool.get_stats()['reused'] == 2
+
+
+def test_lru_session_is_evicted_when_full():
+    """A new session evicts the least recently used idle one"""
+    pool = RecognizerPool(FakeRecognizer, max_size=2, spares=0)
+
+    with pool.session('a'):
+        pass
+    with pool.session('b'):
+        pass
+    with pool.session('a'):
+        pass
+    with pool.session('c'):
+        pass
+
+    stats = pool.get_stats()
+    assert stats['active'] == 2
+    assert stats['evicted'] == 1
+    assert 'b' not in pool._sessions
+
+
+def test_busy_pool_raises():
+    """Busy sessions are never evicted from under a running frame"""
+    pool = RecognizerPool(FakeRecognizer, max_size=1, spares=0)
+
+    with pool.session('a'):
+        try:
+            with pool.session('b'):
+                pass
+        except PoolExhausted:
+            pass
+        else:
+            raise AssertionError('expected PoolExhausted')
+
+
+def test_idle_sessions_expire():
+    """Sessions idle for longer than the TTL are reaped"""
+    pool = RecognizerPool(FakeRecognizer, max_size=4, idle_ttl=0.01, spares=0)
+
+    with pool.session('a') as recognizer:
+        pass
+    time.sleep(0.02)
+    pool.reap()
+
+    assert pool.get_stats()['active'] == 0
+    assert pool.get_stats()['expired'] == 1
+    assert recognizer.closed
+
+
+def test_spares_are_warmed_after_reset():
+    """Spares run the warm hook when built and again after a reset"""
+    warmed = []
+
+    def warm(recognizer):
+        warmed.append((recognizer, recognizer.resets))
+
+    pool = RecognizerPool(FakeRecognizer, max_size=4, spares=1, warm=warm)
+    pool.prewarm()
+    (recognizer, resets), = warmed
+    assert resets == 0
+
+    with pool.session('a') as session_recognizer:
+        pass
+    assert session_recognizer is recognizer
+    # Wait for the background refill so the released one is not closed
+    deadline = time.monotonic() + 2.0
+    while pool.get_stats()['spare'] < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    pool.spares = 2
+    pool.release('a')
+    deadline = time.monotonic() + 2.0
+    while pool.get_stats()['spare'] < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert warmed[-1] == (recognizer, 1)
+    assert pool.get_stats()['spare'] == 2
+
+
+def test_release_does_not_wait_for_warm_up():
+    """Disconnects hand the reset recognizer to the refill thread instead of warming it inline"""
+    release = threading.Event()
+    warmed = []
+
+    def slow_warm(recognizer):
+        release.wait(5.0)
+        warmed.append(recognizer)
+
+    pool = RecognizerPool(FakeRecognizer, max_size=4, spares=1, warm=slow_warm)
+    with pool.session('a') as recognizer:
+        pass
+    start = time.monotonic()
+    pool.release('a')
+    assert time.monotonic() - start < 1.0
+    assert pool.get_stats()['cold'] == 1
+
+    # A new session takes the cold recognizer rather than building one
+    with pool.session('b') as reused:
+        pass
+    assert reused is recognizer
+    release.set()
+
+
+def test_concurrent_new_sessions_respect_max_size():
+    """Slots are reserved before the factory runs, so simultaneous clients cannot overfill the pool"""
+    release = threading.Event()
+
+    def slow_factory():
+        release.wait(5.0)
+        return FakeRecognizer()
+
+    pool = RecognizerPool(slow_factory, max_size=2, spares=0)
+    results = []
+
+    def connect(sid):
+        try:
+            with pool.session(sid):
+                results.append('ok')
+        except PoolExhausted:
+            results.append('exhausted')
+
+    threads = [threading.Thread(target=connect, args=(f'client-{i}',)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5.0
+    while results.count('exhausted') < 6 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    stats = pool.get_stats()
+    assert sorted(results) == ['exhausted'] * 6 + ['ok'] * 2
+    assert stats['created'] == 2 and stats['active'] == 2
+
+
+def test_failed_factory_frees_the_slot():
+    """A factory error gives the reserved slot back, also to handlers waiting on it"""
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def failing_once():
+        calls.append(1)
+        if len(calls) == 1:
+            started.set()
+            release.wait(5.0)
+            raise RuntimeError('graph failed to start')
+        return FakeRecognizer()
+
+    pool = RecognizerPool(failing_once, max_size=1, spares=0)
+    errors = []
+
+    def connect():
+        try:
+            with pool.session('a'):
+                pass
+        except Exception as e:
+            errors.append(type(e))
+
+    first = threading.Thread(target=connect)
+    first.start()
+    started.wait(5.0)
+    # Same session while its recognizer is still being created
+    second = threading.Thread(target=connect)
+    second.start()
+    deadline = time.monotonic() + 5.0
+    while pool._sessions['a'].in_use < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    first.join()
+    second.join()
+
+    assert sorted(errors, key=lambda error: error.__name__) == [PoolExhausted, RuntimeError]
+    assert pool.get_stats()['active'] == 0
+    with pool.session('b') as recognizer:
+        assert isinstance(recognizer, FakeRecognizer)
+
+
+if __name__ == "__main__":
+    test_sessions_get_their_own_recognizer()
+    test_released_recognizer_becomes_spare()
+    test_lru_session_is_evicted_when_full()
+    test_busy_pool_raises()
+    test_idle_sessions_expire()
+    test_spares_are_warmed_after_reset()
+    test_concurrent_new_sessions_respect_max_size()
+    test_failed_factory_frees_the_slot()
+    test_release_does_not_wait_for_warm_up()
+    print("Recognizer pool tests passed!")
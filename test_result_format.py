@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Simple test script to verify the compact gesture_result encodings
+"""
+
+import random
+import threading
+import time
+
+import numpy as np
+from hand_landmarks import landmarks_to_dicts
+from result_format import INT16_SCALE, ResultEncoder, dequantize_landmarks, payload_size
+from test_hand_landmarks import open_palm
+
+
+def result(points):
+    landmarks = [landmarks_to_dicts(points)] if points is not None else []
+    return {'gesture': 'five', 'confidence': 0.85, 'word': 'five', 'landmarks': landmarks}
+
+
+def test_default_is_json():
+    """Clients that never negotiate get the original landmark dicts"""
+    encoder = ResultEncoder()
+    payload = encoder.encode('a', result(open_palm()))
+    assert payload['landmarks_format'] == 'json'
+    assert payload['landmarks'][0][0] == landmarks_to_dicts(open_palm())[0]
+
+
+def test_int16_round_trip():
+    """Packed int16 landmarks decode to within half a quantization step"""
+    encoder = ResultEncoder()
+    encoder.negotiate('a', {'landmarks': 'int16'})
+    payload = encoder.encode('a', result(open_palm()))
+
+    assert payload['landmarks_format'] == 'int16'
+    assert len(payload['landmarks']) == 63 * 2
+    decoded = dequantize_landmarks(np.frombuffer(payload['landmarks'], dtype='<i2'))
+    assert np.abs(decoded - open_palm()).max() <= 0.5 / INT16_SCALE
+    assert payload_size(payload) < payload_size(ResultEncoder().encode('a', result(open_palm()))) / 5
+
+
+def test_delta_mode():
+    """Small moves are sent as int8 deltas, large ones and new hands as keyframes"""
+    encoder = ResultEncoder()
+    encoder.negotiate('a', {'landmarks': 'int16', 'delta': True})
+    hand = open_palm()
+
+    first = encoder.encode('a', result(hand))
+    moved = encoder.encode('a', result(hand + np.float32(0.005)))
+    jumped = encoder.encode('a', result(hand + np.float32(0.5)))
+    encoder.encode('a', result(None))
+    returned = encoder.encode('a', result(hand))
+
+    assert [p['landmarks_format'] for p in (first, moved, jumped, returned)] == ['int16', 'int8_delta', 'int16', 'int16']
+    assert len(moved['landmarks']) == 63
+
+    reference = np.frombuffer(first['landmarks'], dtype='<i2') + np.frombuffer(moved['landmarks'], dtype=np.int8)
+    assert np.abs(dequantize_landmarks(reference) - (hand + np.float32(0.005))).max() <= 0.5 / INT16_SCALE
+
+
+def test_hidden_overlay_and_bad_options():
+    """'none' drops landmarks; unknown formats are rejected"""
+    encoder = ResultEncoder()
+    encoder.negotiate('a', {'landmarks': 'none'})
+    payload = encoder.encode('a', result(open_palm()))
+    assert 'landmarks' not in payload
+
+    for options in ({'landmarks': 'png'}, {'landmarks': 'float16', 'delta': True}):
+        try:
+            encoder.negotiate('a', options)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError('expected ValueError')
+
+
+def test_concurrent_sends_keep_deltas_in_order():
+    """Payloads are emitted in encoding order, so the client always has each delta's base"""
+    encoder = ResultEncoder()
+    encoder.negotiate('a', {'landmarks': 'int16', 'delta': True})
+    hands = [open_palm() + np.float32(0.001) * i for i in range(40)]
+    received = []
+    rng = random.Random(0)
+
+    def emit(payload):
+        # A slow socket write, so unserialized handlers would overtake each other
+        time.sleep(rng.random() * 0.002)
+        received.append(payload)
+
+    def handler(offset):
+        for hand in hands[offset::4]:
+            encoder.send('a', result(hand), emit)
+
+    threads = [threading.Thread(target=handler, args=(offset,)) for offset in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Rebuild the landmarks the way the client does
+    base = None
+    decoded = []
+    for payload in received:
+        if payload['landmarks_format'] == 'int16':
+            base = np.frombuffer(payload['landmarks'], dtype='<i2').astype(np.int32)
+        else:
+            base = base + np.frombuffer(payload['landmarks'], dtype=np.int8)
+        decoded.append(dequantize_landmarks(base.astype('<i2')))
+    assert len(decoded) == 40
+    assert any(payload['landmarks_format'] == 'int8_delta' for payload in received)
+    for points in decoded:
+        assert min(np.abs(points - hand).max() for hand in hands) <= 0.5 / INT16_SCALE
+
+
+if __name__ == "__main__":
+    test_default_is_json()
+    test_int16_round_trip()
+    test_delta_mode()
+    test_hidden_overlay_and_bad_options()
+    test_concurrent_sends_keep_deltas_in_order()
+    print("Result format tests passed!")
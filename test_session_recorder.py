@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Simple test script to verify session recording and replay
+"""
+
+import base64
+import os
+import tempfile
+import time
+
+import cv2
+import numpy as np
+from frame_transport import FramePayload, payload_from_binary, payload_from_data_url
+from replay_session import replay
+from session_recorder import SessionRecorder, load_recording
+
+
+def jpeg(value):
+    return cv2.imencode('.jpg', np.full((48, 64, 3), value, dtype=np.uint8))[1].tobytes()
+
+
+class FakeRecognizer:
+    """Sees a fist in bright frames and nothing in dark ones"""
+
+    def __init__(self, gesture='fist'):
+        self.gesture = gesture
+
+    def process_frame(self, frame, rgb=False):
+        if frame.mean() > 100:
+            landmarks = [[{'x': 0.5, 'y': 0.5, 'z': 0.0}] * 21]
+            return {'gesture': self.gesture, 'confidence': 0.9, 'word': self.gesture, 'landmarks': landmarks}
+        return {'gesture': None, 'confidence': 0.0, 'word': None, 'landmarks': []}
+
+    def close(self):
+        pass
+
+
+def record_session(directory, segment_bytes=1024):
+    recorder = SessionRecorder(directory, segment_bytes=segment_bytes)
+    process = recorder.wrap(lambda sid, payload: FakeRecognizer().process_frame(
+        cv2.imdecode(np.frombuffer(payload.data, np.uint8), cv2.IMREAD_COLOR)))
+    for i in range(6):
+        payload = FramePayload(jpeg(200 if i >= 3 else 0), 'binary', received_at=100.0 + i * 0.01)
+        recorder.record_frame('sid/1', payload)
+        if i != 1:
+            # Frame 1 was superseded in the mailbox
+            recorder.record_emit('sid/1', process('sid/1', payload))
+    recorder.release('sid/1')
+    return recorder
+
+
+def test_recording_round_trip():
+    """Frames, results and emits come back in order across segments"""
+    with tempfile.TemporaryDirectory() as directory:
+        recorder = record_session(directory)
+        stats = recorder.get_stats()
+        assert stats['frames'] == 6
+        assert stats['results'] == 5
+        assert stats['sessions'] == 0
+
+        (session,) = os.listdir(directory)
+        assert len(os.listdir(os.path.join(directory, session))) > 1
+
+        frames, emits = load_recording(os.path.join(directory, session))
+        assert len(frames) == 6
+        assert frames[1].result is None
+        assert frames[3].result['gesture'] == 'fist'
+        assert abs(frames[2].timestamp - frames[0].timestamp - 0.02) < 1e-9
+        assert [result['gesture'] for _, result in emits] == [None, None, 'fist', 'fist', 'fist']
+
+
+def test_data_url_frames_are_stored_decoded():
+    with tempfile.TemporaryDirectory() as directory:
+        recorder = SessionRecorder(directory)
+        binary = payload_from_binary(jpeg(50))
+        data_url = payload_from_data_url({'frame': 'data:image/jpeg;base64,' + base64.b64encode(jpeg(50)).decode()})
+        recorder.record_frame('a', binary)
+        recorder.record_frame('a', data_url)
+        recorder.close()
+
+        frames, _ = load_recording(os.path.join(directory, os.listdir(directory)[0]))
+        assert [frame.transport for frame in frames] == ['binary', 'data_url']
+        assert frames[0].data == frames[1].data
+
+
+def test_max_bytes_truncates():
+    with tempfile.TemporaryDirectory() as directory:
+        recorder = SessionRecorder(directory, max_bytes=1000)
+        for _ in range(10):
+            recorder.record_frame('a', payload_from_binary(jpeg(0)))
+        assert recorder.get_stats()['truncated'] == 1
+        assert 0 < recorder.get_stats()['frames'] < 10
+        recorder.close()
+
+
+def test_released_sessions_are_not_reopened():
+    """Records racing with a disconnect neither start a new recording nor leave files open"""
+    with tempfile.TemporaryDirectory() as directory:
+        recorder = SessionRecorder(directory)
+        payload = payload_from_binary(jpeg(200))
+        recorder.record_frame('a', payload)
+
+        def process(sid, payload):
+            # The client disconnects while its frame is being recognized
+            recorder.release(sid)
+            return {'gesture': None}
+
+        recorder.wrap(process)('a', payload)
+        recorder.record_emit('a', {'gesture': None})
+        recorder.record_frame('a', payload)
+
+        # A writer looked up just before the release
+        writer = recorder._writer('b')
+        recorder.release('b')
+        recorder.record_frame('b', payload)
+        recorder._append(writer, 1, 0.0, b'late', 'frames')
+        assert writer.file is None
+
+        stats = recorder.get_stats()
+        assert stats['recordings'] == 2 and stats['sessions'] == 0
+        assert stats['frames'] == 1 and stats['results'] == 0 and stats['emits'] == 0
+        assert len(os.listdir(directory)) == 2
+        frames, _ = load_recording(os.path.join(directory, [name for name in os.listdir(directory)
+                                                            if name.endswith('-a')][0]))
+        assert len(frames) == 1
+
+
+def test_replay_diffs_results():
+    """Replaying with the same recognizer matches; a changed one is reported"""
+    with tempfile.TemporaryDirectory() as directory:
+        record_session(directory)
+        session = os.path.join(directory, os.listdir(directory)[0])
+
+        summary = replay(session, factory=FakeRecognizer)
+        assert summary['frames'] == 5
+        assert summary['compared'] == 5
+        assert summary['mismatches'] == []
+        assert summary['recorded_p50_ms'] > 0
+
+        summary = replay(session, all_frames=True, factory=lambda: FakeRecognizer('five'))
+        assert summary['frames'] == 6
+        assert [index for index, _, _ in summary['mismatches']] == [3, 4, 5]
+
+
+
+def test_released_sessions_are_forgotten():
+    """Released sids are only remembered for released_ttl seconds"""
+    with tempfile.TemporaryDirectory() as directory:
+        recorder = SessionRecorder(directory, released_ttl=0.05)
+        for i in range(100):
+            recorder.release(f'client-{i}')
+        assert len(recorder._released) == 100
+        recorder.record_frame('client-0', payload_from_binary(jpeg(200)))
+        assert recorder.get_stats()['recordings'] == 0
+
+        time.sleep(0.1)
+        recorder.release('late')
+        assert list(recorder._released) == ['late']
+
+if __name__ == "__main__":
+    test_recording_round_trip()
+    test_data_url_frames_are_stored_decoded()
+    test_max_bytes_truncates()
+    test_released_sessions_are_not_reopened()
+    test_released_sessions_are_forgotten()
+    test_replay_diffs_results()
+    print("Session recorder tests passed!")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Simple test script to verify the on-demand stack sampler
+"""
+
+import threading
+import time
+
+from stack_sampler import SamplerBusy, StackSampler, format_collapsed
+
+
+def spin(until):
+    while time.perf_counter() < until:
+        pass
+
+
+def handle_frame(until):
+    spin(until)
+
+
+def idle_worker(until):
+    spin(until)
+
+
+def run_threads(seconds):
+    until = time.perf_counter() + seconds
+    threads = [threading.Thread(target=target, args=(until,)) for target in (handle_frame, idle_worker)]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def test_only_handler_stacks_are_kept():
+    """By default only stacks through a focus function are sampled"""
+    sampler = StackSampler(interval=0.002)
+    threads = run_threads(0.5)
+    stacks = sampler.profile(0.2)
+    for thread in threads:
+        thread.join()
+
+    assert stacks
+    assert all('test_stack_sampler:handle_frame;test_stack_sampler:spin' in stack for stack in stacks)
+    # How many samples fit in the window depends on GIL scheduling
+    assert sampler.get_stats()['samples'] >= 1
+
+    threads = run_threads(0.5)
+    stacks = sampler.profile(0.2, all_threads=True)
+    for thread in threads:
+        thread.join()
+    assert any(stack.endswith('test_stack_sampler:idle_worker;test_stack_sampler:spin') for stack in stacks)
+
+    lines = format_collapsed(stacks).splitlines()
+    assert int(lines[0].rsplit(' ', 1)[1]) >= int(lines[-1].rsplit(' ', 1)[1])
+
+
+def test_one_profile_at_a_time():
+    sampler = StackSampler()
+    errors = []
+    thread = threading.Thread(target=sampler.profile, args=(0.3,))
+    thread.start()
+    time.sleep(0.05)
+    try:
+        sampler.profile(0.1)
+    except SamplerBusy as e:
+        errors.append(e)
+    thread.join()
+    assert len(errors) == 1
+    assert not sampler.get_stats()['running']
+
+
+if __name__ == "__main__":
+    test_only_handler_stacks_are_kept()
+    test_one_profile_at_a_time()
+    print("Stack sampler tests passed!")
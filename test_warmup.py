@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Simple test script to verify background warm-up and readiness reporting
+"""
+
+import threading
+
+from warmup import FAILED, READY, STARTING, WarmUp
+
+
+def test_tasks_run_in_order_and_report_ready():
+    order = []
+    release = threading.Event()
+
+    def slow():
+        release.wait(2.0)
+        order.append('slow')
+
+    warm_up = WarmUp([('slow', slow), ('fast', lambda: order.append('fast'))])
+    assert warm_up.get_stats()['status'] == STARTING
+    warm_up.start()
+    assert not warm_up.ready
+
+    release.set()
+    assert warm_up.wait(2.0)
+    stats = warm_up.get_stats()
+    assert order == ['slow', 'fast']
+    assert stats['status'] == READY
+    assert set(stats['tasks_ms']) == {'slow', 'fast'}
+
+
+def test_failure_is_reported():
+    def broken():
+        raise RuntimeError('no model')
+
+    warm_up = WarmUp([('model', broken), ('never', lambda: None)]).start()
+    assert not warm_up.wait(2.0)
+    stats = warm_up.get_stats()
+    assert stats['status'] == FAILED
+    assert stats['error'] == 'model: no model'
+    assert 'never' not in stats['tasks_ms']
+
+
+if __name__ == "__main__":
+    test_tasks_run_in_order_and_report_ready()
+    test_failure_is_reported()
+    print("Warm-up tests passed!")
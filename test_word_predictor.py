@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Simple test script to verify the indexed sentence predictor
+"""
+
+import itertools
+import random
+import threading
+
+from word_predictor import SUGGESTION_LIMIT, WordPredictor
+
+
+def scanned(predictor, words):
+    """Suggestions built by running every rule and template category"""
+    lowered = [word.lower() for word in words]
+    sentences = (predictor.generate_ai_sentences(lowered) + predictor.create_custom_sentences(words) +
+                 predictor.get_template_sentences(words))
+    return list(dict.fromkeys(sentences))[:SUGGESTION_LIMIT]
+
+
+def test_index_matches_scanning_every_rule():
+    predictor = WordPredictor()
+    vocabulary = sorted(predictor.word_associations)
+    cases = [[word] for word in vocabulary]
+    for pair in itertools.combinations(vocabulary, 2):
+        cases += [list(pair), list(reversed(pair))]
+    rng = random.Random(0)
+    extra = vocabulary + ['Hello', 'YOU', 'water', 'i']
+    cases += [[rng.choice(extra) for _ in range(rng.randint(1, 6))] for _ in range(2000)]
+
+    for words in cases:
+        assert predictor.predict_sentences(words) == scanned(predictor, words), words
+
+
+def test_word_order_and_count_conditions():
+    predictor = WordPredictor()
+    # Several words are also joined into a sentence of their own
+    assert 'Two Good!' in predictor.predict_sentences(['two', 'good'])
+    assert 'Two!' not in predictor.predict_sentences(['two'])
+    # The last word with a sentiment decides the tone
+    assert predictor.predict_sentences(['sad', 'love']) == scanned(predictor, ['sad', 'love'])
+    assert predictor.predict_sentences(['love', 'sad']) == scanned(predictor, ['love', 'sad'])
+
+
+def test_set_templates_rebuilds_index():
+    predictor = WordPredictor()
+    predictor.word_associations['kite'] = ['outdoors']
+    predictor.set_templates('outdoors', ['Let us fly a kite', 'It is windy', 'Look up', 'Too many'])
+    suggestions = predictor.predict_sentences(['kite'])
+    assert suggestions[:3] == ['Let us fly a kite', 'It is windy', 'Look up']
+    assert 'Too many' not in suggestions
+
+    for index in range(1000):
+        predictor.set_templates(f'extra_{index}', [f'Sentence {index}'])
+    assert predictor.predict_sentences(['kite']) == suggestions
+    assert predictor.predict_sentences(['hello']) == scanned(predictor, ['hello'])
+
+
+def test_rebuilds_do_not_disturb_concurrent_predictions():
+    predictor = WordPredictor()
+    variants = [['I am thirsty', 'Water please', 'I need a drink'], ['Water', 'More water', 'Cold water']]
+    expected = []
+    for sentences in variants:
+        predictor.set_templates('basic_needs', sentences)
+        expected.append(predictor.predict_sentences(['water']))
+    assert expected[0] != expected[1]
+
+    done = threading.Event()
+    unexpected = []
+
+    def predict():
+        while not done.is_set():
+            suggestions = predictor.predict_sentences(['water'])
+            if suggestions not in expected:
+                unexpected.append(suggestions)
+
+    threads = [threading.Thread(target=predict) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for index in range(300):
+        predictor.set_templates('basic_needs', variants[index % 2])
+    done.set()
+    for thread in threads:
+        thread.join()
+    assert not unexpected
+
+
+def test_no_words_gives_defaults():
+    predictor = WordPredictor()
+    assert predictor.predict_sentences([]) == predictor.get_default_sentences()
+
+
+if __name__ == "__main__":
+    test_index_matches_scanning_every_rule()
+    test_word_order_and_count_conditions()
+    test_set_templates_rebuilds_index()
+    test_rebuilds_do_not_disturb_concurrent_predictions()
+    test_no_words_gives_defaults()
+    print("Word predictor tests passed!")
@@ -0,0 +1,72 @@
+import threading
+import time
+
+# Readiness states, in order
+STARTING = 'starting'
+WARMING = 'warming'
+READY = 'ready'
+FAILED = 'failed'
+
+
+class WarmUp:
+    """Run start-up tasks on a background thread and report readiness
+
+    Tasks are (name, callable) pairs run in order. The server accepts
+    connections meanwhile; anything that needs a task's result before it
+    finished simply pays for it on first use, as it would without warm-up.
+    A failing task stops the warm-up and is reported, but does not stop
+    the server.
+    """
+
+    def __init__(self, tasks):
+        self.tasks = list(tasks)
+        self.state = STARTING
+        self.error = None
+        self.timings = {}
+        self._started = None
+        self._finished = None
+        self._done = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._started = time.perf_counter()
+            self._thread = threading.Thread(target=self._run, name='warm-up', daemon=True)
+            self._thread.start()
+        return self
+
+    def wait(self, timeout=None):
+        """Block until the warm-up finished; return True when it succeeded"""
+        self._done.wait(timeout)
+        return self.ready
+
+    @property
+    def ready(self):
+        return self.state == READY
+
+    def _run(self):
+        self.state = WARMING
+        try:
+            for name, task in self.tasks:
+                start = time.perf_counter()
+                task()
+                self.timings[name] = (time.perf_counter() - start) * 1000.0
+            self.state = READY
+        except Exception as e:
+            self.error = f'{name}: {e}'
+            self.state = FAILED
+        finally:
+            self._finished = time.perf_counter()
+            self._done.set()
+
+    def get_stats(self):
+        stats = {
+            'status': self.state,
+            'tasks_ms': dict(self.timings)
+        }
+        if self._started is not None:
+            end = self._finished if self._finished is not None else time.perf_counter()
+            stats['elapsed_ms'] = (end - self._started) * 1000.0
+        if self.error:
+            stats['error'] = self.error
+        return stats
@@ -1,7 +1,215 @@
-import json
-import random
-import re
-from collections import defaultdict, Counter
+import heapq
+import itertools
+from collections import defaultdict, namedtuple
+
+# Sentence rules, in the order their sentences are suggested. Conditions are
+# gesture words that must all be present, or context conditions starting
+# with '@' (see WordPredictor.context_words and _context_holds). A rule with
+# a builder computes its sentences from the words instead.
+SentenceRule = namedtuple('SentenceRule', 'block conditions sentences builder', defaults=((), None))
+
+# Blocks of AI-generated sentences, in order, with the context that enables each
+AI_BLOCKS = (
+    ('greeting', '@greeting'),
+    ('request', '@request'),
+    ('emotional', '@emotional'),
+    ('quantity', '@numbers'),
+    ('action', '@action'),
+    ('combination', None),
+    ('contextual', None)
+)
+CUSTOM = 'custom'
+
+# Word-based context conditions and the determine_context() flag each mirrors
+CONTEXT_FLAGS = {
+    '@greeting': 'is_greeting',
+    '@request': 'is_request',
+    '@emotional': 'is_emotional',
+    '@numbers': 'has_numbers',
+    '@action': 'is_action'
+}
+
+# Only this many AI sentences are considered, and this many suggestions returned
+AI_LIMIT = 8
+SUGGESTION_LIMIT = 15
+# Sentences taken from each relevant template category
+TEMPLATES_PER_CATEGORY = 3
+
+NUMBER_WORDS = ('one', 'two', 'three', 'four', 'five')
+
+# Everything build_index() compiles, published as one object so a
+# concurrent predict_sentences() never sees a half-rebuilt index
+SentenceIndex = namedtuple('SentenceIndex', [
+    'rules', 'ai_rule_count', 'rules_by_block', 'unkeyed', 'postings', 'indexed_words',
+    'category_sentences', 'word_categories', 'all_templates'
+])
+
+SENTENCE_RULES = (
+    # Greetings
+    SentenceRule('greeting', ('hello',), (
+        "Hello! How are you?",
+        "Hello there!",
+        "Hi! Nice to see you!",
+        "Hello! How can I help you?"
+    )),
+    SentenceRule('greeting', ('hello', 'good'), (
+        "Hello! I hope you're having a good day!",
+        "Good to see you! Hello!",
+        "Hello! Everything is good!"
+    )),
+    SentenceRule('greeting', ('good', 'you'), (
+        "Good for you!",
+        "That's good! How are you?",
+        "You're doing good!"
+    )),
+    SentenceRule('greeting', ('bye',), (
+        "Goodbye! Take care!",
+        "Bye! See you later!",
+        "Goodbye! Have a good day!"
+    )),
+    SentenceRule('greeting', ('bye', 'good'), ("Goodbye! Have a good time!",)),
+
+    # Requests
+    SentenceRule('request', ('help',), (
+        "Can you help me please?",
+        "I need your help!",
+        "Help me with this!",
+        "Could you help me out?"
+    )),
+    SentenceRule('request', ('help', 'you'), (
+        "Can you help me?",
+        "I need you to help me!",
+        "You can help me!"
+    )),
+    SentenceRule('request', ('stop',), (
+        "Please stop!",
+        "Stop right there!",
+        "I need you to stop!",
+        "Stop what you're doing!"
+    )),
+    SentenceRule('request', ('stop', 'you'), ("You need to stop!",)),
+    SentenceRule('request', ('call',), (
+        "Please call me!",
+        "I need to make a call!",
+        "Can you call someone?",
+        "Let's make a phone call!"
+    )),
+    SentenceRule('request', ('call', 'you'), (
+        "I will call you!",
+        "You should call me!",
+        "Can you call me?"
+    )),
+
+    # Emotions
+    SentenceRule('emotional', ('love',), (
+        "I love this!",
+        "Love is wonderful!",
+        "I feel so much love!",
+        "This is lovely!"
+    )),
+    SentenceRule('emotional', ('love', 'you'), (
+        "I love you!",
+        "You are loved!",
+        "I love being with you!"
+    )),
+    SentenceRule('emotional', ('peace',), (
+        "Peace and love!",
+        "I feel peaceful!",
+        "Let's have peace!",
+        "Peace to everyone!"
+    )),
+    SentenceRule('emotional', ('peace', 'good'), ("Good vibes and peace!",)),
+    SentenceRule('emotional', ('good',), (
+        "I feel good!",
+        "This is really good!",
+        "Everything is good!",
+        "Good feelings all around!"
+    )),
+
+    # Numbers and quantities
+    SentenceRule('quantity', (), builder='_quantity_sentences'),
+
+    # Actions
+    SentenceRule('action', ('call',), (
+        "Let's make a call!",
+        "Time to call someone!",
+        "I want to call now!",
+        "Calling is important!"
+    )),
+    SentenceRule('action', ('help',), (
+        "Let's help each other!",
+        "Helping is caring!",
+        "I want to help!",
+        "Help is on the way!"
+    )),
+    SentenceRule('action', ('stop',), (
+        "Time to stop!",
+        "Let's stop here!",
+        "Stop and think!",
+        "Stop everything!"
+    )),
+
+    # Combinations of several words
+    SentenceRule('combination', ('@several', 'hello', 'you'), (
+        "Hello! How are you doing?",
+        "Hello you! Nice to see you!",
+        "Hello there! You look great!"
+    )),
+    SentenceRule('combination', ('@several', 'good', 'help'), (
+        "Good! I need help!",
+        "Help me do something good!",
+        "Good help is appreciated!"
+    )),
+    SentenceRule('combination', ('@several', 'love', 'peace'), (
+        "Love and peace to all!",
+        "I love peace and harmony!",
+        "Peace, love, and happiness!"
+    )),
+    SentenceRule('combination', ('@several', 'good'), builder='_good_number_sentences'),
+    SentenceRule('combination', ('@several',), builder='_topic_sentences'),
+
+    # Sentiment and urgency
+    SentenceRule('contextual', ('@urgent',), (
+        "This is urgent!",
+        "I need immediate attention!",
+        "Please respond quickly!",
+        "This is important!"
+    )),
+    SentenceRule('contextual', ('@positive',), (
+        "I'm feeling positive about this!",
+        "This makes me happy!",
+        "Everything is wonderful!",
+        "I'm in a great mood!"
+    )),
+    SentenceRule('contextual', ('@very_positive',), (
+        "I'm absolutely thrilled!",
+        "This is amazing!",
+        "I couldn't be happier!",
+        "This is the best!"
+    )),
+    SentenceRule('contextual', ('@emotional', '@request'), (
+        "I really need your help with this!",
+        "This is emotionally important to me!",
+        "Please understand how I feel!"
+    )),
+
+    # Short custom sentences
+    SentenceRule(CUSTOM, ('hello',), ("Hello!",)),
+    SentenceRule(CUSTOM, ('good',), ("Good!",)),
+    SentenceRule(CUSTOM, ('good', 'you'), ("Good for you!",)),
+    SentenceRule(CUSTOM, ('help',), ("Help me!",)),
+    SentenceRule(CUSTOM, ('help', 'you'), ("Can you help?",)),
+    SentenceRule(CUSTOM, ('love',), ("Love!",)),
+    SentenceRule(CUSTOM, ('love', 'you'), ("I love you!",)),
+    SentenceRule(CUSTOM, ('stop',), ("Stop!", "Please stop!")),
+    SentenceRule(CUSTOM, ('okay',), ("Okay!", "That's okay!")),
+    SentenceRule(CUSTOM, ('call',), ("Call me!",)),
+    SentenceRule(CUSTOM, ('call', 'you'), ("I will call you!",)),
+    SentenceRule(CUSTOM, ('bye',), ("Bye!", "Goodbye!")),
+    SentenceRule(CUSTOM, (), builder='_custom_number_sentences'),
+    SentenceRule(CUSTOM, ('@several',), builder='_joined_sentence')
+)
+
 
 class WordPredictor:
     def __init__(self):
@@ -173,29 +381,206 @@ class WordPredictor:
             'you': {'type': 'pronoun', 'person': 'second'}, 'me': {'type': 'pronoun', 'person': 'first'},
             'call': {'type': 'action', 'category': 'communication'}
         }
+
+        # Bumped by every build_index(), so caches can tell stale suggestions apart
+        self.version = 0
+        self.build_index()
     
     def predict_sentences(self, words):
-        """AI-powered sentence prediction based on collected words"""
+        """AI-powered sentence prediction based on collected words
+
+        Candidates come from the posting lists of the words present and of
+        every pair of them, merged in rank order: the first AI_LIMIT AI
+        sentences, then the custom sentences, then the templates of the
+        words' categories, until SUGGESTION_LIMIT distinct suggestions are
+        found. The result equals concatenating generate_ai_sentences(),
+        create_custom_sentences() and get_template_sentences() and
+        removing duplicates.
+        """
         if not words:
             return self.get_default_sentences()
 
-        # Generate AI-powered sentences
-        ai_sentences = self.generate_ai_sentences(words)
+        index = self._index
+        words_lower = [word.lower() for word in words]
+        present = set(words_lower)
+        holds = self._query_conditions(words_lower)
+
+        matched = set()
+        keyed = sorted(present & index.indexed_words)
+        keys = [(word,) for word in keyed] + list(itertools.combinations(keyed, 2))
+        for key in keys:
+            postings = index.postings.get(key)
+            if postings is None:
+                continue
+            rule_ids, conditional = postings
+            matched.update(rule_ids)
+            for rule_id, extra_words, conditions in conditional:
+                if extra_words <= present and holds.issuperset(conditions):
+                    matched.add(rule_id)
+        for rule_id, conditions in index.unkeyed:
+            if holds.issuperset(conditions):
+                matched.add(rule_id)
+
+        # Bounded merge: AI rules are taken in rank order only until the
+        # first AI_LIMIT sentences are known
+        ai_rules = [rule_id for rule_id in matched if rule_id < index.ai_rule_count]
+        heapq.heapify(ai_rules)
+        ai_sentences = []
+        while ai_rules and len(ai_sentences) < AI_LIMIT:
+            ai_sentences.extend(self._rule_output(index.rules[heapq.heappop(ai_rules)], words_lower, words))
 
-        # Get template-based sentences for fallback
-        template_sentences = self.get_template_sentences(words)
+        # Remove duplicates while preserving order
+        suggestions = dict.fromkeys(ai_sentences[:AI_LIMIT])
+        for rule_id in sorted(rule_id for rule_id in matched if rule_id >= index.ai_rule_count):
+            suggestions.update(dict.fromkeys(self._rule_output(index.rules[rule_id], words_lower, words)))
+        if len(suggestions) < SUGGESTION_LIMIT:
+            for sentence in self._template_candidates(present, index):
+                suggestions.setdefault(sentence)
+                if len(suggestions) == SUGGESTION_LIMIT:
+                    break
+        return list(suggestions)[:SUGGESTION_LIMIT]
+
+    def build_index(self):
+        """Compile SENTENCE_RULES and the templates into posting lists
+
+        Every rule is filed under each minimal set of words that makes it
+        fire, keyed by its first one or two words in sorted order; further
+        words and the conditions that depend on word order are checked at
+        query time. Called on construction and whenever templates change.
+        The new SentenceIndex replaces the old one in a single assignment.
+        """
+        blocks = [block for block, _ in AI_BLOCKS]
+        gates = dict(AI_BLOCKS)
+        rules = sorted(SENTENCE_RULES, key=lambda rule: blocks.index(rule.block)
+                       if rule.block in gates else len(blocks))
+        rules_by_block = defaultdict(list)
+        for rule in rules:
+            rules_by_block[rule.block].append(rule)
+
+        context_words = self.context_words()
+        postings = defaultdict(list)
+        unkeyed = []
+        for rule_id, rule in enumerate(rules):
+            conditions = list(rule.conditions)
+            if gates.get(rule.block):
+                conditions.append(gates[rule.block])
+            clauses = [sorted(context_words[condition]) if condition in context_words else [condition]
+                       for condition in conditions if not self._is_query_condition(condition)]
+            deferred = tuple(condition for condition in conditions if self._is_query_condition(condition))
+
+            word_sets = {frozenset(words) for words in itertools.product(*clauses)}
+            for words in word_sets:
+                if any(other < words for other in word_sets):
+                    continue
+                if not words:
+                    unkeyed.append((rule_id, deferred))
+                    continue
+                ordered = sorted(words)
+                postings[tuple(ordered[:2])].append((rule_id, frozenset(ordered[2:]), deferred))
+
+        # Per key: rules that need nothing else, and rules with further conditions
+        postings = {
+            key: (tuple(rule_id for rule_id, extra_words, deferred in entries if not extra_words and not deferred),
+                  tuple(entry for entry in entries if entry[1] or entry[2]))
+            for key, entries in postings.items()
+        }
 
-        # Create custom rule-based sentences
-        custom_sentences = self.create_custom_sentences(words)
+        # Templates: the first few sentences of each category, per word
+        positions = {category: position for position, category in enumerate(self.sentence_templates)}
+        category_sentences = [tuple(sentences[:TEMPLATES_PER_CATEGORY])
+                              for sentences in self.sentence_templates.values()]
+
+        self._index = SentenceIndex(
+            rules=rules,
+            ai_rule_count=sum(rule.block in gates for rule in rules),
+            rules_by_block=rules_by_block,
+            unkeyed=unkeyed,
+            postings=postings,
+            indexed_words={word for key in postings for word in key},
+            category_sentences=category_sentences,
+            word_categories={
+                word: sorted({positions[category] for category in associated if category in positions})
+                for word, associated in self.word_associations.items()
+            },
+            all_templates=tuple(itertools.chain.from_iterable(category_sentences))
+        )
+        self.version += 1
+
+    def set_templates(self, category, sentences):
+        """Replace (or add) one template category and rebuild the index"""
+        self.sentence_templates[category] = list(sentences)
+        self.build_index()
+
+    def context_words(self):
+        """Words that make each word-based '@' context condition true, as in determine_context"""
+        by_type = defaultdict(set)
+        urgent = {'help', 'stop'}
+        for word, semantic in self.word_semantics.items():
+            by_type[semantic.get('type')].add(word)
+            if semantic.get('urgency') == 'high':
+                urgent.add(word)
+        return {
+            '@greeting': by_type['greeting'],
+            '@emotional': by_type['emotion'],
+            '@action': by_type['action'],
+            '@numbers': by_type['number'],
+            '@urgent': urgent,
+            '@request': urgent | {'you'}
+        }
 
-        # Combine all suggestions with AI sentences prioritized
-        all_sentences = ai_sentences + custom_sentences + template_sentences
+    @staticmethod
+    def _is_query_condition(condition):
+        """Conditions that depend on word order or count, not only on which words are present"""
+        return condition in ('@several', '@positive', '@very_positive')
 
-        # Remove duplicates while preserving order
-        unique_sentences = list(dict.fromkeys(all_sentences))
+    def _query_conditions(self, words):
+        """The query-time conditions that hold for these words"""
+        holds = set()
+        if len(words) >= 2:
+            holds.add('@several')
+        # The last word with a sentiment decides it
+        sentiment = 'neutral'
+        for word in words:
+            semantic = self.word_semantics.get(word)
+            if semantic and semantic.get('sentiment'):
+                sentiment = semantic['sentiment']
+        holds.add('@' + sentiment)
+        return holds
+
+    def _rule_output(self, rule, words, raw_words):
+        if rule.builder is None:
+            return rule.sentences
+        return getattr(self, rule.builder)(words, raw_words)
+
+    def _template_candidates(self, words, index):
+        """Template sentences of the words' categories in template order, merged lazily"""
+        positions = [index.word_categories[word] for word in words if index.word_categories.get(word)]
+        if not positions:
+            return index.all_templates
+        if len(positions) == 1:
+            unique = positions[0]
+        else:
+            unique = (position for position, _ in itertools.groupby(heapq.merge(*positions)))
+        return itertools.chain.from_iterable(index.category_sentences[position] for position in unique)
+
+    def _rule_sentences(self, block, words, context=None, raw_words=None):
+        """Sentences of every rule in a block whose conditions hold, by scanning the rules"""
+        sentences = []
+        for rule in self._index.rules_by_block[block]:
+            if all(self._condition_holds(condition, words, context) for condition in rule.conditions):
+                sentences.extend(self._rule_output(rule, words, raw_words))
+        return sentences
 
-        # Return top 15 suggestions for better variety
-        return unique_sentences[:15]
+    def _condition_holds(self, condition, words, context):
+        if not condition.startswith('@'):
+            return condition in words
+        if condition == '@several':
+            return len(words) >= 2
+        if condition == '@urgent':
+            return context['urgency'] == 'high'
+        if condition in ('@positive', '@very_positive'):
+            return context['sentiment'] == condition[1:]
+        return context[CONTEXT_FLAGS[condition]]
 
     def generate_ai_sentences(self, words):
         """Generate natural sentences using AI-like pattern matching and context analysis"""
@@ -306,130 +691,18 @@ class WordPredictor:
 
         return context
 
+
     def generate_greeting_sentences(self, words, word_types):
         """Generate greeting-based sentences"""
-        sentences = []
-
-        if 'hello' in words:
-            sentences.extend([
-                "Hello! How are you?",
-                "Hello there!",
-                "Hi! Nice to see you!",
-                "Hello! How can I help you?"
-            ])
-
-            if 'good' in words:
-                sentences.extend([
-                    "Hello! I hope you're having a good day!",
-                    "Good to see you! Hello!",
-                    "Hello! Everything is good!"
-                ])
-
-        if 'good' in words and 'you' in words:
-            sentences.extend([
-                "Good for you!",
-                "That's good! How are you?",
-                "You're doing good!"
-            ])
-
-        if 'bye' in words:
-            sentences.extend([
-                "Goodbye! Take care!",
-                "Bye! See you later!",
-                "Goodbye! Have a good day!"
-            ])
-
-            if 'good' in words:
-                sentences.append("Goodbye! Have a good time!")
-
-        return sentences
+        return self._rule_sentences('greeting', words)
 
     def generate_request_sentences(self, words, word_types):
         """Generate request-based sentences"""
-        sentences = []
-
-        if 'help' in words:
-            sentences.extend([
-                "Can you help me please?",
-                "I need your help!",
-                "Help me with this!",
-                "Could you help me out?"
-            ])
-
-            if 'you' in words:
-                sentences.extend([
-                    "Can you help me?",
-                    "I need you to help me!",
-                    "You can help me!"
-                ])
-
-        if 'stop' in words:
-            sentences.extend([
-                "Please stop!",
-                "Stop right there!",
-                "I need you to stop!",
-                "Stop what you're doing!"
-            ])
-
-            if 'you' in words:
-                sentences.append("You need to stop!")
-
-        if 'call' in words:
-            sentences.extend([
-                "Please call me!",
-                "I need to make a call!",
-                "Can you call someone?",
-                "Let's make a phone call!"
-            ])
-
-            if 'you' in words:
-                sentences.extend([
-                    "I will call you!",
-                    "You should call me!",
-                    "Can you call me?"
-                ])
-
-        return sentences
+        return self._rule_sentences('request', words)
 
     def generate_emotional_sentences(self, words, word_types):
         """Generate emotion-based sentences"""
-        sentences = []
-
-        if 'love' in words:
-            sentences.extend([
-                "I love this!",
-                "Love is wonderful!",
-                "I feel so much love!",
-                "This is lovely!"
-            ])
-
-            if 'you' in words:
-                sentences.extend([
-                    "I love you!",
-                    "You are loved!",
-                    "I love being with you!"
-                ])
-
-        if 'peace' in words:
-            sentences.extend([
-                "Peace and love!",
-                "I feel peaceful!",
-                "Let's have peace!",
-                "Peace to everyone!"
-            ])
-
-            if 'good' in words:
-                sentences.append("Good vibes and peace!")
-
-        if 'good' in words:
-            sentences.extend([
-                "I feel good!",
-                "This is really good!",
-                "Everything is good!",
-                "Good feelings all around!"
-            ])
-
-        return sentences
+        return self._rule_sentences('emotional', words)
 
     def generate_quantity_sentences(self, words, word_types):
         """Generate sentences with numbers and quantities"""
@@ -462,113 +735,41 @@ class WordPredictor:
 
     def generate_action_sentences(self, words, word_types):
         """Generate action-based sentences"""
-        sentences = []
-
-        if 'call' in words:
-            sentences.extend([
-                "Let's make a call!",
-                "Time to call someone!",
-                "I want to call now!",
-                "Calling is important!"
-            ])
-
-        if 'help' in words:
-            sentences.extend([
-                "Let's help each other!",
-                "Helping is caring!",
-                "I want to help!",
-                "Help is on the way!"
-            ])
-
-        if 'stop' in words:
-            sentences.extend([
-                "Time to stop!",
-                "Let's stop here!",
-                "Stop and think!",
-                "Stop everything!"
-            ])
-
-        return sentences
+        return self._rule_sentences('action', words)
 
     def generate_combination_sentences(self, words, word_types):
         """Generate sentences using combinations of words"""
-        sentences = []
-        words_str = " ".join(words)
-
-        # Smart combinations based on word patterns
-        if len(words) >= 2:
-            # Create natural combinations
-            if 'hello' in words and 'you' in words:
-                sentences.extend([
-                    "Hello! How are you doing?",
-                    "Hello you! Nice to see you!",
-                    "Hello there! You look great!"
-                ])
-
-            if 'good' in words and 'help' in words:
-                sentences.extend([
-                    "Good! I need help!",
-                    "Help me do something good!",
-                    "Good help is appreciated!"
-                ])
-
-            if 'love' in words and 'peace' in words:
-                sentences.extend([
-                    "Love and peace to all!",
-                    "I love peace and harmony!",
-                    "Peace, love, and happiness!"
-                ])
-
-            if any(num in words for num in ['one', 'two', 'three', 'four', 'five']) and 'good' in words:
-                numbers = [w for w in words if w in ['one', 'two', 'three', 'four', 'five']]
-                if numbers:
-                    sentences.append(f"I have {numbers[0]} good things!")
-
-            # Generic combination for any words
-            sentences.extend([
-                f"I want to talk about {words_str}!",
-                f"Let's discuss {words_str}!",
-                f"These words are important: {words_str}!",
-                f"I'm thinking about {words_str}!"
-            ])
-
-        return sentences
+        return self._rule_sentences('combination', words)
 
     def generate_contextual_variations(self, words, context):
         """Generate contextual variations based on sentiment and urgency"""
-        sentences = []
+        return self._rule_sentences('contextual', words, context)
 
-        if context['urgency'] == 'high':
-            sentences.extend([
-                "This is urgent!",
-                "I need immediate attention!",
-                "Please respond quickly!",
-                "This is important!"
-            ])
+    def _quantity_sentences(self, words, raw_words):
+        return self.generate_quantity_sentences(words, self.analyze_word_types(words))
 
-        if context['sentiment'] == 'positive':
-            sentences.extend([
-                "I'm feeling positive about this!",
-                "This makes me happy!",
-                "Everything is wonderful!",
-                "I'm in a great mood!"
-            ])
-        elif context['sentiment'] == 'very_positive':
-            sentences.extend([
-                "I'm absolutely thrilled!",
-                "This is amazing!",
-                "I couldn't be happier!",
-                "This is the best!"
-            ])
+    def _good_number_sentences(self, words, raw_words):
+        numbers = [w for w in words if w in NUMBER_WORDS]
+        return [f"I have {numbers[0]} good things!"] if numbers else []
 
-        if context['is_emotional'] and context['is_request']:
-            sentences.extend([
-                "I really need your help with this!",
-                "This is emotionally important to me!",
-                "Please understand how I feel!"
-            ])
-
-        return sentences
+    def _topic_sentences(self, words, raw_words):
+        # Generic combination for any words
+        words_str = " ".join(words)
+        return [
+            f"I want to talk about {words_str}!",
+            f"Let's discuss {words_str}!",
+            f"These words are important: {words_str}!",
+            f"I'm thinking about {words_str}!"
+        ]
+
+    def _custom_number_sentences(self, words, raw_words):
+        found_numbers = [word for word in words if word in NUMBER_WORDS]
+        if not found_numbers:
+            return []
+        return [f"I need {found_numbers[0]}!", f"Give me {found_numbers[0]}!"]
+
+    def _joined_sentence(self, words, raw_words):
+        return [" ".join(raw_words).title() + "!"]
 
     def get_template_sentences(self, words):
         """Get template-based sentences for fallback"""
@@ -584,66 +785,17 @@ class WordPredictor:
         if not relevant_categories:
             relevant_categories = set(self.sentence_templates.keys())
 
+        # Categories in template order, so suggestions do not depend on set ordering
         suggested_sentences = []
-        for category in relevant_categories:
-            if category in self.sentence_templates:
-                suggested_sentences.extend(self.sentence_templates[category][:3])  # Limit per category
+        for category in self.sentence_templates:
+            if category in relevant_categories:
+                suggested_sentences.extend(self.sentence_templates[category][:TEMPLATES_PER_CATEGORY])
 
         return suggested_sentences
     
     def create_custom_sentences(self, words):
         """Create custom sentences using the provided words"""
-        custom_sentences = []
-        words_lower = [word.lower() for word in words]
-        
-        # Simple sentence patterns
-        if 'hello' in words_lower:
-            custom_sentences.append("Hello!")
-        
-        if 'good' in words_lower:
-            custom_sentences.append("Good!")
-            if 'you' in words_lower:
-                custom_sentences.append("Good for you!")
-        
-        if 'help' in words_lower:
-            custom_sentences.append("Help me!")
-            if 'you' in words_lower:
-                custom_sentences.append("Can you help?")
-        
-        if 'love' in words_lower:
-            custom_sentences.append("Love!")
-            if 'you' in words_lower:
-                custom_sentences.append("I love you!")
-        
-        if 'stop' in words_lower:
-            custom_sentences.append("Stop!")
-            custom_sentences.append("Please stop!")
-        
-        if 'okay' in words_lower:
-            custom_sentences.append("Okay!")
-            custom_sentences.append("That's okay!")
-        
-        if 'call' in words_lower:
-            custom_sentences.append("Call me!")
-            if 'you' in words_lower:
-                custom_sentences.append("I will call you!")
-        
-        if 'bye' in words_lower:
-            custom_sentences.append("Bye!")
-            custom_sentences.append("Goodbye!")
-        
-        # Number-based sentences
-        numbers = ['one', 'two', 'three', 'four', 'five']
-        found_numbers = [word for word in words_lower if word in numbers]
-        if found_numbers:
-            custom_sentences.append(f"I need {found_numbers[0]}!")
-            custom_sentences.append(f"Give me {found_numbers[0]}!")
-        
-        # Combine multiple words
-        if len(words) > 1:
-            custom_sentences.append(" ".join(words).title() + "!")
-        
-        return custom_sentences
+        return self._rule_sentences(CUSTOM, [word.lower() for word in words], raw_words=words)
     
     def get_default_sentences(self):
         """Return default sentences when no words are provided"""